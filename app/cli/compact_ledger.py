@@ -0,0 +1,58 @@
+"""
+Compact the inventory ledger.
+
+Creates the upcoming monthly partitions of the ledger and folds ledger rows
+older than the retention window into per-ingredient daily summaries. Meant
+to run daily; runs are idempotent.
+
+    python -m app.cli.compact_ledger --retention-days 90
+"""
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.configs.database import DATABASE_URL
+from app.services.ledger_compaction import LedgerCompactor, LEDGER_RETENTION, LEDGER_PARTITIONS_AHEAD
+from datetime import timedelta
+from typing import List
+import app.dbs  # noqa: F401  (registers every model on Base.metadata)
+import argparse
+import asyncio
+import time
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    try:
+        started = time.perf_counter()
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            stats = await LedgerCompactor(db).run(
+                retention=timedelta(days=args.retention_days),
+                months_ahead=args.months_ahead
+            )
+    finally:
+        await engine.dispose()
+
+    for name in stats["partitions_created"]:
+        print(f"created {name}")
+    for name in stats["partitions_dropped"]:
+        print(f"compacted and dropped {name}")
+    print(
+        f"compacted rows before {stats['cutoff']:%Y-%m-%d}: {stats['summaries_written']} summary rows written, "
+        f"{stats['rows_deleted']} ledger rows deleted, in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument(
+        "--retention-days", type=int, default=LEDGER_RETENTION.days,
+        help="Days of ledger rows kept in detail"
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=LEDGER_PARTITIONS_AHEAD,
+        help="Future monthly partitions to keep ready"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
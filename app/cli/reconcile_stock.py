@@ -0,0 +1,83 @@
+"""
+Check the current-stock projection against the inventory ledger.
+
+Ingredients are checked in ID ranges of --batch-size, --workers ranges at a
+time, each on its own connection. Drifted ingredients are listed; with --fix
+their stock is rebuilt from the latest ledger row. Exits with status 1 when
+drift is found and not fixed.
+
+    python -m app.cli.reconcile_stock --workers 8 --fix
+"""
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select, func
+from app.configs.database import DATABASE_URL
+from app.dbs.ingredient.model import Ingredient
+from app.services.inventory_service import InventoryService
+from typing import List
+import app.dbs  # noqa: F401  (registers every model on Base.metadata)
+import argparse
+import asyncio
+import sys
+import time
+
+
+async def reconcile(engine: AsyncEngine, fix: bool = False, batch_size: int = 1000, workers: int = 4) -> List[dict]:
+    """
+    Reconcile the stock of every ingredient in parallel batches.
+
+    Args:
+        engine: The database engine; its pool must allow `workers` connections
+        fix: Whether to correct drifted stock
+        batch_size: The number of ingredient IDs per batch
+        workers: The number of batches reconciled concurrently
+
+    Returns:
+        The drifted ingredients, with their projected and ledger quantities
+    """
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        first_id, last_id = (await db.execute(select(func.min(Ingredient.id), func.max(Ingredient.id)))).one()
+    if first_id is None:
+        return []
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(start: int) -> List[dict]:
+        async with semaphore, session_factory() as db:
+            drift = await InventoryService(db).reconcile(start, min(start + batch_size - 1, last_id), fix=fix)
+            await db.commit()
+            return drift
+
+    batches = await asyncio.gather(*(run(start) for start in range(first_id, last_id + 1, batch_size)))
+    return [row for batch in batches for row in batch]
+
+
+async def main(args: argparse.Namespace) -> int:
+    pool_options = {} if args.database_url.startswith("sqlite") else {"pool_size": args.workers, "max_overflow": 0}
+    engine = create_async_engine(args.database_url, **pool_options)
+    try:
+        started = time.perf_counter()
+        drift = await reconcile(engine, args.fix, args.batch_size, args.workers)
+    finally:
+        await engine.dispose()
+
+    for row in drift:
+        print(f"ingredient {row['ingredient_id']}: projected {row['projected']}, ledger {row['ledger']}")
+    total = sum(abs(row["projected"] - row["ledger"]) for row in drift)
+    action = "fixed" if args.fix else "found"
+    print(f"{len(drift)} drifted ingredients {action}, total drift {total}, in {time.perf_counter() - started:.1f}s")
+    return 1 if drift and not args.fix else 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--fix", action="store_true", help="Rebuild drifted stock from the ledger")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4, help="Batches reconciled concurrently")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,105 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import text
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from functools import lru_cache
+from pathlib import Path
+from typing import Set
+import logging
+
+logger = logging.getLogger("orderflow.migrations")
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised at startup when the database is not at the head revision."""
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    # Leave the application's logging configuration alone
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revisions() -> Set[str]:
+    """The head revisions of the migration scripts, read once per process."""
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+async def current_revisions(engine: AsyncEngine) -> Set[str]:
+    """
+    Read the revisions the database is at.
+
+    Args:
+        engine: The database engine
+
+    Returns:
+        The revisions in alembic_version, empty for an unmigrated database
+    """
+    async with engine.connect() as conn:
+        has_version_table = await conn.run_sync(
+            lambda sync_conn: sync_conn.dialect.has_table(sync_conn, "alembic_version")
+        )
+        if not has_version_table:
+            return set()
+        return set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+
+
+async def check_schema(engine: AsyncEngine, mode: str = "fail") -> bool:
+    """
+    Compare the database revision with the migration head.
+
+    This is one small query, unlike creating or reflecting the schema, so
+    workers start quickly and never run DDL concurrently. Migrations are
+    applied once per deploy with `alembic upgrade head`.
+
+    Args:
+        engine: The database engine
+        mode: "fail" raises on a mismatch, "warn" logs it, "off" skips the check
+
+    Returns:
+        True if the database is at head or the check is off
+
+    Raises:
+        SchemaOutOfDateError: If the revisions differ and mode is "fail"
+    """
+    if mode == "off":
+        return True
+
+    current = await current_revisions(engine)
+    head = head_revisions()
+    if current == head:
+        return True
+
+    message = (
+        f"Database schema is at {sorted(current) or 'no revision'}, expected {sorted(head)}; "
+        "run `alembic upgrade head`"
+    )
+    if mode == "fail":
+        raise SchemaOutOfDateError(message)
+    logger.warning(message)
+    return False
+
+
+async def upgrade_to_head(engine: AsyncEngine) -> None:
+    """
+    Apply every pending migration, for tools and tests.
+
+    Args:
+        engine: The database engine
+    """
+    config = alembic_config()
+
+    def upgrade(connection) -> None:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+    # Not in a transaction: migrations manage their own, and some run
+    # statements outside of any
+    async with engine.connect() as conn:
+        await conn.run_sync(upgrade)
+        await conn.commit()
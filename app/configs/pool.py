@@ -0,0 +1,68 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy import exc
+import time
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait and how often they time out.
+
+    The counters are read by the pool health endpoint to size pools from
+    data: a growing wait time or any timeout means the pool is too small
+    for the load of the worker.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.acquisitions += 1
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """
+    Get the live state of an engine's connection pool.
+
+    Args:
+        engine: The engine
+
+    Returns:
+        Dictionary with pool occupancy and, for instrumented pools, checkout
+        wait time and timeout counters
+    """
+    pool = engine.pool
+    stats = {"url": engine.url.render_as_string(hide_password=True), "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(
+            acquisitions=pool.acquisitions,
+            timeouts=pool.timeouts,
+            wait_seconds_total=pool.wait_seconds_total,
+            wait_seconds_max=pool.wait_seconds_max,
+            wait_seconds_avg=pool.wait_seconds_total / pool.acquisitions if pool.acquisitions else 0.0,
+        )
+    return stats
@@ -0,0 +1,211 @@
+from collections import OrderedDict
+import os
+
+# Allergens at or above this severity level also exclude "may contain" items
+SEVERE_ALLERGEN_LEVEL = int(os.getenv("SEVERE_ALLERGEN_LEVEL", "3"))
+
+
+class RestaurantAllergenIndex:
+    """
+    Allergen bitmasks for the menu items of one restaurant.
+
+    Allergen IDs map directly to bit positions, so excluding a set of
+    allergens is a single AND per menu item.
+    """
+
+    def __init__(self):
+        self.contains: dict[int, int] = {}
+        self.may_contain: dict[int, int] = {}
+        self.severe_mask = 0
+        self.keys: dict[str, int] = {}
+        self._links: dict[int, dict[int, str]] = {}
+        self._severities: dict[int, int] = {}
+
+    def set_allergen(self, allergen_id: int, i18n_key: str | None, severity_level: int | None) -> None:
+        """
+        Register an allergen and its severity level.
+
+        Args:
+            allergen_id: The allergen ID
+            i18n_key: The allergen i18n key, used to resolve filter values
+            severity_level: The allergen severity level
+        """
+        for key in [key for key, value in self.keys.items() if value == allergen_id]:
+            del self.keys[key]
+        if i18n_key:
+            self.keys[i18n_key] = allergen_id
+        self._severities[allergen_id] = severity_level or 0
+        if (severity_level or 0) >= SEVERE_ALLERGEN_LEVEL:
+            self.severe_mask |= 1 << allergen_id
+        else:
+            self.severe_mask &= ~(1 << allergen_id)
+
+    def has_allergen(self, allergen_id: int) -> bool:
+        return allergen_id in self._severities
+
+    def set_link(self, menu_item_id: int, allergen_id: int, contamination_risk: str) -> None:
+        """
+        Add or update the link between a menu item and an allergen.
+
+        Args:
+            menu_item_id: The menu item ID
+            allergen_id: The allergen ID
+            contamination_risk: "contains" or "may_contain"
+        """
+        self._links.setdefault(menu_item_id, {})[allergen_id] = contamination_risk
+        self._recompute(menu_item_id)
+
+    def remove_link(self, menu_item_id: int, allergen_id: int) -> None:
+        """
+        Remove the link between a menu item and an allergen.
+
+        Args:
+            menu_item_id: The menu item ID
+            allergen_id: The allergen ID
+        """
+        links = self._links.get(menu_item_id)
+        if links is not None:
+            links.pop(allergen_id, None)
+            self._recompute(menu_item_id)
+
+    def mask_for(self, allergens: list[int | str]) -> int:
+        """
+        Build the bitmask for a list of allergen IDs or i18n keys.
+
+        Unknown keys are ignored, since no menu item of the restaurant
+        can contain them.
+
+        Args:
+            allergens: Allergen IDs or i18n keys
+
+        Returns:
+            The combined allergen bitmask
+        """
+        mask = 0
+        for allergen in allergens:
+            allergen_id = allergen if isinstance(allergen, int) else self.keys.get(allergen)
+            if allergen_id is not None:
+                mask |= 1 << allergen_id
+        return mask
+
+    def is_safe(self, menu_item_id: int, mask: int, strict: bool = False) -> bool:
+        """
+        Check that a menu item does not contain any of the allergens in a mask.
+
+        Args:
+            menu_item_id: The menu item ID
+            mask: The allergen bitmask to exclude
+            strict: Also exclude "may contain" links for non-severe allergens
+
+        Returns:
+            True if the menu item is safe to show
+        """
+        blocked = self.contains.get(menu_item_id, 0)
+        may_contain = self.may_contain.get(menu_item_id, 0)
+        blocked |= may_contain if strict else may_contain & self.severe_mask
+        return not blocked & mask
+
+    def _recompute(self, menu_item_id: int) -> None:
+        contains = 0
+        may_contain = 0
+        for allergen_id, risk in self._links.get(menu_item_id, {}).items():
+            if risk == "contains":
+                contains |= 1 << allergen_id
+            else:
+                may_contain |= 1 << allergen_id
+        self.contains[menu_item_id] = contains
+        self.may_contain[menu_item_id] = may_contain
+
+
+class AllergenIndexRegistry:
+    """
+    Per-restaurant allergen indexes kept up to date by link writes.
+
+    Link changes are applied to an existing index in place instead of
+    rebuilding it. A per-restaurant generation counter lets a build that
+    raced with a link change be discarded rather than installed.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._indexes: OrderedDict[int, RestaurantAllergenIndex] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._global_generation = 0
+        self.builds = 0
+        self.incremental_updates = 0
+
+    def get(self, restaurant_id: int) -> RestaurantAllergenIndex | None:
+        index = self._indexes.get(restaurant_id)
+        if index is not None:
+            self._indexes.move_to_end(restaurant_id)
+        return index
+
+    def generation(self, restaurant_id: int) -> int:
+        return self._generations.get(restaurant_id, 0) + self._global_generation
+
+    def install(self, restaurant_id: int, index: RestaurantAllergenIndex, generation: int) -> bool:
+        """
+        Install a freshly built index unless a link changed during the build.
+
+        Args:
+            restaurant_id: The restaurant ID
+            index: The built index
+            generation: The generation read before the build started
+
+        Returns:
+            True if the index was installed
+        """
+        self.builds += 1
+        if generation != self.generation(restaurant_id):
+            return False
+
+        self._indexes[restaurant_id] = index
+        self._indexes.move_to_end(restaurant_id)
+        while len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+        return True
+
+    def set_link(
+        self,
+        restaurant_id: int,
+        menu_item_id: int,
+        allergen_id: int,
+        contamination_risk: str,
+        i18n_key: str | None = None,
+        severity_level: int | None = None,
+    ) -> None:
+        """Apply a created or updated link to the restaurant's index."""
+        self._generations[restaurant_id] = self._generations.get(restaurant_id, 0) + 1
+        index = self._indexes.get(restaurant_id)
+        if index is None:
+            return
+        if not index.has_allergen(allergen_id):
+            index.set_allergen(allergen_id, i18n_key, severity_level)
+        index.set_link(menu_item_id, allergen_id, contamination_risk)
+        self.incremental_updates += 1
+
+    def remove_link(self, restaurant_id: int, menu_item_id: int, allergen_id: int) -> None:
+        """Apply a removed link to the restaurant's index."""
+        self._generations[restaurant_id] = self._generations.get(restaurant_id, 0) + 1
+        index = self._indexes.get(restaurant_id)
+        if index is None:
+            return
+        index.remove_link(menu_item_id, allergen_id)
+        self.incremental_updates += 1
+
+    def set_allergen(self, allergen_id: int, i18n_key: str | None, severity_level: int | None) -> None:
+        """Apply an allergen update to every index that uses it."""
+        self._global_generation += 1
+        for index in self._indexes.values():
+            if index.has_allergen(allergen_id):
+                index.set_allergen(allergen_id, i18n_key, severity_level)
+                self.incremental_updates += 1
+
+    def clear(self) -> None:
+        self._global_generation += 1
+        self._indexes.clear()
+
+
+allergen_indexes = AllergenIndexRegistry(
+    max_entries=int(os.getenv("ALLERGEN_INDEX_MAX_ENTRIES", "1024")),
+)
@@ -0,0 +1,176 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+import asyncio
+
+_LOADERS_KEY = "dataloaders"
+
+BatchLoadFn = Callable[[list], Awaitable[dict]]
+
+
+class DataLoader:
+    """
+    Batches and memoizes lookups by key.
+
+    Every `load` made in the same event-loop tick is collected and resolved
+    by a single call to the batch function, and each key is only loaded once
+    for the lifetime of the loader. The registry that owns the loader runs
+    the batches.
+    """
+
+    def __init__(self, batch_load_fn: BatchLoadFn, schedule: Callable[[], None]):
+        self.batch_load_fn = batch_load_fn
+        self.batches = 0
+        self._schedule = schedule
+        self._memo: dict[Hashable, asyncio.Future] = {}
+        self._queue: list[Hashable] = []
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        """
+        Load the value of a key.
+
+        Args:
+            key: The key to load
+
+        Returns:
+            Future resolving to the value, or None if the key was not found
+        """
+        future = self._memo.get(key)
+        if future is not None:
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        self._memo[key] = future
+        if not self._queue:
+            self._schedule()
+        self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list:
+        """
+        Load the values of several keys in one batch.
+
+        Args:
+            keys: The keys to load
+
+        Returns:
+            The values in the order of `keys`, None for keys not found
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Store a known value so that loading its key skips the database."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._memo[key] = future
+
+    def clear(self, key: Hashable | None = None) -> None:
+        """
+        Forget a memoized key, or every key if none is given.
+
+        Args:
+            key: The key to forget
+        """
+        if key is None:
+            self._memo = {key: future for key, future in self._memo.items() if not future.done()}
+        elif key in self._memo and self._memo[key].done():
+            del self._memo[key]
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        futures = [self._memo.get(key) for key in keys]
+        self.batches += 1
+        try:
+            values = await self.batch_load_fn(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                # Failed lookups are retried by the next load
+                if self._memo.get(key) is future:
+                    del self._memo[key]
+            return
+
+        for key, future in zip(keys, futures):
+            if future is not None and not future.done():
+                future.set_result(values.get(key))
+
+
+class LoaderRegistry:
+    """
+    Request-scoped DataLoaders, one per loader name.
+
+    All loaders share one dispatch task, which runs their batches one after
+    the other: the loaders of a session must never query it concurrently.
+    """
+
+    def __init__(self):
+        self._loaders: dict[Hashable, DataLoader] = {}
+        self._task: asyncio.Task | None = None
+
+    def get(self, name: Hashable, batch_load_fn: BatchLoadFn) -> DataLoader:
+        """
+        Get the loader registered under a name, creating it on first use.
+
+        Args:
+            name: The loader name
+            batch_load_fn: Batch function used if the loader is created
+
+        Returns:
+            The DataLoader for the name
+        """
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = self._loaders[name] = DataLoader(batch_load_fn, self._schedule)
+        return loader
+
+    def clear(self, name: Hashable | None = None) -> None:
+        """
+        Forget the memoized values of one loader, or of all loaders.
+
+        Args:
+            name: The loader name
+        """
+        loaders = self._loaders.values() if name is None else [self._loaders.get(name)]
+        for loader in loaders:
+            if loader is not None:
+                loader.clear()
+
+    def _schedule(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        # Loads made while a batch runs are queued and picked up by the next round
+        while pending := [loader for loader in self._loaders.values() if loader._queue]:
+            for loader in pending:
+                await loader._dispatch()
+
+
+def loaders(db: AsyncSession) -> LoaderRegistry:
+    """
+    Get the loader registry of a database session.
+
+    Sessions are created per request, so memoized values live exactly as
+    long as the request.
+
+    Args:
+        db: The database session
+
+    Returns:
+        The LoaderRegistry bound to the session
+    """
+    info = db.sync_session.info
+    registry = info.get(_LOADERS_KEY)
+    if registry is None:
+        registry = info[_LOADERS_KEY] = LoaderRegistry()
+    return registry
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_loaders(session: Session) -> None:
+    # Rolled back objects are expired and may no longer exist
+    registry = session.info.get(_LOADERS_KEY)
+    if registry is not None:
+        registry.clear()
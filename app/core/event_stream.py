@@ -0,0 +1,87 @@
+from fastapi import WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from app.core.pubsub import Subscription
+from typing import AsyncIterator
+import asyncio
+import os
+
+# Comment lines sent on idle server-sent event streams, so proxies keep them
+# open and closed clients are noticed
+HEARTBEAT_INTERVAL = float(os.getenv("FEED_HEARTBEAT_SECONDS", "15"))
+# How long browsers wait before reconnecting a dropped stream, in milliseconds
+SSE_RETRY = 3000
+
+
+async def sse_events(subscription: Subscription, heartbeat: float = HEARTBEAT_INTERVAL) -> AsyncIterator[str]:
+    """
+    Encode the events of a subscription as server-sent events.
+
+    The subscription is closed when the stream ends, including when the
+    client disconnects.
+
+    Args:
+        subscription: The subscription
+        heartbeat: Seconds without events after which a comment is sent
+
+    Yields:
+        Server-sent event frames
+    """
+    try:
+        yield f"retry: {SSE_RETRY}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {event.to_json()}\n\n"
+    finally:
+        subscription.close()
+
+
+def sse_response(subscription: Subscription) -> StreamingResponse:
+    """Stream a subscription to the client as server-sent events."""
+    return StreamingResponse(
+        sse_events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def serve_websocket(websocket: WebSocket, subscription: Subscription) -> None:
+    """
+    Forward the events of a subscription to an accepted WebSocket as JSON messages.
+
+    Returns when the client disconnects or the subscription is closed, and
+    closes the subscription either way. Messages from the client are ignored.
+
+    Args:
+        websocket: The accepted WebSocket
+        subscription: The subscription
+    """
+    async def forward():
+        async for event in subscription:
+            await websocket.send_text(event.to_json())
+
+    async def receive():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    sender = asyncio.ensure_future(forward())
+    receiver = asyncio.ensure_future(receive())
+    try:
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        subscription.close()
+        sender.cancel()
+        receiver.cancel()
+
+    if receiver.done() and not receiver.cancelled() and receiver.exception() is None:
+        return
+    # The subscription ended, e.g. the broker shut down, or sending failed
+    try:
+        await websocket.close(code=status.WS_1001_GOING_AWAY)
+    except (RuntimeError, WebSocketDisconnect):
+        pass
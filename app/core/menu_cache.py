@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from typing import Any
+import os
+import time
+
+
+class _Entry:
+    """Cached values for one restaurant at one menu version."""
+
+    __slots__ = ("version", "values", "weight")
+
+    def __init__(self, version: int):
+        self.version = version
+        self.values: dict[str, tuple[Any, int]] = {}
+        self.weight = 0
+
+
+class MenuCache:
+    """
+    In-process, per-restaurant cache for menu reads.
+
+    Every restaurant has a monotonically increasing menu version. Writes to
+    menu data bump the version and drop the cached entry; readers capture the
+    version before loading from the database and `put` refuses values loaded
+    under an older version, so a load racing with a commit can never store a
+    stale menu.
+
+    Entries are evicted least-recently-used first once either the number of
+    restaurants or the total weight (roughly, the number of cached rows)
+    exceeds its budget.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_weight: int = 200_000):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._global_version = 0
+        self._changed_at: dict[int, float] = {}
+        self._global_changed_at = float("-inf")
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version(self, restaurant_id: int) -> int:
+        """
+        Get the current menu version of a restaurant.
+
+        Args:
+            restaurant_id: The restaurant ID
+
+        Returns:
+            The current menu version
+        """
+        return self._versions.get(restaurant_id, 0) + self._global_version
+
+    def changed_within(self, restaurant_id: int, seconds: float) -> bool:
+        """
+        Check whether the menu of a restaurant was invalidated recently.
+
+        Args:
+            restaurant_id: The restaurant ID
+            seconds: The length of the window
+
+        Returns:
+            True if the last invalidation is less than `seconds` old
+        """
+        changed_at = max(self._changed_at.get(restaurant_id, float("-inf")), self._global_changed_at)
+        return time.monotonic() - changed_at < seconds
+
+    def get(self, restaurant_id: int, kind: str) -> Any | None:
+        """
+        Get a cached value for a restaurant.
+
+        Args:
+            restaurant_id: The restaurant ID
+            kind: The kind of cached value, e.g. "menu" or "allergens"
+
+        Returns:
+            The cached value or None on a miss
+        """
+        entry = self._entries.get(restaurant_id)
+        if entry is None or kind not in entry.values:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(restaurant_id)
+        self.hits += 1
+        return entry.values[kind][0]
+
+    def put(self, restaurant_id: int, kind: str, value: Any, version: int, weight: int = 1) -> bool:
+        """
+        Store a value loaded under the given menu version.
+
+        Args:
+            restaurant_id: The restaurant ID
+            kind: The kind of cached value
+            value: The value to cache
+            version: The menu version read before the value was loaded
+            weight: The approximate size of the value, in rows
+
+        Returns:
+            True if the value was stored, False if it was stale or too large
+        """
+        if version != self.version(restaurant_id) or weight > self.max_weight:
+            return False
+
+        entry = self._entries.get(restaurant_id)
+        if entry is None or entry.version != version:
+            self._drop(restaurant_id)
+            entry = _Entry(version)
+            self._entries[restaurant_id] = entry
+
+        previous = entry.values.get(kind)
+        if previous is not None:
+            entry.weight -= previous[1]
+            self._weight -= previous[1]
+
+        entry.values[kind] = (value, weight)
+        entry.weight += weight
+        self._weight += weight
+        self._entries.move_to_end(restaurant_id)
+        self._evict()
+        return True
+
+    def invalidate(self, restaurant_id: int) -> int:
+        """
+        Bump the menu version of a restaurant and drop its cached values.
+
+        Args:
+            restaurant_id: The restaurant ID
+
+        Returns:
+            The new menu version
+        """
+        self._versions[restaurant_id] = self._versions.get(restaurant_id, 0) + 1
+        self._changed_at[restaurant_id] = time.monotonic()
+        self._drop(restaurant_id)
+        self.invalidations += 1
+        return self.version(restaurant_id)
+
+    def invalidate_all(self) -> None:
+        """Bump the menu version of every restaurant and drop all cached values."""
+        self._global_version += 1
+        self._global_changed_at = time.monotonic()
+        self._entries.clear()
+        self._weight = 0
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dictionary with entry, weight, hit, miss and eviction counts
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "weight": self._weight,
+            "max_entries": self.max_entries,
+            "max_weight": self.max_weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, restaurant_id: int) -> None:
+        entry = self._entries.pop(restaurant_id, None)
+        if entry is not None:
+            self._weight -= entry.weight
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._weight > self.max_weight
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._weight -= entry.weight
+            self.evictions += 1
+
+
+menu_cache = MenuCache(
+    max_entries=int(os.getenv("MENU_CACHE_MAX_ENTRIES", "1024")),
+    max_weight=int(os.getenv("MENU_CACHE_MAX_WEIGHT", "200000")),
+)
@@ -0,0 +1,284 @@
+from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
+from app.configs.database import engine, replicas
+from app.configs.pool import pool_stats
+from app.core.menu_cache import menu_cache
+from app.core.singleflight import menu_flights, restaurant_list_cache
+from app.core.pubsub import broker
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import asyncio
+import math
+import os
+import time
+
+# Request latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+# Requests that match no route share one series, so unknown paths cannot
+# create unbounded label values
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets.
+
+    Observing is a bisect and two additions on preallocated storage. The
+    event loop runs one callback at a time, so no lock is needed.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count", "label_text")
+
+    def __init__(self, buckets: Sequence[float], labels: Sequence[Tuple[str, str]] = ()):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        # Rendered once, so scrapes and observations never build label dicts
+        self.label_text = [
+            _format_labels([*labels, ("le", _format_value(bound))])
+            for bound in (*self.buckets, math.inf)
+        ]
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: Sequence[Tuple[str, str]] = ()) -> Iterable[str]:
+        cumulative = 0
+        for count, label_text in zip(self.counts, self.label_text):
+            cumulative += count
+            yield f"{name}_bucket{label_text} {cumulative}"
+        yield f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}"
+        yield f"{name}_count{_format_labels(labels)} {self.count}"
+
+
+class RouteMetrics:
+    """Latency histograms and status counters per route, built at startup."""
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], Tuple[Histogram, Dict[int, int]]] = {}
+        self.in_flight = 0
+
+    def register(self, method: str, route: str) -> None:
+        key = (method, route)
+        if key not in self._routes:
+            labels = (("method", method), ("route", route))
+            self._routes[key] = (Histogram(LATENCY_BUCKETS, labels), {})
+
+    def register_app(self, app: FastAPI) -> None:
+        """Prebuild the series of every route of an application."""
+        for route in app.routes:
+            if isinstance(route, APIRoute):
+                for method in route.methods:
+                    self.register(method, route.path_format)
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        entry = self._routes.get((method, route))
+        if entry is None:
+            self.register(method, route)
+            entry = self._routes[(method, route)]
+        histogram, statuses = entry
+        histogram.observe(seconds)
+        statuses[status_code] = statuses.get(status_code, 0) + 1
+
+    def render(self) -> Iterable[str]:
+        yield "# HELP http_request_duration_seconds Request latency per route."
+        yield "# TYPE http_request_duration_seconds histogram"
+        for (method, route), (histogram, _) in self._routes.items():
+            yield from histogram.render("http_request_duration_seconds", (("method", method), ("route", route)))
+
+        yield "# HELP http_requests_total Requests per route and status code."
+        yield "# TYPE http_requests_total counter"
+        for (method, route), (_, statuses) in self._routes.items():
+            for status_code, count in statuses.items():
+                labels = _format_labels((("method", method), ("route", route), ("status", str(status_code))))
+                yield f"http_requests_total{labels} {count}"
+
+        yield "# HELP http_requests_in_flight Requests being handled."
+        yield "# TYPE http_requests_in_flight gauge"
+        yield f"http_requests_in_flight {self.in_flight}"
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a sleeping task.
+
+    Any lag beyond a few milliseconds means callbacks are blocking the loop,
+    delaying every request handled by the worker.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.histogram = Histogram(LOOP_LAG_BUCKETS)
+        self.last_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.histogram.observe(self.last_lag)
+
+    def render(self) -> Iterable[str]:
+        yield "# HELP event_loop_lag_seconds Delay of event loop wake-ups."
+        yield "# TYPE event_loop_lag_seconds histogram"
+        yield from self.histogram.render("event_loop_lag_seconds")
+        yield "# HELP event_loop_lag_last_seconds Most recent event loop lag."
+        yield "# TYPE event_loop_lag_last_seconds gauge"
+        yield f"event_loop_lag_last_seconds {_format_value(self.last_lag)}"
+
+
+def metric_lines(
+    name: str,
+    help_text: str,
+    samples: Iterable[Tuple[Sequence[Tuple[str, str]], float]],
+    kind: str = "gauge"
+) -> List[str]:
+    """
+    Render a metric with one sample per label set.
+
+    Args:
+        name: The metric name
+        help_text: The metric description
+        samples: Pairs of labels and value
+        kind: The metric type, "gauge" or "counter"
+
+    Returns:
+        The lines of the metric in the Prometheus text format
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+    return lines
+
+
+class MetricsRegistry:
+    """Collects the request metrics and the gauges read at scrape time."""
+
+    def __init__(self):
+        self.routes = RouteMetrics()
+        self.loop_lag = EventLoopLagMonitor()
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def collector(self, fn: Callable[[], Iterable[str]]) -> Callable[[], Iterable[str]]:
+        """Register a function rendering gauges whenever /metrics is scraped."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = [*self.routes.render(), *self.loop_lag.render()]
+        for collect in self._collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Record the latency, status and concurrency of every request."""
+    routes = metrics.routes
+    routes.in_flight += 1
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        routes.in_flight -= 1
+        route = request.scope.get("route")
+        routes.observe(
+            request.method,
+            route.path_format if isinstance(route, APIRoute) else UNMATCHED_ROUTE,
+            status_code,
+            time.perf_counter() - started
+        )
+
+
+@metrics.collector
+def collect_pool_metrics():
+    pools = [("primary", pool_stats(engine))]
+    pools += [(f"replica{i}", stats) for i, stats in enumerate(replicas.stats())]
+
+    lines = []
+    for name, key, help_text, kind in [
+        ("db_pool_checked_out", "checked_out", "Connections in use.", "gauge"),
+        ("db_pool_checked_in", "checked_in", "Idle connections in the pool.", "gauge"),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size.", "gauge"),
+        ("db_pool_acquisitions_total", "acquisitions", "Connection checkouts.", "counter"),
+        ("db_pool_timeouts_total", "timeouts", "Connection checkouts that timed out.", "counter"),
+        ("db_pool_wait_seconds_total", "wait_seconds_total", "Time spent waiting for connections.", "counter"),
+    ]:
+        samples = [((("engine", pool),), stats[key]) for pool, stats in pools if key in stats]
+        lines += metric_lines(name, help_text, samples, kind)
+
+    lines += metric_lines(
+        "db_replica_healthy",
+        "Whether a replica passed its last health check.",
+        [((("engine", pool),), int(stats["healthy"])) for pool, stats in pools[1:]]
+    )
+    return lines
+
+
+@metrics.collector
+def collect_cache_metrics():
+    caches = [
+        ("menu", {**menu_cache.stats(), **menu_flights.stats()}),
+        ("restaurant_list", restaurant_list_cache.stats()),
+    ]
+
+    lines = []
+    for name, key, help_text, kind in [
+        ("cache_hit_ratio", "hit_ratio", "Share of lookups served from cache.", "gauge"),
+        ("cache_entries", "entries", "Entries held by the cache.", "gauge"),
+        ("cache_evictions_total", "evictions", "Entries evicted from the cache.", "counter"),
+        ("cache_coalesced_total", "coalesced", "Misses that waited for an in-flight load.", "counter"),
+    ]:
+        samples = [((("cache", cache),), stats[key]) for cache, stats in caches if key in stats]
+        lines += metric_lines(name, help_text, samples, kind)
+    return lines
+
+
+@metrics.collector
+def collect_feed_metrics():
+    stats = broker.stats()
+    lines = metric_lines("feed_subscribers", "Open order feed subscriptions.", [((), stats["subscribers"])])
+    lines += metric_lines("feed_channels", "Order feed channels with subscriptions.", [((), stats["channels"])])
+    for name, key, help_text in [
+        ("feed_events_published_total", "published", "Events published to the order feeds."),
+        ("feed_events_coalesced_total", "coalesced", "Pending events replaced by a newer event for the same order."),
+        ("feed_events_dropped_total", "dropped", "Events dropped for subscribers that fell behind."),
+    ]:
+        lines += metric_lines(name, help_text, [((), stats[key])], "counter")
+    return lines
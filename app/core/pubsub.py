@@ -0,0 +1,282 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Set
+import abc
+import asyncio
+import enum
+import itertools
+import json
+import os
+
+# Events a subscriber may have pending before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SUBSCRIBER_QUEUE_SIZE", "256"))
+
+RESYNC = "resync"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class Event:
+    """A published event; `key` identifies what it describes, for coalescing."""
+
+    __slots__ = ("id", "channel", "type", "data", "key")
+
+    def __init__(self, id: int, channel: str, type: str, data: Any, key: Hashable | None = None):
+        self.id = id
+        self.channel = channel
+        self.type = type
+        self.data = data
+        self.key = key
+
+    def to_json(self) -> str:
+        return json.dumps({"id": self.id, "type": self.type, "data": self.data}, default=_json_default)
+
+
+class Subscription:
+    """
+    Bounded queue of the events of some channels for one subscriber.
+
+    Publishing never waits for a subscriber. A pending event is replaced by
+    a newer one with the same key, so a slow consumer gets the latest state
+    of an order once instead of every step in between. When the queue is
+    full anyway, the oldest event is dropped, and the next read returns a
+    resync event telling the consumer how many it missed.
+
+    A subscription can be limited in time, and can end with an event of a
+    `close_on` type, which is the last one it returns. Events still pending
+    when it expires are dropped.
+    """
+
+    def __init__(
+        self,
+        broker: "Broker",
+        channels: tuple,
+        maxsize: int,
+        expires_in: float | None = None,
+        close_on: Set[str] = frozenset()
+    ):
+        self.broker = broker
+        self.channels = channels
+        self.maxsize = maxsize
+        self.close_on = close_on
+        self.deadline = None if expires_in is None else asyncio.get_running_loop().time() + expires_in
+        self._pending: OrderedDict[Hashable, Event] = OrderedDict()
+        self._ready = asyncio.Event()
+        self.missed = 0
+        self.closed = False
+
+    def put(self, event: Event) -> None:
+        key = ("event", event.id) if event.key is None else event.key
+        if key in self._pending:
+            self.broker.coalesced += 1
+            del self._pending[key]
+        elif len(self._pending) >= self.maxsize:
+            self._pending.popitem(last=False)
+            self.missed += 1
+            self.broker.dropped += 1
+        self._pending[key] = event
+        self._ready.set()
+
+    async def get(self) -> Event | None:
+        """
+        Wait for the next event.
+
+        Returns:
+            The oldest pending event, a resync event if events were dropped,
+            or None once the subscription is closed or expired
+        """
+        while not self._pending and not self.missed:
+            if self.closed:
+                return None
+            self._ready.clear()
+            if self.deadline is None:
+                await self._ready.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.deadline - asyncio.get_running_loop().time())
+            except asyncio.TimeoutError:
+                self._expire()
+
+        if self.deadline is not None and asyncio.get_running_loop().time() >= self.deadline:
+            self._expire()
+            return None
+        if self.missed:
+            missed, self.missed = self.missed, 0
+            return Event(0, "", RESYNC, {"missed": missed})
+        event = self._pending.popitem(last=False)[1]
+        if event.type in self.close_on:
+            self._expire()
+        return event
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.broker._unsubscribe(self)
+            self._ready.set()
+
+    def _expire(self) -> None:
+        self._pending.clear()
+        self.missed = 0
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BrokerBackend(abc.ABC):
+    """
+    Carries published events to the subscribers of every process.
+
+    The broker passes each event to `publish`, which must not block: a
+    backend that talks to a server (Redis, PostgreSQL LISTEN/NOTIFY) queues
+    the event for a background task. Received events, including the
+    process' own, are handed to the `deliver` callback given to `start`.
+    """
+
+    def start(self, deliver: Callable[[Event], None]) -> None:
+        self.deliver = deliver
+
+    @abc.abstractmethod
+    def publish(self, event: Event) -> None:
+        """Send an event to the subscribers of every process, without blocking."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InProcessBackend(BrokerBackend):
+    """Delivers events to the subscribers of this process only."""
+
+    def publish(self, event: Event) -> None:
+        self.deliver(event)
+
+
+class Broker:
+    """
+    Publish/subscribe fan-out of events to channel subscribers.
+
+    Subscribers each get a bounded Subscription, so one stalled screen can
+    neither slow down publishers nor grow memory for the others.
+    """
+
+    def __init__(self, backend: BrokerBackend | None = None, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.use(backend or InProcessBackend())
+
+    def use(self, backend: BrokerBackend) -> None:
+        """
+        Switch the backend events are published through.
+
+        Args:
+            backend: The new backend
+        """
+        self.backend = backend
+        backend.start(self._deliver)
+
+    def subscribe(
+        self,
+        *channels: str,
+        queue_size: int | None = None,
+        expires_in: float | None = None,
+        close_on: Set[str] = frozenset()
+    ) -> Subscription:
+        """
+        Subscribe to the events of some channels.
+
+        Args:
+            channels: The channel names
+            queue_size: The number of pending events kept for the subscriber
+            expires_in: Seconds after which the subscription ends by itself
+            close_on: Event types that end the subscription once read
+
+        Returns:
+            The Subscription; close it, or use it as an async context
+            manager, to unsubscribe
+        """
+        subscription = Subscription(self, channels, queue_size or self.queue_size, expires_in, close_on)
+        for channel in channels:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def publish(self, channel: str, type: str, data: Any, key: Hashable | None = None) -> Event:
+        """
+        Publish an event without waiting for its subscribers.
+
+        Args:
+            channel: The channel name
+            type: The event type
+            data: JSON-serializable payload
+            key: What the event describes; a pending event with the same key
+                is replaced
+
+        Returns:
+            The published Event
+        """
+        event = Event(next(self._ids), channel, type, data, key)
+        self.published += 1
+        self.backend.publish(event)
+        return event
+
+    def subscribers(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            # Subscriptions can follow several channels
+            "subscribers": len(set().union(*self._channels.values())),
+            "published": self.published,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+    async def close(self) -> None:
+        """Close every subscription and the backend."""
+        for subscriptions in list(self._channels.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        await self.backend.close()
+
+    def _deliver(self, event: Event) -> None:
+        for subscription in self._channels.get(event.channel, ()):
+            subscription.put(event)
+            self.delivered += 1
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        for channel in subscription.channels:
+            subscriptions = self._channels.get(channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._channels[channel]
+
+
+broker = Broker()
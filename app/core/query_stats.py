@@ -0,0 +1,169 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from fastapi import Request
+from contextvars import ContextVar
+from collections import Counter
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger("orderflow.slow_query")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|:\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(?:\([^()]*\)\s*,?\s*)+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(AssertionError):
+    """Raised in test mode when a request runs the same statement too often."""
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so that executions differing only in values match.
+
+    Literals and bind parameters become `?`, and IN and VALUES lists of any
+    length collapse into one placeholder. Results are memoized, as compiled
+    statements repeat.
+
+    Args:
+        statement: The SQL statement
+
+    Returns:
+        The normalized statement
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_LIST.sub("VALUES (...) ", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_id(statement: str) -> str:
+    return hashlib.sha1(fingerprint(statement).encode()).hexdigest()[:16]
+
+
+class RequestQueryStats:
+    """
+    The queries run while handling one request.
+
+    Fingerprints are only counted when the monitor has a repeat limit.
+    """
+
+    __slots__ = ("route", "count", "seconds", "fingerprints")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+class QueryMonitor:
+    """
+    Records the queries of every request through engine events.
+
+    Statements slower than `slow_query_seconds` are logged as JSON with
+    their fingerprint. With a `repeat_limit`, meant for tests, a request that
+    runs the same fingerprint more often than the limit fails with
+    RepeatedQueryError, which catches N+1 query patterns early.
+    """
+
+    def __init__(self, slow_query_seconds: float, repeat_limit: int = 0):
+        self.slow_query_seconds = slow_query_seconds
+        self.repeat_limit = repeat_limit
+        self._current: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+    def start_request(self, route: str) -> RequestQueryStats:
+        """
+        Start collecting the queries of the current request.
+
+        Tasks created by the request copy the context, so their queries
+        count towards the request as well.
+
+        Args:
+            route: The route or path of the request
+
+        Returns:
+            The stats collected for the request
+        """
+        stats = RequestQueryStats(route)
+        self._current.set(stats)
+        return stats
+
+    def current(self) -> RequestQueryStats | None:
+        return self._current.get()
+
+    def end_request(self) -> None:
+        self._current.set(None)
+
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        stats = self._current.get()
+
+        if elapsed >= self.slow_query_seconds:
+            logger.warning(json.dumps({
+                "event": "slow_query",
+                "fingerprint": fingerprint_id(statement),
+                "duration_ms": round(elapsed * 1000, 3),
+                "route": stats.route if stats else None,
+                "statement": fingerprint(statement)[:2000],
+            }))
+
+        if stats is None:
+            return
+        stats.count += 1
+        stats.seconds += elapsed
+
+        if not self.repeat_limit or executemany:
+            return
+        key = fingerprint(statement)
+        stats.fingerprints[key] += 1
+        if stats.fingerprints[key] > self.repeat_limit:
+            raise RepeatedQueryError(
+                f"{stats.route} ran the same statement {stats.fingerprints[key]} times: {key}"
+            )
+
+    def handle_error(self, exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+query_monitor = QueryMonitor(
+    slow_query_seconds=float(os.getenv("SLOW_QUERY_SECONDS", "0.2")),
+    repeat_limit=int(os.getenv("SQL_REPEAT_LIMIT", "0")),
+)
+
+# Registered on the Engine class so that the primary, the replicas and any
+# engine created later are all covered
+event.listen(Engine, "before_cursor_execute", query_monitor.before_execute)
+event.listen(Engine, "after_cursor_execute", query_monitor.after_execute)
+event.listen(Engine, "handle_error", query_monitor.handle_error)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Count the queries of a request and report them in a Server-Timing header."""
+    stats = query_monitor.start_request(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        query_monitor.end_request()
+    response.headers.append("Server-Timing", stats.server_timing())
+    return response
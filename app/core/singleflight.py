@@ -0,0 +1,174 @@
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+import asyncio
+import os
+import time
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical reads.
+
+    The first caller for a key starts the load; every caller arriving while
+    it is in flight awaits the same future instead of loading again. The
+    load runs as its own task, so a cancelled caller does not cancel it for
+    the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a load once for all concurrent callers of a key.
+
+        Args:
+            key: Identifies the read; include anything the result depends on
+            fn: Coroutine function performing the load
+
+        Returns:
+            The result of the load
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class StaleWhileRevalidate:
+    """
+    TTL cache that keeps serving an expired value while it is refreshed.
+
+    A value is fresh for `ttl` seconds. For the following `stale_ttl`
+    seconds it is still returned immediately while one background task
+    reloads it; after that, readers wait for a single-flight load.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, flight: SingleFlight | None = None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.flight = flight or SingleFlight()
+        self._values: dict[Hashable, tuple[Any, float]] = {}
+        self._generations: dict[Hashable, int] = {}
+        self._refreshes: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    async def get(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Get a value, loading or refreshing it with `fn` when needed.
+
+        `fn` may run after the caller's request has finished, so it must not
+        use request-scoped resources such as the request's database session.
+
+        Args:
+            key: The cache key
+            fn: Coroutine function loading the value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._values.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fn)
+                return value
+
+        self.misses += 1
+        return await self.flight.do(key, lambda: self._load(key, fn))
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Expire a value so that the next read refreshes it.
+
+        The previous value is still served during the stale window.
+
+        Args:
+            key: The cache key
+        """
+        self._generations[key] = self._generations.get(key, 0) + 1
+        entry = self._values.get(key)
+        if entry is not None:
+            self._values[key] = (entry[0], min(entry[1], time.monotonic() - self.ttl))
+
+    def clear(self) -> None:
+        for key in list(self._values):
+            self._generations[key] = self._generations.get(key, 0) + 1
+        self._values.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._values),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refresh_errors": self.refresh_errors,
+            **self.flight.stats(),
+        }
+
+    async def _load(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        generation = self._generations.get(key, 0)
+        value = await fn()
+        # A load racing with an invalidation must not be stored as fresh
+        if generation == self._generations.get(key, 0):
+            self._values[key] = (value, time.monotonic())
+        return value
+
+    def _refresh_in_background(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> None:
+        if self.flight.is_in_flight(key):
+            return
+
+        async def refresh():
+            try:
+                await self.flight.do(key, lambda: self._load(key, fn))
+            except Exception:
+                # The stale value keeps being served; the next read retries
+                self.refresh_errors += 1
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+
+# Coalesces menu and allergen loads of the same restaurant and menu version
+menu_flights = SingleFlight()
+
+restaurant_list_cache = StaleWhileRevalidate(
+    ttl=float(os.getenv("RESTAURANT_LIST_CACHE_TTL_SECONDS", "30")),
+    stale_ttl=float(os.getenv("RESTAURANT_LIST_CACHE_STALE_SECONDS", "300")),
+)
@@ -0,0 +1,113 @@
+from fastapi import Request, Response
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Snapshots are compressed on the request that misses the cache, so favour
+# speed over the last few percent of compression the maximum levels give
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+class EncodedSnapshot:
+    """
+    An encoded response body kept together with its compressed variants.
+
+    Snapshots are built once per cached value, so serving one never runs the
+    serializer or the compressor again. Each variant gets its own strong ETag
+    derived from the content hash, which stays stable across workers and
+    restarts as long as the content is the same.
+    """
+
+    __slots__ = ("body", "etag", "variants", "media_type")
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.body = body
+        self.media_type = media_type
+        self.etag = f'"{digest}"'
+        # Content-Encoding -> (ETag, compressed body), in order of preference
+        self.variants: dict[str, tuple[str, bytes]] = {}
+        if brotli is not None:
+            self.variants["br"] = (f'"{digest}-br"', brotli.compress(body, quality=BROTLI_QUALITY))
+        self.variants["gzip"] = (f'"{digest}-gz"', gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+
+    @property
+    def size(self) -> int:
+        """Total number of bytes held by the snapshot and its variants."""
+        return len(self.body) + sum(len(body) for _, body in self.variants.values())
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """
+        Check an If-None-Match header against every variant of the snapshot.
+
+        Args:
+            if_none_match: The raw If-None-Match header value
+
+        Returns:
+            True if the client already holds this content
+        """
+        if not if_none_match:
+            return False
+
+        etags = {self.etag} | {etag for etag, _ in self.variants.values()}
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            # If-None-Match uses the weak comparison function
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate in etags:
+                return True
+        return False
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Build the response for a request, answering 304 when possible.
+
+        Args:
+            request: The incoming request
+
+        Returns:
+            A 304 response or the best encoded variant the client accepts
+        """
+        encoding = self._negotiate(request.headers.get("accept-encoding", ""))
+        etag, body = self.variants[encoding] if encoding else (self.etag, self.body)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+    def _negotiate(self, accept_encoding: str) -> str | None:
+        accepted = set()
+        for token in accept_encoding.split(","):
+            coding, _, params = token.strip().partition(";")
+            params = params.replace(" ", "")
+            if params.startswith("q=") and _quality(params[2:]) == 0:
+                continue
+            accepted.add(coding.strip().lower())
+
+        for encoding in self.variants:
+            if encoding in accepted or "*" in accepted:
+                return encoding
+        return None
+
+
+def _quality(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
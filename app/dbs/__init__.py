@@ -0,0 +1,43 @@
+# Import every model so SQLAlchemy can resolve string-based relationships
+# and Base.metadata knows about all tables.
+from .allergen.model import Allergen
+from .category.model import Category
+from .customization_choice.model import CustomizationChoice
+from .customization_option.model import CustomizationOption
+from .ingredient.model import Ingredient
+from .ingredient_stock.model import IngredientStock
+from .inventory_daily_summary.model import InventoryDailySummary
+from .inventory_transaction.model import InventoryTransaction
+from .menu_item.model import MenuItem
+from .menu_item_allergen.model import MenuItemAllergen
+from .menu_item_recipe.model import MenuItemRecipe
+from .order.model import Order
+from .order_customization.model import OrderCustomization
+from .order_item.model import OrderItem
+from .qr_session.model import QRSession
+from .restaurant.model import Restaurant
+from .sales_hourly.model import SalesHourly
+from .sales_hourly_item.model import SalesHourlyItem
+from .table.model import Table
+
+__all__ = [
+    "Allergen",
+    "Category",
+    "CustomizationChoice",
+    "CustomizationOption",
+    "Ingredient",
+    "IngredientStock",
+    "InventoryDailySummary",
+    "InventoryTransaction",
+    "MenuItem",
+    "MenuItemAllergen",
+    "MenuItemRecipe",
+    "Order",
+    "OrderCustomization",
+    "OrderItem",
+    "QRSession",
+    "Restaurant",
+    "SalesHourly",
+    "SalesHourlyItem",
+    "Table",
+]
@@ -1,14 +1,15 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.allergen.model import Allergen
-from typing import List
+from app.core.menu_cache import menu_cache
+from app.core.allergen_index import allergen_indexes
+from typing import AsyncIterator, List
 
 
-class AllergenMgmt:
+class AllergenMgmt(BaseMgmt[Allergen]):
     """Database management operations for allergens."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Allergen
     
     async def get_all_active(self) -> List[Allergen]:
         """
@@ -17,9 +18,32 @@ class AllergenMgmt:
         Returns:
             List of Allergen objects
         """
-        query = select(Allergen)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Allergen]:
+        """
+        Retrieve one page of allergens, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Allergen objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Allergen]:
+        """
+        Stream all allergens through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Allergen objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, allergen_id: int) -> Allergen | None:
         """
@@ -31,44 +55,39 @@ class AllergenMgmt:
         Returns:
             Allergen object or None if not found
         """
-        query = select(Allergen).where(Allergen.id == allergen_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(allergen_id)
     
-    async def create(self, allergen_data: dict) -> Allergen:
+    async def create(self, allergen_data: dict, commit: bool = True) -> Allergen:
         """
         Create a new allergen.
         
         Args:
             allergen_data: Dictionary containing allergen data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Allergen object
         """
-        allergen = Allergen(**allergen_data)
-        self.db.add(allergen)
-        await self.db.commit()
-        await self.db.refresh(allergen)
-        return allergen
+        return await super().create(allergen_data, commit)
     
-    async def update(self, allergen_id: int, update_data: dict) -> Allergen | None:
+    async def update(self, allergen_id: int, update_data: dict, commit: bool = True) -> Allergen | None:
         """
         Update an allergen.
         
         Args:
             allergen_id: The allergen ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Allergen object or None if not found
         """
-        allergen = await self.get_by_id(allergen_id)
-        if not allergen:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(allergen, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(allergen)
-        return allergen
\ No newline at end of file
+        return await super().update(allergen_id, update_data, commit)
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        # Allergens are shared by every restaurant's menu
+        on_commit(self.db, menu_cache.invalidate_all)
+        for allergen in rows:
+            on_commit(self.db, lambda allergen=allergen: allergen_indexes.set_allergen(
+                allergen.id, allergen.i18n_key, allergen.severity_level
+            ))
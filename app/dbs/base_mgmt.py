@@ -0,0 +1,324 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select, insert, update, tuple_, event, func
+from sqlalchemy.orm import Session
+from app.dbs.pagination import Page, paginate, stream, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
+from app.core.dataloader import DataLoader, loaders
+from typing import Any, AsyncIterator, Callable, Generic, List, Sequence, TypeVar
+
+ModelT = TypeVar("ModelT")
+
+_ON_COMMIT_KEY = "on_commit_callbacks"
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run a callback once the session's current transaction commits.
+
+    Callbacks are dropped if the transaction rolls back, so in-process caches
+    are only touched for writes that actually became visible.
+
+    Args:
+        db: The database session
+        callback: Synchronous callable without arguments
+    """
+    db.sync_session.info.setdefault(_ON_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_ON_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit_callbacks(session: Session) -> None:
+    session.info.pop(_ON_COMMIT_KEY, None)
+
+
+class BaseMgmt(Generic[ModelT]):
+    """
+    Generic database management operations shared by all Mgmt classes.
+
+    Subclasses set `model` and, if rows are soft deleted by flipping a boolean
+    flag, `active_column` and mix in SoftDeleteMixin. Single-row writes are
+    one statement with RETURNING instead of a SELECT followed by an UPDATE
+    and a refresh, and the bulk variants write any number of rows in one
+    statement and one transaction.
+
+    Every write method takes `commit=True`; pass False to compose several
+    writes into one transaction and commit it yourself.
+    """
+
+    model: type[ModelT]
+    # Boolean column that marks a row as active; SoftDeleteMixin sets it to False
+    active_column: str | None = None
+    # Columns that decide which cached data a row belongs to. When an update
+    # changes one of them, _after_write also receives the previous values.
+    scope_columns: tuple[str, ...] = ()
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @property
+    def primary_key(self) -> tuple:
+        return tuple(self.model.__mapper__.primary_key)
+
+    def active_query(self) -> Select:
+        """
+        Build the select of the rows considered active.
+
+        Returns:
+            Select of the model, without soft-deleted rows if active_column is set
+        """
+        query = select(self.model)
+        if self.active_column:
+            query = query.where(getattr(self.model, self.active_column) == True)
+            if hasattr(self.model, "deleted_at"):
+                # Lets the planner use the partial indexes on live rows
+                query = query.where(self.model.deleted_at.is_(None))
+        return query
+
+    async def get_all_active(self) -> List[ModelT]:
+        """
+        Retrieve all active rows from the database.
+
+        Returns:
+            List of model objects
+        """
+        result = await self.db.execute(self.active_query())
+        return result.scalars().all()
+
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[ModelT]:
+        """
+        Retrieve one page of active rows, ordered by primary key.
+
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+
+        Returns:
+            Page of model objects and the cursor of the next page
+        """
+        return await paginate(self.db, self.active_query(), self.primary_key, limit, cursor)
+
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[ModelT]:
+        """
+        Stream all active rows through a server-side cursor.
+
+        Args:
+            batch_size: The number of rows fetched per round trip
+
+        Returns:
+            Async iterator of model objects
+        """
+        return stream(self.db, self.active_query(), batch_size)
+
+    @property
+    def loader(self) -> DataLoader:
+        """
+        The request-scoped loader of the model.
+
+        Lookups by primary key made in the same event-loop tick are batched
+        into one query, and each row is loaded at most once per request.
+        """
+        return loaders(self.db).get(self.model, self._load_by_ids)
+
+    async def get_by_id(self, identity: Any) -> ModelT | None:
+        """
+        Retrieve an active row by primary key.
+
+        Args:
+            identity: The primary key value, or a tuple for composite keys
+
+        Returns:
+            Model object or None if not found
+        """
+        return await self.loader.load(self._identity_key(identity))
+
+    async def get_many(self, identities: Sequence[Any]) -> List[ModelT]:
+        """
+        Retrieve active rows by primary key with a single query.
+
+        Args:
+            identities: The primary key values
+
+        Returns:
+            List of the model objects found, in no particular order
+        """
+        if not identities:
+            return []
+        rows = await self.loader.load_many(dict.fromkeys(self._identity_key(identity) for identity in identities))
+        return [row for row in rows if row is not None]
+
+    async def create(self, data: dict, commit: bool = True) -> ModelT:
+        """
+        Create a row with INSERT ... RETURNING.
+
+        Args:
+            data: Dictionary containing the column values
+            commit: Whether to commit the transaction
+
+        Returns:
+            Created model object
+        """
+        stmt = insert(self.model).values(**data).returning(self.model)
+        row = (await self.db.execute(stmt)).scalar_one()
+        await self._finish_write([row], commit=commit)
+        return row
+
+    async def bulk_create(self, rows: Sequence[dict], commit: bool = True) -> List[ModelT]:
+        """
+        Create many rows with multi-row INSERT ... RETURNING statements.
+
+        Args:
+            rows: Dictionaries containing the column values, all with the same keys
+            commit: Whether to commit the transaction
+
+        Returns:
+            Created model objects, in the order of `rows`
+        """
+        if not rows:
+            return []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        created = (await self.db.scalars(stmt, [dict(row) for row in rows])).all()
+        await self._finish_write(created, commit=commit)
+        return created
+
+    async def update(self, identity: Any, update_data: dict, commit: bool = True) -> ModelT | None:
+        """
+        Update an active row with UPDATE ... RETURNING.
+
+        Args:
+            identity: The primary key value, or a tuple for composite keys
+            update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
+
+        Returns:
+            Updated model object or None if not found
+        """
+        updated = await self._update(self._identity_clause(identity), [identity], update_data, commit)
+        return updated[0] if updated else None
+
+    async def bulk_update(self, identities: Sequence[Any], update_data: dict, commit: bool = True) -> List[ModelT]:
+        """
+        Apply the same update to many active rows with a single UPDATE.
+
+        Args:
+            identities: The primary key values
+            update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
+
+        Returns:
+            Updated model objects
+        """
+        if not identities:
+            return []
+        return await self._update(self._identities_clause(identities), identities, update_data, commit)
+
+    async def _after_write(self, rows: Sequence[Any], previous: Sequence[Any] = ()) -> None:
+        """
+        Hook called inside the transaction after rows were written.
+
+        Use `on_commit` to schedule cache updates that must only happen once
+        the write is committed.
+
+        Args:
+            rows: The written model objects
+            previous: Rows with the previous values of `scope_columns`, for
+                updates that changed one of them
+        """
+
+    async def _update(self, clause, identities: Sequence[Any], update_data: dict, commit: bool) -> List[ModelT]:
+        previous = []
+        if self.scope_columns and any(column in update_data for column in self.scope_columns):
+            columns = [*self.primary_key, *(getattr(self.model, column) for column in self.scope_columns)]
+            query = select(*columns).where(self._identities_clause(identities))
+            previous = (await self.db.execute(query)).all()
+
+        stmt = (
+            update(self.model)
+            .where(clause)
+            .values(**update_data)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if self.active_column:
+            stmt = stmt.where(getattr(self.model, self.active_column) == True)
+
+        updated = (await self.db.execute(stmt)).scalars().all()
+        await self._finish_write(updated, previous, commit=commit)
+        return updated
+
+    async def _load_by_ids(self, keys: list) -> dict:
+        query = self.active_query().where(self._identities_clause(keys))
+        result = await self.db.execute(query)
+        return {self._row_key(row): row for row in result.scalars().all()}
+
+    async def _finish_write(self, rows: Sequence[Any], previous: Sequence[Any] = (), commit: bool = True) -> None:
+        loaders(self.db).clear(self.model)
+        if rows or previous:
+            await self._after_write(rows, previous)
+        if commit:
+            await self.db.commit()
+
+    def _identity_key(self, identity: Any):
+        return identity if len(self.primary_key) == 1 else tuple(identity)
+
+    def _row_key(self, row: Any):
+        values = tuple(getattr(row, column.key) for column in self.primary_key)
+        return values[0] if len(values) == 1 else values
+
+    def _identity_clause(self, identity: Any):
+        primary_key = self.primary_key
+        if len(primary_key) == 1:
+            return primary_key[0] == identity
+        return tuple_(*primary_key) == tuple_(*identity)
+
+    def _identities_clause(self, identities: Sequence[Any]):
+        primary_key = self.primary_key
+        if len(primary_key) == 1:
+            return primary_key[0].in_(list(identities))
+        return tuple_(*primary_key).in_([tuple(identity) for identity in identities])
+
+
+class SoftDeleteMixin:
+    """
+    Soft delete operations for Mgmt classes whose rows are deactivated
+    instead of deleted.
+
+    Combine with BaseMgmt and set `active_column`:
+    `class CategoryMgmt(SoftDeleteMixin, BaseMgmt[Category])`.
+    """
+
+    async def soft_delete(self, identity: Any, commit: bool = True) -> bool:
+        """
+        Soft delete a row by setting its active column to False and, when
+        the model has one, stamping deleted_at.
+
+        Args:
+            identity: The primary key value, or a tuple for composite keys
+            commit: Whether to commit the transaction
+
+        Returns:
+            True if deleted, False if not found
+        """
+        return bool(await self.bulk_soft_delete([identity], commit=commit))
+
+    async def bulk_soft_delete(self, identities: Sequence[Any], commit: bool = True) -> int:
+        """
+        Soft delete many rows with a single UPDATE.
+
+        Args:
+            identities: The primary key values
+            commit: Whether to commit the transaction
+
+        Returns:
+            Number of rows soft deleted
+        """
+        if not identities:
+            return 0
+        values = {self.active_column: False}
+        if hasattr(self.model, "deleted_at"):
+            values["deleted_at"] = func.now()
+        updated = await self._update(self._identities_clause(identities), identities, values, commit)
+        return len(updated)
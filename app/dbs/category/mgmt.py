@@ -1,14 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from functools import partial
+from app.dbs.base_mgmt import BaseMgmt, SoftDeleteMixin, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.category.model import Category
-from typing import List
+from app.core.menu_cache import menu_cache
+from typing import AsyncIterator, List
 
 
-class CategoryMgmt:
+class CategoryMgmt(SoftDeleteMixin, BaseMgmt[Category]):
     """Database management operations for categories."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Category
+    active_column = "is_active"
+    scope_columns = ("restaurant_id",)
     
     async def get_all_active(self) -> List[Category]:
         """
@@ -17,9 +20,32 @@ class CategoryMgmt:
         Returns:
             List of Category objects
         """
-        query = select(Category).where(Category.is_active == True)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Category]:
+        """
+        Retrieve one page of active categories, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Category objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Category]:
+        """
+        Stream all active categories through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Category objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, category_id: int) -> Category | None:
         """
@@ -31,65 +57,48 @@ class CategoryMgmt:
         Returns:
             Category object or None if not found
         """
-        query = select(Category).where(
-            Category.id == category_id,
-            Category.is_active == True
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(category_id)
     
-    async def create(self, category_data: dict) -> Category:
+    async def create(self, category_data: dict, commit: bool = True) -> Category:
         """
         Create a new category.
         
         Args:
             category_data: Dictionary containing category data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Category object
         """
-        category = Category(**category_data)
-        self.db.add(category)
-        await self.db.commit()
-        await self.db.refresh(category)
-        return category
+        return await super().create(category_data, commit)
     
-    async def update(self, category_id: int, update_data: dict) -> Category | None:
+    async def update(self, category_id: int, update_data: dict, commit: bool = True) -> Category | None:
         """
         Update a category.
         
         Args:
             category_id: The category ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Category object or None if not found
         """
-        category = await self.get_by_id(category_id)
-        if not category:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(category, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(category)
-        return category
+        return await super().update(category_id, update_data, commit)
     
-    async def soft_delete(self, category_id: int) -> bool:
+    async def soft_delete(self, category_id: int, commit: bool = True) -> bool:
         """
         Soft delete a category by setting is_active to False.
         
         Args:
             category_id: The category ID
+            commit: Whether to commit the transaction
             
         Returns:
             True if deleted, False if not found
         """
-        category = await self.get_by_id(category_id)
-        if not category:
-            return False
-        
-        category.is_active = False
-        await self.db.commit()
-        return True
\ No newline at end of file
+        return await super().soft_delete(category_id, commit)
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        for restaurant_id in {row.restaurant_id for row in [*rows, *previous]}:
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -12,6 +12,17 @@ class Category(BaseModel):
     is_active = Column(Boolean, default=True)
     deleted_at = Column(DateTime(timezone=True))
     
+    __table_args__ = (
+        Index("ix_categories_restaurant_id", "restaurant_id"),
+        # Menu reads: the active categories of a restaurant in display order
+        Index(
+            "ix_categories_menu",
+            "restaurant_id", "sort_order", "name", "id",
+            postgresql_where=(is_active == True) & deleted_at.is_(None),
+            sqlite_where=(is_active == True) & deleted_at.is_(None),
+        ),
+    )
+    
     # Relationships
     restaurant = relationship("Restaurant", back_populates="categories")
     menu_items = relationship("MenuItem", back_populates="category")
\ No newline at end of file
@@ -1,14 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from functools import partial
+from app.dbs.base_mgmt import BaseMgmt, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.customization_choice.model import CustomizationChoice
-from typing import List
+from app.dbs.customization_option.mgmt import CustomizationOptionMgmt
+from app.core.menu_cache import menu_cache
+from typing import AsyncIterator, List
 
 
-class CustomizationChoiceMgmt:
+class CustomizationChoiceMgmt(BaseMgmt[CustomizationChoice]):
     """Database management operations for customization choices."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = CustomizationChoice
+    scope_columns = ("option_id",)
     
     async def get_all_active(self) -> List[CustomizationChoice]:
         """
@@ -17,9 +20,32 @@ class CustomizationChoiceMgmt:
         Returns:
             List of CustomizationChoice objects
         """
-        query = select(CustomizationChoice)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[CustomizationChoice]:
+        """
+        Retrieve one page of customization choices, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of CustomizationChoice objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[CustomizationChoice]:
+        """
+        Stream all customization choices through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of CustomizationChoice objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, choice_id: int) -> CustomizationChoice | None:
         """
@@ -31,44 +57,37 @@ class CustomizationChoiceMgmt:
         Returns:
             CustomizationChoice object or None if not found
         """
-        query = select(CustomizationChoice).where(CustomizationChoice.id == choice_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(choice_id)
     
-    async def create(self, choice_data: dict) -> CustomizationChoice:
+    async def create(self, choice_data: dict, commit: bool = True) -> CustomizationChoice:
         """
         Create a new customization choice.
         
         Args:
             choice_data: Dictionary containing customization choice data
+            commit: Whether to commit the transaction
             
         Returns:
             Created CustomizationChoice object
         """
-        choice = CustomizationChoice(**choice_data)
-        self.db.add(choice)
-        await self.db.commit()
-        await self.db.refresh(choice)
-        return choice
+        return await super().create(choice_data, commit)
     
-    async def update(self, choice_id: int, update_data: dict) -> CustomizationChoice | None:
+    async def update(self, choice_id: int, update_data: dict, commit: bool = True) -> CustomizationChoice | None:
         """
         Update a customization choice.
         
         Args:
             choice_id: The customization choice ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated CustomizationChoice object or None if not found
         """
-        choice = await self.get_by_id(choice_id)
-        if not choice:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(choice, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(choice)
-        return choice
\ No newline at end of file
+        return await super().update(choice_id, update_data, commit)
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        option_ids = {row.option_id for row in [*rows, *previous]}
+        restaurant_ids = await CustomizationOptionMgmt(self.db).get_restaurant_ids(option_ids)
+        for restaurant_id in set(restaurant_ids.values()):
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
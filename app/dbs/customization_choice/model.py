@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -12,6 +12,10 @@ class CustomizationChoice(BaseModel):
     is_available = Column(Boolean, default=True)
     sort_order = Column(Integer, default=0)
     
+    __table_args__ = (
+        Index("ix_customization_choices_option_id", "option_id"),
+    )
+    
     # Relationships
     customization_option = relationship("CustomizationOption", back_populates="customization_choices")
     order_customizations = relationship("OrderCustomization", back_populates="customization_choice")
\ No newline at end of file
@@ -1,14 +1,20 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from functools import partial
 from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt, SoftDeleteMixin, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.customization_option.model import CustomizationOption
-from typing import List
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.core.menu_cache import menu_cache
+from typing import AsyncIterator, Iterable, List
 
 
-class CustomizationOptionMgmt:
+class CustomizationOptionMgmt(SoftDeleteMixin, BaseMgmt[CustomizationOption]):
     """Database management operations for customization options."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = CustomizationOption
+    active_column = "is_active"
+    scope_columns = ("item_id",)
     
     async def get_all_active(self) -> List[CustomizationOption]:
         """
@@ -17,9 +23,32 @@ class CustomizationOptionMgmt:
         Returns:
             List of CustomizationOption objects
         """
-        query = select(CustomizationOption).where(CustomizationOption.is_active == True)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[CustomizationOption]:
+        """
+        Retrieve one page of active customization options, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of CustomizationOption objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[CustomizationOption]:
+        """
+        Stream all active customization options through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of CustomizationOption objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, option_id: int) -> CustomizationOption | None:
         """
@@ -31,65 +60,72 @@ class CustomizationOptionMgmt:
         Returns:
             CustomizationOption object or None if not found
         """
-        query = select(CustomizationOption).where(
-            CustomizationOption.id == option_id,
-            CustomizationOption.is_active == True
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(option_id)
     
-    async def create(self, option_data: dict) -> CustomizationOption:
+    async def create(self, option_data: dict, commit: bool = True) -> CustomizationOption:
         """
         Create a new customization option.
         
         Args:
             option_data: Dictionary containing customization option data
+            commit: Whether to commit the transaction
             
         Returns:
             Created CustomizationOption object
         """
-        option = CustomizationOption(**option_data)
-        self.db.add(option)
-        await self.db.commit()
-        await self.db.refresh(option)
-        return option
+        return await super().create(option_data, commit)
     
-    async def update(self, option_id: int, update_data: dict) -> CustomizationOption | None:
+    async def update(self, option_id: int, update_data: dict, commit: bool = True) -> CustomizationOption | None:
         """
         Update a customization option.
         
         Args:
             option_id: The customization option ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated CustomizationOption object or None if not found
         """
-        option = await self.get_by_id(option_id)
-        if not option:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(option, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(option)
-        return option
+        return await super().update(option_id, update_data, commit)
     
-    async def soft_delete(self, option_id: int) -> bool:
+    async def soft_delete(self, option_id: int, commit: bool = True) -> bool:
         """
         Soft delete a customization option by setting is_active to False.
         
         Args:
             option_id: The customization option ID
+            commit: Whether to commit the transaction
             
         Returns:
             True if deleted, False if not found
         """
-        option = await self.get_by_id(option_id)
-        if not option:
-            return False
+        return await super().soft_delete(option_id, commit)
+    
+    async def get_restaurant_ids(self, option_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Retrieve the restaurant IDs customization options belong to.
+        
+        Args:
+            option_ids: The customization option IDs
+            
+        Returns:
+            Dictionary mapping customization option ID to restaurant ID
+        """
+        option_ids = list(option_ids)
+        if not option_ids:
+            return {}
         
-        option.is_active = False
-        await self.db.commit()
-        return True
\ No newline at end of file
+        query = (
+            select(CustomizationOption.id, MenuItem.restaurant_id)
+            .join(MenuItem, MenuItem.id == CustomizationOption.item_id)
+            .where(CustomizationOption.id.in_(option_ids))
+        )
+        result = await self.db.execute(query)
+        return dict(result.all())
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        item_ids = {row.item_id for row in [*rows, *previous]}
+        restaurant_ids = await MenuItemMgmt(self.db).get_restaurant_ids(item_ids)
+        for restaurant_id in set(restaurant_ids.values()):
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -14,6 +14,10 @@ class CustomizationOption(BaseModel):
     sort_order = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
     
+    __table_args__ = (
+        Index("ix_customization_options_item_id", "item_id"),
+    )
+    
     # Relationships
     menu_item = relationship("MenuItem", back_populates="customization_options")
     customization_choices = relationship("CustomizationChoice", back_populates="customization_option")
@@ -1,14 +1,14 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt, SoftDeleteMixin
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.ingredient.model import Ingredient
-from typing import List
+from typing import AsyncIterator, List
 
 
-class IngredientMgmt:
+class IngredientMgmt(SoftDeleteMixin, BaseMgmt[Ingredient]):
     """Database management operations for ingredients."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Ingredient
+    active_column = "is_active"
     
     async def get_all_active(self) -> List[Ingredient]:
         """
@@ -17,9 +17,32 @@ class IngredientMgmt:
         Returns:
             List of Ingredient objects
         """
-        query = select(Ingredient).where(Ingredient.is_active == True)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Ingredient]:
+        """
+        Retrieve one page of active ingredients, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Ingredient objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Ingredient]:
+        """
+        Stream all active ingredients through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Ingredient objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, ingredient_id: int) -> Ingredient | None:
         """
@@ -31,65 +54,44 @@ class IngredientMgmt:
         Returns:
             Ingredient object or None if not found
         """
-        query = select(Ingredient).where(
-            Ingredient.id == ingredient_id,
-            Ingredient.is_active == True
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(ingredient_id)
     
-    async def create(self, ingredient_data: dict) -> Ingredient:
+    async def create(self, ingredient_data: dict, commit: bool = True) -> Ingredient:
         """
         Create a new ingredient.
         
         Args:
             ingredient_data: Dictionary containing ingredient data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Ingredient object
         """
-        ingredient = Ingredient(**ingredient_data)
-        self.db.add(ingredient)
-        await self.db.commit()
-        await self.db.refresh(ingredient)
-        return ingredient
+        return await super().create(ingredient_data, commit)
     
-    async def update(self, ingredient_id: int, update_data: dict) -> Ingredient | None:
+    async def update(self, ingredient_id: int, update_data: dict, commit: bool = True) -> Ingredient | None:
         """
         Update an ingredient.
         
         Args:
             ingredient_id: The ingredient ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Ingredient object or None if not found
         """
-        ingredient = await self.get_by_id(ingredient_id)
-        if not ingredient:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(ingredient, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(ingredient)
-        return ingredient
+        return await super().update(ingredient_id, update_data, commit)
     
-    async def soft_delete(self, ingredient_id: int) -> bool:
+    async def soft_delete(self, ingredient_id: int, commit: bool = True) -> bool:
         """
         Soft delete an ingredient by setting is_active to False.
         
         Args:
             ingredient_id: The ingredient ID
+            commit: Whether to commit the transaction
             
         Returns:
             True if deleted, False if not found
         """
-        ingredient = await self.get_by_id(ingredient_id)
-        if not ingredient:
-            return False
-        
-        ingredient.is_active = False
-        await self.db.commit()
-        return True
\ No newline at end of file
+        return await super().soft_delete(ingredient_id, commit)
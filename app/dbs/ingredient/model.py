@@ -22,4 +22,6 @@ class Ingredient(BaseModel):
     # Relationships
     restaurant = relationship("Restaurant", back_populates="ingredients")
     menu_item_recipes = relationship("MenuItemRecipe", back_populates="ingredient")
-    inventory_transactions = relationship("InventoryTransaction", back_populates="ingredient")
\ No newline at end of file
+    inventory_transactions = relationship("InventoryTransaction", back_populates="ingredient")
+    stock = relationship("IngredientStock", back_populates="ingredient", uselist=False)
+    daily_summaries = relationship("InventoryDailySummary", back_populates="ingredient")
\ No newline at end of file
@@ -0,0 +1,81 @@
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.ingredient_stock.model import IngredientStock
+from decimal import Decimal
+from typing import Dict, Sequence
+
+
+class IngredientStockMgmt(BaseMgmt[IngredientStock]):
+    """Database management operations for the current-stock projection."""
+    
+    model = IngredientStock
+    
+    async def lock(self, ingredient_ids: Sequence[int]) -> Dict[int, Decimal]:
+        """
+        Lock the stock rows of ingredients and read their quantities.
+        
+        Missing rows are created first. Rows are locked in ascending
+        ingredient ID order, so transactions locking overlapping sets
+        acquire the shared rows in the same order and cannot deadlock.
+        
+        Args:
+            ingredient_ids: The ingredient IDs
+            
+        Returns:
+            Dictionary mapping ingredient ID to its current quantity
+        """
+        ingredient_ids = sorted(set(ingredient_ids))
+        if not ingredient_ids:
+            return {}
+        
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        await self.db.execute(
+            dialect.insert(IngredientStock)
+            .values([{"ingredient_id": ingredient_id, "quantity": 0} for ingredient_id in ingredient_ids])
+            .on_conflict_do_nothing(index_elements=[IngredientStock.ingredient_id])
+        )
+        result = await self.db.execute(
+            select(IngredientStock.ingredient_id, IngredientStock.quantity)
+            .where(IngredientStock.ingredient_id.in_(ingredient_ids))
+            .order_by(IngredientStock.ingredient_id)
+            .with_for_update()
+        )
+        return dict(result.all())
+    
+    async def get_quantities(self, ingredient_ids: Sequence[int]) -> Dict[int, Decimal]:
+        """
+        Read the current quantities of ingredients without locking them.
+        
+        Args:
+            ingredient_ids: The ingredient IDs
+            
+        Returns:
+            Dictionary mapping ingredient ID to its quantity, for ingredients
+            with a stock row
+        """
+        if not ingredient_ids:
+            return {}
+        result = await self.db.execute(
+            select(IngredientStock.ingredient_id, IngredientStock.quantity)
+            .where(IngredientStock.ingredient_id.in_(ingredient_ids))
+        )
+        return dict(result.all())
+    
+    async def set_quantities(self, quantities: Dict[int, Decimal], commit: bool = True) -> None:
+        """
+        Overwrite the quantities of locked stock rows with one executemany UPDATE.
+        
+        Args:
+            quantities: Dictionary mapping ingredient ID to its new quantity
+            commit: Whether to commit the transaction
+        """
+        if quantities:
+            await self.db.execute(
+                update(IngredientStock),
+                [
+                    {"ingredient_id": ingredient_id, "quantity": quantity}
+                    for ingredient_id, quantity in quantities.items()
+                ]
+            )
+        await self._finish_write([], commit=commit)
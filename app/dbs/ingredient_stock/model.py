@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL, func
+from sqlalchemy.orm import relationship
+from app.configs.database import Base
+
+
+class IngredientStock(Base):
+    """Current stock of an ingredient: the latest quantity_after of its ledger."""
+    __tablename__ = "ingredient_stocks"
+    
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), primary_key=True)
+    quantity = Column(DECIMAL(10, 3), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    ingredient = relationship("Ingredient", back_populates="stock")
@@ -0,0 +1,85 @@
+from sqlalchemy import select, func, case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.inventory_daily_summary.model import InventoryDailySummary
+from app.dbs.inventory_transaction.model import InventoryTransaction, TransactionType
+from datetime import datetime
+
+TOTAL_COLUMNS = {
+    "consumption": TransactionType.order_consumption,
+    "waste": TransactionType.waste,
+    "restock": TransactionType.restock,
+    "adjustment": TransactionType.adjustment,
+}
+
+
+class InventoryDailySummaryMgmt(BaseMgmt[InventoryDailySummary]):
+    """Database management operations for compacted ledger days."""
+    
+    model = InventoryDailySummary
+    
+    async def summarize(self, lower: datetime | None, upper: datetime) -> int:
+        """
+        Add the ledger rows of a time range to the daily summaries.
+        
+        Runs as one INSERT ... SELECT. Days already summarized are merged and
+        take the new quantity_after, since rows compacted by a later run were
+        recorded later. The ledger rows must be deleted in the same
+        transaction, or they would be counted again by the next run.
+        
+        Args:
+            lower: The start of the range, or None for everything before `upper`
+            upper: The end of the range, exclusive
+            
+        Returns:
+            Number of summary rows written
+        """
+        ledger = InventoryTransaction
+        last = aliased(InventoryTransaction)
+        
+        def in_range(model):
+            if lower is None:
+                return model.created_at < upper
+            return (model.created_at >= lower) & (model.created_at < upper)
+        
+        day = func.date(ledger.created_at)
+        grouped = (
+            select(
+                ledger.ingredient_id,
+                day.label("day"),
+                *(
+                    func.coalesce(func.sum(case((ledger.transaction_type == kind, ledger.quantity_change))), 0)
+                    .label(column)
+                    for column, kind in TOTAL_COLUMNS.items()
+                ),
+                func.count().label("transaction_count"),
+                func.max(ledger.id).label("last_id"),
+            )
+            .where(in_range(ledger))
+            .group_by(ledger.ingredient_id, day)
+            .subquery()
+        )
+        # The ledger row each day ends with; the range lets partitions be pruned
+        rows = (
+            select(*(column for column in grouped.c if column.name != "last_id"), last.quantity_after)
+            .join(last, last.id == grouped.c.last_id)
+            .where(in_range(last))
+        )
+        
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(InventoryDailySummary).from_select(
+            ["ingredient_id", "day", *TOTAL_COLUMNS, "transaction_count", "quantity_after"],
+            rows
+        )
+        summary, excluded = InventoryDailySummary, stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[summary.ingredient_id, summary.day],
+            set_={
+                **{column: getattr(summary, column) + getattr(excluded, column) for column in TOTAL_COLUMNS},
+                "transaction_count": summary.transaction_count + excluded.transaction_count,
+                "quantity_after": excluded.quantity_after,
+            }
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DECIMAL
+from sqlalchemy.orm import relationship
+from app.configs.database import Base
+
+
+class InventoryDailySummary(Base):
+    """
+    Compacted ledger of an ingredient for one day.
+
+    The totals are sums of quantity_change per transaction type, so
+    consumption and waste are negative. quantity_after is the stock after
+    the last transaction of the day.
+    """
+    __tablename__ = "inventory_daily_summaries"
+    
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    consumption = Column(DECIMAL(12, 3), nullable=False, default=0)
+    waste = Column(DECIMAL(12, 3), nullable=False, default=0)
+    restock = Column(DECIMAL(12, 3), nullable=False, default=0)
+    adjustment = Column(DECIMAL(12, 3), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    quantity_after = Column(DECIMAL(10, 3), nullable=False)
+    
+    # Relationships
+    ingredient = relationship("Ingredient", back_populates="daily_summaries")
@@ -1,14 +1,50 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, delete, text
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.inventory_transaction.model import InventoryTransaction
-from typing import List
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Sequence
+import re
 
+DEFAULT_PARTITION = "inventory_transactions_default"
+_PARTITION_NAME = re.compile(r"^inventory_transactions_p(\d{4})(\d{2})$")
 
-class InventoryTransactionMgmt:
-    """Database management operations for inventory transactions."""
+
+def month_start(value: datetime) -> datetime:
+    """
+    Get the start of the UTC month containing a time.
+    
+    Args:
+        value: The time, naive times are treated as UTC
+        
+    Returns:
+        Midnight UTC of the first day of the month
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"inventory_transactions_p{month:%Y%m}"
+
+
+class InventoryTransactionMgmt(BaseMgmt[InventoryTransaction]):
+    """
+    Database management operations for inventory transactions.
+    
+    On PostgreSQL the ledger is range partitioned by month of created_at,
+    with a default partition catching rows of months that have none yet.
+    Old months are compacted into daily summaries and dropped as a whole.
+    """
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = InventoryTransaction
     
     async def get_all_active(self) -> List[InventoryTransaction]:
         """
@@ -17,9 +53,32 @@ class InventoryTransactionMgmt:
         Returns:
             List of InventoryTransaction objects
         """
-        query = select(InventoryTransaction)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[InventoryTransaction]:
+        """
+        Retrieve one page of inventory transactions, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of InventoryTransaction objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[InventoryTransaction]:
+        """
+        Stream all inventory transactions through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of InventoryTransaction objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, transaction_id: int) -> InventoryTransaction | None:
         """
@@ -31,44 +90,162 @@ class InventoryTransactionMgmt:
         Returns:
             InventoryTransaction object or None if not found
         """
-        query = select(InventoryTransaction).where(InventoryTransaction.id == transaction_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(transaction_id)
     
-    async def create(self, transaction_data: dict) -> InventoryTransaction:
+    async def create(self, transaction_data: dict, commit: bool = True) -> InventoryTransaction:
         """
         Create a new inventory transaction.
         
         Args:
             transaction_data: Dictionary containing inventory transaction data
+            commit: Whether to commit the transaction
             
         Returns:
             Created InventoryTransaction object
         """
-        transaction = InventoryTransaction(**transaction_data)
-        self.db.add(transaction)
-        await self.db.commit()
-        await self.db.refresh(transaction)
-        return transaction
+        return await super().create(transaction_data, commit)
     
-    async def update(self, transaction_id: int, update_data: dict) -> InventoryTransaction | None:
+    async def update(self, transaction_id: int, update_data: dict, commit: bool = True) -> InventoryTransaction | None:
         """
         Update an inventory transaction.
         
         Args:
             transaction_id: The inventory transaction ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated InventoryTransaction object or None if not found
         """
-        transaction = await self.get_by_id(transaction_id)
-        if not transaction:
-            return None
+        return await super().update(transaction_id, update_data, commit)
+    
+    async def append(self, rows: Sequence[dict], commit: bool = True) -> int:
+        """
+        Append rows to the ledger with a single executemany INSERT.
         
-        for key, value in update_data.items():
-            setattr(transaction, key, value)
+        Nothing is returned from the database, so drivers batch the rows
+        into multi-row statements whatever the dialect.
         
-        await self.db.commit()
-        await self.db.refresh(transaction)
-        return transaction
\ No newline at end of file
+        Args:
+            rows: Dictionaries containing the column values, all with the same keys
+            commit: Whether to commit the transaction
+            
+        Returns:
+            Number of rows appended
+        """
+        if not rows:
+            return 0
+        await self.db.execute(insert(InventoryTransaction), [dict(row) for row in rows])
+        await self._finish_write([], commit=commit)
+        return len(rows)
+    
+    async def delete_range(self, lower: datetime | None, upper: datetime) -> int:
+        """
+        Delete the ledger rows created in a time range.
+        
+        Args:
+            lower: The start of the range, or None for everything before `upper`
+            upper: The end of the range, exclusive
+            
+        Returns:
+            Number of rows deleted
+        """
+        stmt = delete(InventoryTransaction).where(InventoryTransaction.created_at < upper)
+        if lower is not None:
+            stmt = stmt.where(InventoryTransaction.created_at >= lower)
+        result = await self.db.execute(stmt.execution_options(synchronize_session=False))
+        return result.rowcount
+    
+    async def is_partitioned(self) -> bool:
+        """Check whether the ledger is a partitioned table."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        result = await self.db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('inventory_transactions'))"
+        ))
+        return bool(result.scalar())
+    
+    async def get_partitions(self) -> Dict[datetime, str]:
+        """
+        List the monthly partitions of the ledger.
+        
+        Returns:
+            Dictionary mapping the start of each month to its partition name,
+            in chronological order; the default partition is not included
+        """
+        result = await self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('inventory_transactions')"
+        ))
+        partitions = {}
+        for name in result.scalars().all():
+            match = _PARTITION_NAME.match(name)
+            if match:
+                partitions[datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)] = name
+        return dict(sorted(partitions.items()))
+    
+    async def create_partition(self, month: datetime) -> str:
+        """
+        Create the partition of a month.
+        
+        Rows the default partition caught for the month are moved into the
+        new partition before it is attached.
+        
+        Args:
+            month: The start of the month
+            
+        Returns:
+            The name of the partition
+        """
+        month = month_start(month)
+        lower, upper = month, add_months(month, 1)
+        name = partition_name(month)
+        await self.db.execute(text(
+            f"CREATE TABLE {name} (LIKE inventory_transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        has_default = await self.db.execute(text(f"SELECT to_regclass('{DEFAULT_PARTITION}') IS NOT NULL"))
+        if has_default.scalar():
+            await self.db.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                {"lower": lower, "upper": upper}
+            )
+        await self.db.execute(text(
+            f"ALTER TABLE inventory_transactions ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        return name
+    
+    async def ensure_partitions(self, now: datetime, months_ahead: int) -> List[str]:
+        """
+        Create the missing partitions from the current month on.
+        
+        Args:
+            now: The current time
+            months_ahead: The number of months after the current one to cover
+            
+        Returns:
+            The names of the partitions created
+        """
+        existing = await self.get_partitions()
+        current = month_start(now)
+        return [
+            await self.create_partition(month)
+            for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+            if month not in existing
+        ]
+    
+    async def drop_partition(self, name: str) -> None:
+        """
+        Drop a monthly partition with all its rows.
+        
+        Args:
+            name: The partition name, as returned by `get_partitions`
+        """
+        if not _PARTITION_NAME.match(name):
+            raise ValueError(f"{name} is not a ledger partition")
+        await self.db.execute(text(f"DROP TABLE {name}"))
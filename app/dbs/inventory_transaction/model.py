@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DECIMAL, Enum
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, DECIMAL, Enum, Index, func
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -12,8 +12,16 @@ class TransactionType(enum.Enum):
 
 
 class InventoryTransaction(BaseModel):
+    """
+    Stock ledger row.
+
+    On PostgreSQL the table is partitioned by month of created_at, which is
+    therefore part of the primary key there; see InventoryTransactionMgmt.
+    """
     __tablename__ = "inventory_transactions"
     
+    # The partition key
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=False)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=True)
     order_item_id = Column(Integer, ForeignKey("order_items.order_item_id"), nullable=True)
@@ -24,6 +32,17 @@ class InventoryTransaction(BaseModel):
     notes = Column(String(255))
     staff_id = Column(Integer, nullable=True)  # FK to staff table (not defined in ERD)
     
+    __table_args__ = (
+        Index("ix_inventory_transactions_ingredient_time", "ingredient_id", "created_at"),
+        # Consumption check of an order
+        Index(
+            "ix_inventory_transactions_order_id",
+            "order_id",
+            postgresql_where=order_id.isnot(None),
+            sqlite_where=order_id.isnot(None),
+        ),
+    )
+    
     # Relationships
     ingredient = relationship("Ingredient", back_populates="inventory_transactions")
     order = relationship("Order", back_populates="inventory_transactions")
@@ -1,14 +1,21 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from functools import partial
+from sqlalchemy import select, update, func
+from app.dbs.base_mgmt import BaseMgmt, SoftDeleteMixin, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
+from app.core.dataloader import loaders
 from app.dbs.menu_item.model import MenuItem
-from typing import List
+from app.dbs.menu_item_recipe.model import MenuItemRecipe
+from app.dbs.ingredient_stock.model import IngredientStock
+from app.core.menu_cache import menu_cache
+from typing import AsyncIterator, Iterable, List
 
 
-class MenuItemMgmt:
+class MenuItemMgmt(SoftDeleteMixin, BaseMgmt[MenuItem]):
     """Database management operations for menu items."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = MenuItem
+    active_column = "is_available"
+    scope_columns = ("restaurant_id",)
     
     async def get_all_active(self) -> List[MenuItem]:
         """
@@ -17,9 +24,32 @@ class MenuItemMgmt:
         Returns:
             List of MenuItem objects
         """
-        query = select(MenuItem).where(MenuItem.is_available == True)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[MenuItem]:
+        """
+        Retrieve one page of available menu items, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of MenuItem objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[MenuItem]:
+        """
+        Stream all available menu items through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of MenuItem objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, menu_item_id: int) -> MenuItem | None:
         """
@@ -31,65 +61,120 @@ class MenuItemMgmt:
         Returns:
             MenuItem object or None if not found
         """
-        query = select(MenuItem).where(
-            MenuItem.id == menu_item_id,
-            MenuItem.is_available == True
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(menu_item_id)
     
-    async def create(self, menu_item_data: dict) -> MenuItem:
+    async def create(self, menu_item_data: dict, commit: bool = True) -> MenuItem:
         """
         Create a new menu item.
         
         Args:
             menu_item_data: Dictionary containing menu item data
+            commit: Whether to commit the transaction
             
         Returns:
             Created MenuItem object
         """
-        menu_item = MenuItem(**menu_item_data)
-        self.db.add(menu_item)
-        await self.db.commit()
-        await self.db.refresh(menu_item)
-        return menu_item
+        return await super().create(menu_item_data, commit)
     
-    async def update(self, menu_item_id: int, update_data: dict) -> MenuItem | None:
+    async def update(self, menu_item_id: int, update_data: dict, commit: bool = True) -> MenuItem | None:
         """
         Update a menu item.
         
+        Setting is_available by hand takes the item out of the stock
+        tracking, so a restock never brings back an item disabled on purpose.
+        
         Args:
             menu_item_id: The menu item ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated MenuItem object or None if not found
         """
-        menu_item = await self.get_by_id(menu_item_id)
-        if not menu_item:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(menu_item, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(menu_item)
-        return menu_item
+        if "is_available" in update_data:
+            update_data = {**update_data, "out_of_stock": False}
+        return await super().update(menu_item_id, update_data, commit)
     
-    async def soft_delete(self, menu_item_id: int) -> bool:
+    async def soft_delete(self, menu_item_id: int, commit: bool = True) -> bool:
         """
         Soft delete a menu item by setting is_available to False.
         
         Args:
             menu_item_id: The menu item ID
+            commit: Whether to commit the transaction
             
         Returns:
             True if deleted, False if not found
         """
-        menu_item = await self.get_by_id(menu_item_id)
-        if not menu_item:
-            return False
+        return await super().soft_delete(menu_item_id, commit)
+    
+    async def get_restaurant_ids(self, menu_item_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Retrieve the restaurant IDs menu items belong to.
+        
+        Args:
+            menu_item_ids: The menu item IDs
+            
+        Returns:
+            Dictionary mapping menu item ID to restaurant ID
+        """
+        menu_item_ids = list(menu_item_ids)
+        if not menu_item_ids:
+            return {}
+        
+        query = select(MenuItem.id, MenuItem.restaurant_id).where(MenuItem.id.in_(menu_item_ids))
+        result = await self.db.execute(query)
+        return dict(result.all())
+    
+    async def sync_stock_availability(self, ingredient_ids: Iterable[int], restore: bool = False) -> List[int]:
+        """
+        Recompute the availability of the items depending on critical ingredients.
+        
+        Only items with a critical recipe line on one of the given ingredients
+        are looked at, through the reverse recipe index. An item runs out of
+        stock while any of its critical ingredients has less than one portion
+        left. Items made unavailable by hand are never restored.
         
-        menu_item.is_available = False
-        await self.db.commit()
-        return True
\ No newline at end of file
+        Args:
+            ingredient_ids: The ingredients whose stock changed
+            restore: Restore out-of-stock items after a restock instead of
+                taking items off the menu after a deduction
+            
+        Returns:
+            The IDs of the menu items whose availability changed
+        """
+        ingredient_ids = list(ingredient_ids)
+        if not ingredient_ids:
+            return []
+        
+        affected = (
+            select(MenuItemRecipe.menu_item_id)
+            .where(MenuItemRecipe.ingredient_id.in_(ingredient_ids))
+            .where(MenuItemRecipe.is_critical == True)
+        )
+        short = (
+            select(MenuItemRecipe.id)
+            .outerjoin(IngredientStock, IngredientStock.ingredient_id == MenuItemRecipe.ingredient_id)
+            .where(MenuItemRecipe.menu_item_id == MenuItem.id)
+            .where(MenuItemRecipe.is_critical == True)
+            .where(func.coalesce(IngredientStock.quantity, 0) < MenuItemRecipe.quantity_needed)
+            .exists()
+        )
+        stmt = update(MenuItem).where(MenuItem.id.in_(affected), MenuItem.deleted_at.is_(None))
+        if restore:
+            stmt = stmt.where(MenuItem.out_of_stock == True, ~short).values(is_available=True, out_of_stock=False)
+        else:
+            stmt = stmt.where(MenuItem.is_available == True, short).values(is_available=False, out_of_stock=True)
+        
+        result = await self.db.execute(
+            stmt.returning(MenuItem.id, MenuItem.restaurant_id).execution_options(synchronize_session=False)
+        )
+        changed = result.all()
+        loaders(self.db).clear(MenuItem)
+        for restaurant_id in {restaurant_id for _, restaurant_id in changed}:
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
+        return [menu_item_id for menu_item_id, _ in changed]
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        for restaurant_id in {row.restaurant_id for row in [*rows, *previous]}:
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
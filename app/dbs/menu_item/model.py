@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, DECIMAL
+from sqlalchemy import Column, String, Text, Integer, Boolean, ForeignKey, DateTime, DECIMAL, Index, false
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -14,9 +14,22 @@ class MenuItem(BaseModel):
     image_url = Column(String(512))
     spice_level = Column(Integer, default=0)  # Using Integer instead of TINYINT for SQLAlchemy compatibility
     is_available = Column(Boolean, default=True)
+    # Set while the item is unavailable because a critical ingredient ran out
+    out_of_stock = Column(Boolean, nullable=False, default=False, server_default=false())
     sort_order = Column(Integer, default=0)
     deleted_at = Column(DateTime(timezone=True))
     
+    __table_args__ = (
+        Index("ix_menu_items_restaurant_id", "restaurant_id"),
+        # Menu reads: the available items of a category in display order
+        Index(
+            "ix_menu_items_menu",
+            "category_id", "sort_order", "name",
+            postgresql_where=(is_available == True) & deleted_at.is_(None),
+            sqlite_where=(is_available == True) & deleted_at.is_(None),
+        ),
+    )
+    
     # Relationships
     restaurant = relationship("Restaurant", back_populates="menu_items")
     category = relationship("Category", back_populates="menu_items")
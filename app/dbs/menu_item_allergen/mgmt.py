@@ -1,14 +1,20 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from functools import partial
+from sqlalchemy import delete
+from app.dbs.base_mgmt import BaseMgmt, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.menu_item_allergen.model import MenuItemAllergen
-from typing import List
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.allergen.mgmt import AllergenMgmt
+from app.core.menu_cache import menu_cache
+from app.core.allergen_index import allergen_indexes
+from typing import AsyncIterator, List
 
 
-class MenuItemAllergenMgmt:
+class MenuItemAllergenMgmt(BaseMgmt[MenuItemAllergen]):
     """Database management operations for menu item allergens."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = MenuItemAllergen
+    scope_columns = ("menu_item_id", "allergen_id")
     
     async def get_all_active(self) -> List[MenuItemAllergen]:
         """
@@ -17,45 +23,66 @@ class MenuItemAllergenMgmt:
         Returns:
             List of MenuItemAllergen objects
         """
-        query = select(MenuItemAllergen)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
     
-    async def get_by_ids(self, menu_item_id: int, allergen_id: int) -> MenuItemAllergen | None:
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[MenuItemAllergen]:
         """
-        Retrieve a menu item allergen by menu item ID and allergen ID.
+        Retrieve one page of menu item allergens, ordered by menu item ID and allergen ID.
         
         Args:
-            menu_item_id: The menu item ID
-            allergen_id: The allergen ID
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
             
         Returns:
-            MenuItemAllergen object or None if not found
+            Page of MenuItemAllergen objects and the cursor of the next page
         """
-        query = select(MenuItemAllergen).where(
-            MenuItemAllergen.menu_item_id == menu_item_id,
-            MenuItemAllergen.allergen_id == allergen_id
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_page(limit, cursor)
     
-    async def create(self, allergen_data: dict) -> MenuItemAllergen:
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[MenuItemAllergen]:
+        """
+        Stream all menu item allergens through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of MenuItemAllergen objects
+        """
+        return super().stream_all_active(batch_size)
+    
+    async def create(self, allergen_data: dict, commit: bool = True) -> MenuItemAllergen:
         """
         Create a new menu item allergen.
         
         Args:
             allergen_data: Dictionary containing menu item allergen data
+            commit: Whether to commit the transaction
             
         Returns:
             Created MenuItemAllergen object
         """
-        allergen = MenuItemAllergen(**allergen_data)
-        self.db.add(allergen)
-        await self.db.commit()
-        await self.db.refresh(allergen)
-        return allergen
+        return await super().create(allergen_data, commit)
     
-    async def update(self, menu_item_id: int, allergen_id: int, update_data: dict) -> MenuItemAllergen | None:
+    async def get_by_ids(self, menu_item_id: int, allergen_id: int) -> MenuItemAllergen | None:
+        """
+        Retrieve a menu item allergen by menu item ID and allergen ID.
+        
+        Args:
+            menu_item_id: The menu item ID
+            allergen_id: The allergen ID
+            
+        Returns:
+            MenuItemAllergen object or None if not found
+        """
+        return await self.get_by_id((menu_item_id, allergen_id))
+    
+    async def update(
+        self,
+        menu_item_id: int,
+        allergen_id: int,
+        update_data: dict,
+        commit: bool = True
+    ) -> MenuItemAllergen | None:
         """
         Update a menu item allergen.
         
@@ -63,17 +90,67 @@ class MenuItemAllergenMgmt:
             menu_item_id: The menu item ID
             allergen_id: The allergen ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated MenuItemAllergen object or None if not found
         """
-        allergen = await self.get_by_ids(menu_item_id, allergen_id)
-        if not allergen:
-            return None
+        return await super().update((menu_item_id, allergen_id), update_data, commit)
+    
+    async def delete(self, menu_item_id: int, allergen_id: int, commit: bool = True) -> bool:
+        """
+        Delete a menu item allergen.
+        
+        Args:
+            menu_item_id: The menu item ID
+            allergen_id: The allergen ID
+            commit: Whether to commit the transaction
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        stmt = (
+            delete(MenuItemAllergen)
+            .where(
+                MenuItemAllergen.menu_item_id == menu_item_id,
+                MenuItemAllergen.allergen_id == allergen_id
+            )
+            .returning(MenuItemAllergen.menu_item_id, MenuItemAllergen.allergen_id)
+        )
+        deleted = (await self.db.execute(stmt)).all()
+        await self._finish_write([], deleted, commit=commit)
+        return bool(deleted)
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        restaurant_ids = await MenuItemMgmt(self.db).get_restaurant_ids(
+            {row.menu_item_id for row in [*rows, *previous]}
+        )
+        allergens = {
+            allergen.id: allergen
+            for allergen in await AllergenMgmt(self.db).get_many({row.allergen_id for row in rows})
+        }
         
-        for key, value in update_data.items():
-            setattr(allergen, key, value)
+        for restaurant_id in set(restaurant_ids.values()):
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant_id))
         
-        await self.db.commit()
-        await self.db.refresh(allergen)
-        return allergen
\ No newline at end of file
+        # Keep the allergen indexes up to date without rebuilding them
+        current = {(row.menu_item_id, row.allergen_id) for row in rows}
+        for row in previous:
+            restaurant_id = restaurant_ids.get(row.menu_item_id)
+            if restaurant_id is not None and (row.menu_item_id, row.allergen_id) not in current:
+                on_commit(self.db, partial(
+                    allergen_indexes.remove_link, restaurant_id, row.menu_item_id, row.allergen_id
+                ))
+        for row in rows:
+            restaurant_id = restaurant_ids.get(row.menu_item_id)
+            allergen = allergens.get(row.allergen_id)
+            if restaurant_id is not None:
+                on_commit(self.db, partial(
+                    allergen_indexes.set_link,
+                    restaurant_id,
+                    row.menu_item_id,
+                    row.allergen_id,
+                    row.contamination_risk.value,
+                    allergen.i18n_key if allergen else None,
+                    allergen.severity_level if allergen else None
+                ))
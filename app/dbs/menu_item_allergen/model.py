@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, ForeignKey, Enum
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.configs.database import Base
 import enum
 
 
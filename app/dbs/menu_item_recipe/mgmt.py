@@ -1,14 +1,13 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.menu_item_recipe.model import MenuItemRecipe
-from typing import List
+from typing import AsyncIterator, List
 
 
-class MenuItemRecipeMgmt:
+class MenuItemRecipeMgmt(BaseMgmt[MenuItemRecipe]):
     """Database management operations for menu item recipes."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = MenuItemRecipe
     
     async def get_all_active(self) -> List[MenuItemRecipe]:
         """
@@ -17,9 +16,32 @@ class MenuItemRecipeMgmt:
         Returns:
             List of MenuItemRecipe objects
         """
-        query = select(MenuItemRecipe)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[MenuItemRecipe]:
+        """
+        Retrieve one page of menu item recipes, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of MenuItemRecipe objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[MenuItemRecipe]:
+        """
+        Stream all menu item recipes through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of MenuItemRecipe objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, recipe_id: int) -> MenuItemRecipe | None:
         """
@@ -31,44 +53,31 @@ class MenuItemRecipeMgmt:
         Returns:
             MenuItemRecipe object or None if not found
         """
-        query = select(MenuItemRecipe).where(MenuItemRecipe.id == recipe_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(recipe_id)
     
-    async def create(self, recipe_data: dict) -> MenuItemRecipe:
+    async def create(self, recipe_data: dict, commit: bool = True) -> MenuItemRecipe:
         """
         Create a new menu item recipe.
         
         Args:
             recipe_data: Dictionary containing menu item recipe data
+            commit: Whether to commit the transaction
             
         Returns:
             Created MenuItemRecipe object
         """
-        recipe = MenuItemRecipe(**recipe_data)
-        self.db.add(recipe)
-        await self.db.commit()
-        await self.db.refresh(recipe)
-        return recipe
+        return await super().create(recipe_data, commit)
     
-    async def update(self, recipe_id: int, update_data: dict) -> MenuItemRecipe | None:
+    async def update(self, recipe_id: int, update_data: dict, commit: bool = True) -> MenuItemRecipe | None:
         """
         Update a menu item recipe.
         
         Args:
             recipe_id: The menu item recipe ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated MenuItemRecipe object or None if not found
         """
-        recipe = await self.get_by_id(recipe_id)
-        if not recipe:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(recipe, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(recipe)
-        return recipe
\ No newline at end of file
+        return await super().update(recipe_id, update_data, commit)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -13,6 +13,18 @@ class MenuItemRecipe(BaseModel):
     is_critical = Column(Boolean, default=False)
     notes = Column(String(255))
     
+    __table_args__ = (
+        # Expanding ordered items into ingredients
+        Index("ix_menu_item_recipes_menu_item_id", "menu_item_id"),
+        # Reverse index for stock-driven availability: the items depending on an ingredient
+        Index(
+            "ix_menu_item_recipes_critical_ingredient",
+            "ingredient_id", "menu_item_id",
+            postgresql_where=is_critical == True,
+            sqlite_where=is_critical == True,
+        ),
+    )
+    
     # Relationships
     menu_item = relationship("MenuItem", back_populates="menu_item_recipes")
     ingredient = relationship("Ingredient", back_populates="menu_item_recipes")
\ No newline at end of file
@@ -1,14 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import update
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.order.model import Order
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, List
 
+FINAL_STATUSES = ("completed", "cancelled")
 
-class OrderMgmt:
+
+class OrderMgmt(BaseMgmt[Order]):
     """Database management operations for orders."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Order
     
     async def get_all_active(self) -> List[Order]:
         """
@@ -17,9 +20,32 @@ class OrderMgmt:
         Returns:
             List of Order objects
         """
-        query = select(Order)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Order]:
+        """
+        Retrieve one page of orders, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Order objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Order]:
+        """
+        Stream all orders through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Order objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, order_id: int) -> Order | None:
         """
@@ -31,44 +57,60 @@ class OrderMgmt:
         Returns:
             Order object or None if not found
         """
-        query = select(Order).where(Order.id == order_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(order_id)
     
-    async def create(self, order_data: dict) -> Order:
+    async def create(self, order_data: dict, commit: bool = True) -> Order:
         """
         Create a new order.
         
         Args:
             order_data: Dictionary containing order data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Order object
         """
-        order = Order(**order_data)
-        self.db.add(order)
-        await self.db.commit()
-        await self.db.refresh(order)
-        return order
+        return await super().create(order_data, commit)
     
-    async def update(self, order_id: int, update_data: dict) -> Order | None:
+    async def update(self, order_id: int, update_data: dict, commit: bool = True) -> Order | None:
         """
         Update an order.
         
         Args:
             order_id: The order ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Order object or None if not found
         """
-        order = await self.get_by_id(order_id)
-        if not order:
-            return None
+        return await super().update(order_id, update_data, commit)
+    
+    async def complete(self, order_id: int, completed_at: datetime, commit: bool = True) -> Order | None:
+        """
+        Mark an open order as completed.
         
-        for key, value in update_data.items():
-            setattr(order, key, value)
+        The status check and the update are one statement, so concurrent
+        calls complete an order only once.
         
-        await self.db.commit()
-        await self.db.refresh(order)
-        return order
\ No newline at end of file
+        Args:
+            order_id: The order ID
+            completed_at: The completion time
+            commit: Whether to commit the transaction
+            
+        Returns:
+            The completed Order object, or None if the order is not found or
+            was already completed or cancelled
+        """
+        stmt = (
+            update(Order)
+            .where(Order.id == order_id)
+            .where(Order.deleted_at.is_(None))
+            .where(Order.status.notin_(FINAL_STATUSES))
+            .values(status="completed", completed_time=completed_at)
+            .returning(Order)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        order = (await self.db.execute(stmt)).scalar_one_or_none()
+        await self._finish_write([order] if order else [], commit=commit)
+        return order
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, DECIMAL, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, DECIMAL, Text, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -20,6 +20,16 @@ class Order(BaseModel):
     completed_time = Column(DateTime(timezone=True))
     deleted_at = Column(DateTime(timezone=True))
     
+    __table_args__ = (
+        # Order queues and reports of a restaurant by status and time
+        Index(
+            "ix_orders_restaurant_status_time",
+            "restaurant_id", "status", "order_time",
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
+    )
+    
     # Relationships
     restaurant = relationship("Restaurant", back_populates="orders")
     table = relationship("Table", back_populates="orders")
@@ -1,14 +1,13 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.order_customization.model import OrderCustomization
-from typing import List
+from typing import AsyncIterator, List
 
 
-class OrderCustomizationMgmt:
+class OrderCustomizationMgmt(BaseMgmt[OrderCustomization]):
     """Database management operations for order customizations."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = OrderCustomization
     
     async def get_all_active(self) -> List[OrderCustomization]:
         """
@@ -17,9 +16,32 @@ class OrderCustomizationMgmt:
         Returns:
             List of OrderCustomization objects
         """
-        query = select(OrderCustomization)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[OrderCustomization]:
+        """
+        Retrieve one page of order customizations, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of OrderCustomization objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[OrderCustomization]:
+        """
+        Stream all order customizations through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of OrderCustomization objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, customization_id: int) -> OrderCustomization | None:
         """
@@ -31,44 +53,31 @@ class OrderCustomizationMgmt:
         Returns:
             OrderCustomization object or None if not found
         """
-        query = select(OrderCustomization).where(OrderCustomization.id == customization_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(customization_id)
     
-    async def create(self, customization_data: dict) -> OrderCustomization:
+    async def create(self, customization_data: dict, commit: bool = True) -> OrderCustomization:
         """
         Create a new order customization.
         
         Args:
             customization_data: Dictionary containing order customization data
+            commit: Whether to commit the transaction
             
         Returns:
             Created OrderCustomization object
         """
-        customization = OrderCustomization(**customization_data)
-        self.db.add(customization)
-        await self.db.commit()
-        await self.db.refresh(customization)
-        return customization
+        return await super().create(customization_data, commit)
     
-    async def update(self, customization_id: int, update_data: dict) -> OrderCustomization | None:
+    async def update(self, customization_id: int, update_data: dict, commit: bool = True) -> OrderCustomization | None:
         """
         Update an order customization.
         
         Args:
             customization_id: The order customization ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated OrderCustomization object or None if not found
         """
-        customization = await self.get_by_id(customization_id)
-        if not customization:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(customization, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(customization)
-        return customization
\ No newline at end of file
+        return await super().update(customization_id, update_data, commit)
@@ -1,14 +1,15 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.order_item.model import OrderItem
-from typing import List
+from typing import AsyncIterator, List
 
+ITEM_STATUSES = ("pending", "preparing", "ready", "served", "cancelled")
 
-class OrderItemMgmt:
+
+class OrderItemMgmt(BaseMgmt[OrderItem]):
     """Database management operations for order items."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = OrderItem
     
     async def get_all_active(self) -> List[OrderItem]:
         """
@@ -17,9 +18,32 @@ class OrderItemMgmt:
         Returns:
             List of OrderItem objects
         """
-        query = select(OrderItem)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[OrderItem]:
+        """
+        Retrieve one page of order items, ordered by order item ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of OrderItem objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[OrderItem]:
+        """
+        Stream all order items through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of OrderItem objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, order_item_id: int) -> OrderItem | None:
         """
@@ -31,44 +55,31 @@ class OrderItemMgmt:
         Returns:
             OrderItem object or None if not found
         """
-        query = select(OrderItem).where(OrderItem.order_item_id == order_item_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(order_item_id)
     
-    async def create(self, order_item_data: dict) -> OrderItem:
+    async def create(self, order_item_data: dict, commit: bool = True) -> OrderItem:
         """
         Create a new order item.
         
         Args:
             order_item_data: Dictionary containing order item data
+            commit: Whether to commit the transaction
             
         Returns:
             Created OrderItem object
         """
-        order_item = OrderItem(**order_item_data)
-        self.db.add(order_item)
-        await self.db.commit()
-        await self.db.refresh(order_item)
-        return order_item
+        return await super().create(order_item_data, commit)
     
-    async def update(self, order_item_id: int, update_data: dict) -> OrderItem | None:
+    async def update(self, order_item_id: int, update_data: dict, commit: bool = True) -> OrderItem | None:
         """
         Update an order item.
         
         Args:
             order_item_id: The order item ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated OrderItem object or None if not found
         """
-        order_item = await self.get_by_id(order_item_id)
-        if not order_item:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(order_item, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(order_item)
-        return order_item
\ No newline at end of file
+        return await super().update(order_item_id, update_data, commit)
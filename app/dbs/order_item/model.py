@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, DECIMAL
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, DECIMAL, Index, func
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.configs.database import Base
 
 
 class OrderItem(Base):
@@ -13,7 +13,11 @@ class OrderItem(Base):
     unit_price = Column(DECIMAL(10, 2), nullable=False)
     total_price = Column(DECIMAL(10, 2), nullable=False)
     status = Column(String(50), default="pending")
-    created_at = Column(DateTime(timezone=True), server_default="now()")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+    )
     
     # Relationships
     order = relationship("Order", back_populates="order_items")
@@ -0,0 +1,164 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, tuple_
+from typing import Any, AsyncIterator, Generic, List, Sequence, TypeVar
+import base64
+import json
+
+ModelT = TypeVar("ModelT")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class Page(Generic[ModelT]):
+    """One page of rows and the cursor of the next page."""
+
+    def __init__(self, items: List[ModelT], next_cursor: str | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def head(self, limit: int, key_columns: Sequence[Any]) -> "Page[ModelT]":
+        """
+        Cut the page down to its first rows.
+
+        Args:
+            limit: The maximum number of rows to keep
+            key_columns: The unique columns the page is ordered by
+
+        Returns:
+            Page with the first rows, continuing after the last one kept
+        """
+        if len(self.items) <= limit:
+            return self
+        items = self.items[:limit]
+        return Page(items, encode_cursor([getattr(items[-1], column.key) for column in key_columns]))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the key values of the last row of a page into an opaque cursor.
+
+    Args:
+        values: The key column values of the last row
+
+    Returns:
+        URL-safe cursor token
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns: Sequence[Any]) -> list:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor token
+        key_columns: The unique columns the pages are ordered by
+
+    Returns:
+        The key column values of the last row of the previous page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or its values do not
+            match the types of the key columns
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise InvalidCursorError("Invalid cursor")
+    for column, value in zip(key_columns, values):
+        if not _matches_type(column, value):
+            raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def _matches_type(column: Any, value: Any) -> bool:
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        return True
+    # JSON booleans are ints to Python
+    if isinstance(value, bool) and expected is not bool:
+        return False
+    return isinstance(value, expected)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    key_columns: Sequence[Any],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None
+) -> Page:
+    """
+    Fetch one page of a query with keyset (seek) pagination.
+
+    Rows are ordered by the key columns, which must be unique together, and
+    the next page starts strictly after the last key of the previous one, so
+    every page costs an index range scan no matter how deep it is.
+
+    Args:
+        db: The database session
+        query: A select of a single mapped entity
+        key_columns: The unique columns the pages are ordered by
+        limit: The maximum number of rows on the page
+        cursor: The cursor returned with the previous page
+
+    Returns:
+        Page with the rows and the cursor of the next page, if any
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        if len(key_columns) == 1:
+            query = query.where(key_columns[0] > values[0])
+        else:
+            query = query.where(tuple_(*key_columns) > tuple_(*values))
+
+    query = query.order_by(*key_columns).limit(limit + 1)
+    result = await db.execute(query)
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in key_columns])
+
+    return Page(items, next_cursor)
+
+
+async def stream(
+    db: AsyncSession,
+    query: Select,
+    batch_size: int = DEFAULT_STREAM_BATCH_SIZE
+) -> AsyncIterator:
+    """
+    Stream the rows of a query through a server-side cursor.
+
+    Only `batch_size` rows are buffered at a time, so memory stays flat
+    regardless of the size of the result.
+
+    Args:
+        db: The database session
+        query: A select of a single mapped entity
+        batch_size: The number of rows fetched per round trip
+
+    Yields:
+        The mapped objects one by one
+    """
+    result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        for item in partition:
+            yield item
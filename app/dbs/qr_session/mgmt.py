@@ -1,14 +1,24 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from functools import partial
 from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.qr_session.model import QRSession
-from typing import List
+from app.core.pubsub import broker
+from datetime import datetime
+from typing import AsyncIterator, List
 
+# Published to the channel of a QR session when it stops being active
+SESSION_CLOSED = "session.closed"
 
-class QRSessionMgmt:
+
+def session_channel(session_id: int) -> str:
+    return f"qr_session:{session_id}"
+
+
+class QRSessionMgmt(BaseMgmt[QRSession]):
     """Database management operations for QR sessions."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = QRSession
     
     async def get_all_active(self) -> List[QRSession]:
         """
@@ -17,9 +27,32 @@ class QRSessionMgmt:
         Returns:
             List of QRSession objects
         """
-        query = select(QRSession)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[QRSession]:
+        """
+        Retrieve one page of QR sessions, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of QRSession objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[QRSession]:
+        """
+        Stream all QR sessions through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of QRSession objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, session_id: int) -> QRSession | None:
         """
@@ -31,44 +64,59 @@ class QRSessionMgmt:
         Returns:
             QRSession object or None if not found
         """
-        query = select(QRSession).where(QRSession.id == session_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(session_id)
     
-    async def create(self, session_data: dict) -> QRSession:
+    async def create(self, session_data: dict, commit: bool = True) -> QRSession:
         """
         Create a new QR session.
         
         Args:
             session_data: Dictionary containing QR session data
+            commit: Whether to commit the transaction
             
         Returns:
             Created QRSession object
         """
-        session = QRSession(**session_data)
-        self.db.add(session)
-        await self.db.commit()
-        await self.db.refresh(session)
-        return session
+        return await super().create(session_data, commit)
     
-    async def update(self, session_id: int, update_data: dict) -> QRSession | None:
+    async def update(self, session_id: int, update_data: dict, commit: bool = True) -> QRSession | None:
         """
         Update a QR session.
         
         Args:
             session_id: The QR session ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated QRSession object or None if not found
         """
-        session = await self.get_by_id(session_id)
-        if not session:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(session, key, value)
+        return await super().update(session_id, update_data, commit)
+    
+    async def get_active(self, session_token: str, now: datetime) -> QRSession | None:
+        """
+        Get an active, unexpired QR session by its token.
         
-        await self.db.commit()
-        await self.db.refresh(session)
-        return session
\ No newline at end of file
+        Args:
+            session_token: The token handed to the guest's device
+            now: The current time
+            
+        Returns:
+            The QRSession object, or None if the token is unknown, closed or
+            expired
+        """
+        stmt = (
+            select(QRSession)
+            .where(QRSession.session_token == session_token)
+            .where(QRSession.status == "active")
+            .where(QRSession.expires_at > now)
+        )
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        # Guests following their table stop receiving its orders
+        for session in rows:
+            if session.status != "active":
+                on_commit(self.db, partial(
+                    broker.publish, session_channel(session.id), SESSION_CLOSED, {"session_id": session.id}
+                ))
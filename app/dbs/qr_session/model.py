@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -12,5 +12,9 @@ class QRSession(BaseModel):
     expires_at = Column(DateTime(timezone=True))
     last_activity = Column(DateTime(timezone=True))
     
+    __table_args__ = (
+        Index("ix_qr_sessions_table_status_expiry", "table_id", "status", "expires_at"),
+    )
+    
     # Relationships
     table = relationship("Table", back_populates="qr_sessions")
\ No newline at end of file
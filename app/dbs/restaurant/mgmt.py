@@ -1,14 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from functools import partial
+from app.dbs.base_mgmt import BaseMgmt, SoftDeleteMixin, on_commit
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.restaurant.model import Restaurant
-from typing import List
+from app.core.menu_cache import menu_cache
+from app.core.singleflight import restaurant_list_cache
+from typing import AsyncIterator, List
 
 
-class RestaurantMgmt:
+class RestaurantMgmt(SoftDeleteMixin, BaseMgmt[Restaurant]):
     """Database management operations for restaurants."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Restaurant
+    active_column = "is_active"
     
     async def get_all_active(self) -> List[Restaurant]:
         """
@@ -17,9 +20,32 @@ class RestaurantMgmt:
         Returns:
             List of Restaurant objects
         """
-        query = select(Restaurant).where(Restaurant.is_active == True)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Restaurant]:
+        """
+        Retrieve one page of active restaurants, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Restaurant objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Restaurant]:
+        """
+        Stream all active restaurants through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Restaurant objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, restaurant_id: int) -> Restaurant | None:
         """
@@ -31,65 +57,50 @@ class RestaurantMgmt:
         Returns:
             Restaurant object or None if not found
         """
-        query = select(Restaurant).where(
-            Restaurant.id == restaurant_id,
-            Restaurant.is_active == True
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(restaurant_id)
     
-    async def create(self, restaurant_data: dict) -> Restaurant:
+    async def create(self, restaurant_data: dict, commit: bool = True) -> Restaurant:
         """
         Create a new restaurant.
         
         Args:
             restaurant_data: Dictionary containing restaurant data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Restaurant object
         """
-        restaurant = Restaurant(**restaurant_data)
-        self.db.add(restaurant)
-        await self.db.commit()
-        await self.db.refresh(restaurant)
-        return restaurant
+        return await super().create(restaurant_data, commit)
     
-    async def update(self, restaurant_id: int, update_data: dict) -> Restaurant | None:
+    async def update(self, restaurant_id: int, update_data: dict, commit: bool = True) -> Restaurant | None:
         """
         Update a restaurant.
         
         Args:
             restaurant_id: The restaurant ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Restaurant object or None if not found
         """
-        restaurant = await self.get_by_id(restaurant_id)
-        if not restaurant:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(restaurant, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(restaurant)
-        return restaurant
+        return await super().update(restaurant_id, update_data, commit)
     
-    async def soft_delete(self, restaurant_id: int) -> bool:
+    async def soft_delete(self, restaurant_id: int, commit: bool = True) -> bool:
         """
         Soft delete a restaurant by setting is_active to False.
         
         Args:
             restaurant_id: The restaurant ID
+            commit: Whether to commit the transaction
             
         Returns:
             True if deleted, False if not found
         """
-        restaurant = await self.get_by_id(restaurant_id)
-        if not restaurant:
-            return False
-        
-        restaurant.is_active = False
-        await self.db.commit()
-        return True
\ No newline at end of file
+        return await super().soft_delete(restaurant_id, commit)
+    
+    async def _after_write(self, rows, previous=()) -> None:
+        on_commit(self.db, partial(restaurant_list_cache.invalidate, "active"))
+        # The menu shows the restaurant name and disappears with the restaurant
+        for restaurant in rows:
+            on_commit(self.db, partial(menu_cache.invalidate, restaurant.id))
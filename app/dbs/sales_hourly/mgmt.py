@@ -0,0 +1,164 @@
+from sqlalchemy import select, delete, func, type_coerce, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.order.model import Order
+from app.dbs.order_item.model import OrderItem
+from app.dbs.sales_hourly.model import SalesHourly
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+COMPLETED = "completed"
+
+# strftime arguments truncating an SQLite timestamp to the start of a bucket
+_SQLITE_BUCKETS = {
+    "hour": ("%Y-%m-%d %H:00:00.000000",),
+    "day": ("%Y-%m-%d 00:00:00.000000",),
+    # Back to the Monday on or before the day
+    "week": ("%Y-%m-%d 00:00:00.000000", "-6 days", "weekday 1"),
+    "month": ("%Y-%m-01 00:00:00.000000",),
+}
+
+
+def hour_of(column, dialect_name: str):
+    """
+    SQL expression truncating a timestamp column to its hour.
+    
+    On SQLite the result is formatted like the timestamps SQLAlchemy
+    writes, so that it matches hours inserted from Python.
+    
+    Args:
+        column: The timestamp column
+        dialect_name: The name of the database dialect
+        
+    Returns:
+        The SQL expression
+    """
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00.000000", column)
+
+
+def bucket_of(column, granularity: str, dialect_name: str):
+    """
+    SQL expression truncating a timestamp column to the start of its UTC
+    hour, day, week (from Monday) or month.
+    
+    Args:
+        column: The timestamp column
+        granularity: One of "hour", "day", "week" or "month"
+        dialect_name: The name of the database dialect
+        
+    Returns:
+        The SQL expression, typed as a timestamp
+    """
+    if dialect_name == "postgresql":
+        utc = func.timezone("UTC", column)
+        return func.timezone("UTC", func.date_trunc(granularity, utc))
+    fmt, *modifiers = _SQLITE_BUCKETS[granularity]
+    return type_coerce(func.strftime(fmt, column, *modifiers), DateTime(timezone=True))
+
+
+class SalesHourlyMgmt(BaseMgmt[SalesHourly]):
+    """Database management operations for hourly restaurant sales."""
+    
+    model = SalesHourly
+    
+    async def add(self, restaurant_id: int, hour: datetime, item_quantity: int, revenue: Decimal) -> None:
+        """
+        Add one completed order to the sales of its hour.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            hour: The start of the hour the order was completed in
+            item_quantity: The number of items in the order
+            revenue: The total amount of the order
+        """
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(SalesHourly).values(
+            restaurant_id=restaurant_id, hour=hour, order_count=1, item_quantity=item_quantity, revenue=revenue
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[SalesHourly.restaurant_id, SalesHourly.hour],
+            set_={
+                "order_count": SalesHourly.order_count + 1,
+                "item_quantity": SalesHourly.item_quantity + stmt.excluded.item_quantity,
+                "revenue": SalesHourly.revenue + stmt.excluded.revenue,
+            }
+        ))
+    
+    async def get_totals(self, restaurant_id: int, granularity: str, start: datetime, end: datetime) -> List[Row]:
+        """
+        Add up the hourly sales of a restaurant into buckets, in the database.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            granularity: The bucket size, one of "hour", "day", "week" or "month"
+            start: The first hour of the range
+            end: The end of the range, exclusive
+            
+        Returns:
+            Rows of bucket start, order_count, item_quantity and revenue in
+            chronological order; buckets without sales have none
+        """
+        bucket = bucket_of(SalesHourly.hour, granularity, self.db.get_bind().dialect.name).label("start")
+        result = await self.db.execute(
+            select(
+                bucket,
+                func.sum(SalesHourly.order_count).label("order_count"),
+                func.sum(SalesHourly.item_quantity).label("item_quantity"),
+                func.sum(SalesHourly.revenue).label("revenue"),
+            )
+            .where(SalesHourly.restaurant_id == restaurant_id)
+            .where(SalesHourly.hour >= start, SalesHourly.hour < end)
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        return list(result.all())
+    
+    async def rebuild(self, commit: bool = True) -> int:
+        """
+        Recompute every hour from the completed orders.
+        
+        A full aggregation, meant for backfills after bulk loads; completing
+        an order keeps the rollup up to date incrementally.
+        
+        Args:
+            commit: Whether to commit the transaction
+            
+        Returns:
+            Number of hours written
+        """
+        hour = hour_of(Order.completed_time, self.db.get_bind().dialect.name)
+        orders = (
+            select(
+                Order.restaurant_id,
+                hour.label("hour"),
+                Order.total_amount,
+                func.coalesce(func.sum(OrderItem.quantity), 0).label("item_quantity"),
+            )
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.status == COMPLETED, Order.completed_time.isnot(None), Order.deleted_at.is_(None))
+            .group_by(Order.id, Order.restaurant_id, hour, Order.total_amount)
+            .subquery()
+        )
+        rows = (
+            select(
+                orders.c.restaurant_id,
+                orders.c.hour,
+                func.count(),
+                func.sum(orders.c.item_quantity),
+                func.sum(orders.c.total_amount),
+            )
+            .group_by(orders.c.restaurant_id, orders.c.hour)
+        )
+        await self.db.execute(delete(SalesHourly))
+        result = await self.db.execute(
+            SalesHourly.__table__.insert().from_select(
+                ["restaurant_id", "hour", "order_count", "item_quantity", "revenue"], rows
+            )
+        )
+        if commit:
+            await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL
+from app.configs.database import Base
+
+
+class SalesHourly(Base):
+    """Sales of a restaurant's orders completed within one UTC hour."""
+    __tablename__ = "sales_hourly"
+    
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    item_quantity = Column(Integer, nullable=False, default=0)
+    # Sum of the orders' total_amount
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
@@ -0,0 +1,128 @@
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.order.model import Order
+from app.dbs.order_item.model import OrderItem
+from app.dbs.sales_hourly.mgmt import COMPLETED, bucket_of, hour_of
+from app.dbs.sales_hourly_item.model import SalesHourlyItem
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+
+
+class SalesHourlyItemMgmt(BaseMgmt[SalesHourlyItem]):
+    """Database management operations for hourly menu item sales."""
+    
+    model = SalesHourlyItem
+    
+    async def add(self, restaurant_id: int, hour: datetime, items: Dict[int, Tuple[int, Decimal]]) -> None:
+        """
+        Add the items of one completed order to the sales of its hour.
+        
+        All items are upserted with one statement, in menu item order so
+        that concurrent completions lock shared rows in the same order.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            hour: The start of the hour the order was completed in
+            items: Dictionary mapping menu item ID to the quantity and revenue
+                of that item in the order
+        """
+        if not items:
+            return
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(SalesHourlyItem).values([
+            {
+                "restaurant_id": restaurant_id,
+                "hour": hour,
+                "menu_item_id": menu_item_id,
+                "order_count": 1,
+                "quantity": quantity,
+                "revenue": revenue,
+            }
+            for menu_item_id, (quantity, revenue) in sorted(items.items())
+        ])
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[SalesHourlyItem.restaurant_id, SalesHourlyItem.hour, SalesHourlyItem.menu_item_id],
+            set_={
+                "order_count": SalesHourlyItem.order_count + 1,
+                "quantity": SalesHourlyItem.quantity + stmt.excluded.quantity,
+                "revenue": SalesHourlyItem.revenue + stmt.excluded.revenue,
+            }
+        ))
+    
+    async def get_totals(
+        self,
+        restaurant_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        menu_item_ids: Sequence[int] | None = None
+    ) -> List[Row]:
+        """
+        Add up the hourly menu item sales of a restaurant into buckets, in the database.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            granularity: The bucket size, one of "hour", "day", "week" or "month"
+            start: The first hour of the range
+            end: The end of the range, exclusive
+            menu_item_ids: Only these menu items, when given
+            
+        Returns:
+            Rows of bucket start, menu_item_id, order_count, quantity and
+            revenue, ordered by bucket and menu item
+        """
+        bucket = bucket_of(SalesHourlyItem.hour, granularity, self.db.get_bind().dialect.name).label("start")
+        query = (
+            select(
+                bucket,
+                SalesHourlyItem.menu_item_id,
+                func.sum(SalesHourlyItem.order_count).label("order_count"),
+                func.sum(SalesHourlyItem.quantity).label("quantity"),
+                func.sum(SalesHourlyItem.revenue).label("revenue"),
+            )
+            .where(SalesHourlyItem.restaurant_id == restaurant_id)
+            .where(SalesHourlyItem.hour >= start, SalesHourlyItem.hour < end)
+            .group_by(bucket, SalesHourlyItem.menu_item_id)
+            .order_by(bucket, SalesHourlyItem.menu_item_id)
+        )
+        if menu_item_ids:
+            query = query.where(SalesHourlyItem.menu_item_id.in_(menu_item_ids))
+        result = await self.db.execute(query)
+        return list(result.all())
+    
+    async def rebuild(self, commit: bool = True) -> int:
+        """
+        Recompute every hour from the items of completed orders.
+        
+        Args:
+            commit: Whether to commit the transaction
+            
+        Returns:
+            Number of rows written
+        """
+        hour = hour_of(Order.completed_time, self.db.get_bind().dialect.name)
+        rows = (
+            select(
+                Order.restaurant_id,
+                hour,
+                OrderItem.item_id,
+                func.count(func.distinct(Order.id)),
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.total_price),
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.status == COMPLETED, Order.completed_time.isnot(None), Order.deleted_at.is_(None))
+            .group_by(Order.restaurant_id, hour, OrderItem.item_id)
+        )
+        await self.db.execute(delete(SalesHourlyItem))
+        result = await self.db.execute(
+            SalesHourlyItem.__table__.insert().from_select(
+                ["restaurant_id", "hour", "menu_item_id", "order_count", "quantity", "revenue"], rows
+            )
+        )
+        if commit:
+            await self.db.commit()
+        return result.rowcount
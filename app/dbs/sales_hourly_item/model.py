@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, DECIMAL
+from app.configs.database import Base
+
+
+class SalesHourlyItem(Base):
+    """Sales of one menu item in orders completed within one UTC hour."""
+    __tablename__ = "sales_hourly_items"
+    
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    menu_item_id = Column(Integer, ForeignKey("menu_items.id"), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    # Sum of the order items' total_price
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
@@ -1,14 +1,13 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.dbs.base_mgmt import BaseMgmt
+from app.dbs.pagination import Page, DEFAULT_PAGE_SIZE, DEFAULT_STREAM_BATCH_SIZE
 from app.dbs.table.model import Table
-from typing import List
+from typing import AsyncIterator, List
 
 
-class TableMgmt:
+class TableMgmt(BaseMgmt[Table]):
     """Database management operations for tables."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    model = Table
     
     async def get_all_active(self) -> List[Table]:
         """
@@ -17,9 +16,32 @@ class TableMgmt:
         Returns:
             List of Table objects
         """
-        query = select(Table)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await super().get_all_active()
+    
+    async def get_page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> Page[Table]:
+        """
+        Retrieve one page of tables, ordered by ID.
+        
+        Args:
+            limit: The maximum number of rows on the page
+            cursor: The cursor returned with the previous page
+            
+        Returns:
+            Page of Table objects and the cursor of the next page
+        """
+        return await super().get_page(limit, cursor)
+    
+    def stream_all_active(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE) -> AsyncIterator[Table]:
+        """
+        Stream all tables through a server-side cursor.
+        
+        Args:
+            batch_size: The number of rows fetched per round trip
+            
+        Returns:
+            Async iterator of Table objects
+        """
+        return super().stream_all_active(batch_size)
     
     async def get_by_id(self, table_id: int) -> Table | None:
         """
@@ -31,44 +53,31 @@ class TableMgmt:
         Returns:
             Table object or None if not found
         """
-        query = select(Table).where(Table.id == table_id)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return await super().get_by_id(table_id)
     
-    async def create(self, table_data: dict) -> Table:
+    async def create(self, table_data: dict, commit: bool = True) -> Table:
         """
         Create a new table.
         
         Args:
             table_data: Dictionary containing table data
+            commit: Whether to commit the transaction
             
         Returns:
             Created Table object
         """
-        table = Table(**table_data)
-        self.db.add(table)
-        await self.db.commit()
-        await self.db.refresh(table)
-        return table
+        return await super().create(table_data, commit)
     
-    async def update(self, table_id: int, update_data: dict) -> Table | None:
+    async def update(self, table_id: int, update_data: dict, commit: bool = True) -> Table | None:
         """
         Update a table.
         
         Args:
             table_id: The table ID
             update_data: Dictionary containing update data
+            commit: Whether to commit the transaction
             
         Returns:
             Updated Table object or None if not found
         """
-        table = await self.get_by_id(table_id)
-        if not table:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(table, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(table)
-        return table
\ No newline at end of file
+        return await super().update(table_id, update_data, commit)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime, func
+from app.configs.database import Base
+
+
+class BaseModel(Base):
+    """Abstract base model with the columns shared by all tables."""
+    __abstract__ = True
+    
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,3 +1,4 @@
 from .restaurant.endpoints import router as restaurant_router
+from .order.endpoints import router as order_router
 
-__all__ = ["restaurant_router"]
\ No newline at end of file
+__all__ = ["restaurant_router", "order_router"]
\ No newline at end of file
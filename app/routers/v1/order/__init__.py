@@ -0,0 +1,4 @@
+from .endpoints import router
+from . import schemas
+
+__all__ = ["router", "schemas"]
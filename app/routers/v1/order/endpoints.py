@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.database import get_db, get_read_db
+from app.services.order_service import OrderService, InvalidOrderError
+from app.services.order_feed import OrderFeedService
+from app.core.event_stream import sse_response, serve_websocket
+from .schemas import OrderCreate, OrderResponse, OrderItemStatusUpdate
+
+router = APIRouter()
+
+
+@router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+async def place_order(order_data: OrderCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Place an order with its items and customizations.
+    
+    Prices are computed from the current menu; the order is written in a
+    single transaction.
+    """
+    service = OrderService(db)
+    
+    try:
+        order = await service.place_order(
+            order_data.restaurant_id,
+            order_data.table_id,
+            [item.model_dump() for item in order_data.items],
+            order_data.special_requests
+        )
+    except InvalidOrderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if order is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    return order
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_table_orders(
+    session_token: str = Query(..., description="The guest's QR session token"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Follow the orders of the guest's table as server-sent events."""
+    subscription = await OrderFeedService(db).subscribe_table(session_token)
+    # Release the connection; the feed itself never reads the database
+    await db.close()
+    
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found or expired"
+        )
+    
+    return sse_response(subscription)
+
+
+@router.websocket("/ws")
+async def table_orders_websocket(
+    websocket: WebSocket,
+    session_token: str = Query(...),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Follow the orders of the guest's table over a WebSocket."""
+    subscription = await OrderFeedService(db).subscribe_table(session_token)
+    # Release the connection; the feed itself never reads the database
+    await db.close()
+    
+    if subscription is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Session not found or expired")
+        return
+    
+    await websocket.accept()
+    await serve_websocket(websocket, subscription)
+
+
+@router.get("/{order_id}", response_model=OrderResponse)
+async def get_order(order_id: int, db: AsyncSession = Depends(get_db)):
+    """Get an order with its items and customizations."""
+    service = OrderService(db)
+    order = await service.get_order(order_id)
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    return order
+
+
+@router.post("/{order_id}/complete", response_model=OrderResponse)
+async def complete_order(order_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Complete an order and count it in the restaurant's sales.
+    
+    Completing an order again returns it unchanged.
+    """
+    service = OrderService(db)
+    
+    try:
+        order = await service.complete_order(order_id)
+    except InvalidOrderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    return order
+
+
+@router.patch("/{order_id}/items/{order_item_id}", response_model=OrderResponse)
+async def update_order_item_status(
+    order_id: int,
+    order_item_id: int,
+    update: OrderItemStatusUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Change the kitchen status of an order item.
+    
+    The change is pushed to the restaurant's kitchen screens and to the table.
+    """
+    service = OrderService(db)
+    
+    try:
+        order = await service.update_item_status(order_id, order_item_id, update.status)
+    except InvalidOrderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order item not found"
+        )
+    
+    return order
@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from datetime import datetime
+from decimal import Decimal
+
+MAX_ITEMS_PER_ORDER = 100
+
+
+class OrderItemCreate(BaseModel):
+    """Schema for one item of a new order; prices are computed by the server."""
+    menu_item_id: int
+    quantity: int = Field(1, ge=1, le=99, description="Number of portions")
+    choice_ids: List[int] = Field(default_factory=list, description="Selected customization choice IDs")
+
+
+class OrderCreate(BaseModel):
+    """Schema for placing an order."""
+    restaurant_id: int
+    table_id: int
+    items: List[OrderItemCreate] = Field(..., min_length=1, max_length=MAX_ITEMS_PER_ORDER)
+    special_requests: Optional[str] = Field(None, max_length=500, description="Notes for the kitchen")
+
+
+class OrderItemStatusUpdate(BaseModel):
+    """Schema for changing the kitchen status of an order item."""
+    status: Literal["pending", "preparing", "ready", "served", "cancelled"]
+
+
+class OrderCustomizationResponse(BaseModel):
+    """Schema for a customization of an order item."""
+    option_id: int
+    choice_id: int
+    price_modifier: Decimal
+
+
+class OrderItemResponse(BaseModel):
+    """Schema for order item response."""
+    order_item_id: int
+    item_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal
+    status: str
+    customizations: List[OrderCustomizationResponse] = []
+
+
+class OrderResponse(BaseModel):
+    """Schema for order response."""
+    id: int
+    restaurant_id: int
+    table_id: int
+    status: str
+    payment_status: str
+    subtotal: Decimal
+    service_charge: Decimal
+    total_amount: Decimal
+    special_requests: Optional[str]
+    order_time: datetime
+    completed_time: Optional[datetime] = None
+    items: List[OrderItemResponse] = []
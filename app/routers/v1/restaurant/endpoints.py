@@ -1,24 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Literal
 
-from app.configs.database import get_db
+from app.configs.database import get_db, get_read_db, sibling_session
 from app.services.restaurant_service import RestaurantService
-from .schemas import RestaurantCreate, RestaurantUpdate, RestaurantResponse, AllergenResponse, RestaurantMenuResponse
+from app.services.sales_service import SalesService, InvalidSalesRangeError
+from app.services.export_service import ExportService, InvalidExportError, MEDIA_TYPES
+from app.services.order_feed import OrderFeedService
+from app.dbs.pagination import InvalidCursorError, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.menu_loader import menu_weight
+from app.core.menu_cache import menu_cache
+from app.core.snapshot import EncodedSnapshot
+from app.core.singleflight import menu_flights
+from app.core.event_stream import sse_response, serve_websocket
+from .schemas import (
+    RestaurantCreate,
+    RestaurantUpdate,
+    RestaurantResponse,
+    AllergenResponse,
+    RestaurantMenuResponse,
+    MenuChangesResponse,
+    SalesBucketResponse,
+    ItemSalesBucketResponse
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[RestaurantResponse])
-async def get_restaurants(db: AsyncSession = Depends(get_db)):
-    """Get all active restaurants."""
+async def get_restaurants(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of restaurants to return"),
+    cursor: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get active restaurants, one page at a time.
+    
+    The cursor of the next page is returned in the X-Next-Cursor header,
+    which is absent on the last page.
+    """
     service = RestaurantService(db)
-    restaurants = await service.get_all_restaurants()
-    return restaurants
+    
+    try:
+        page = await service.get_restaurants_page(limit, cursor)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    
+    return page.items
 
 
 @router.get("/{restaurant_id}", response_model=RestaurantResponse)
-async def get_restaurant(restaurant_id: int, db: AsyncSession = Depends(get_db)):
+async def get_restaurant(restaurant_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a restaurant by ID."""
     service = RestaurantService(db)
     restaurant = await service.get_restaurant_by_id(restaurant_id)
@@ -78,34 +119,267 @@ async def delete_restaurant(restaurant_id: int, db: AsyncSession = Depends(get_d
 
 
 @router.get("/{restaurant_id}/allergens", response_model=List[AllergenResponse])
-async def get_restaurant_allergens(restaurant_id: int, db: AsyncSession = Depends(get_db)):
+async def get_restaurant_allergens(restaurant_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get all allergens associated with a restaurant's menu items."""
     service = RestaurantService(db)
+    allergens = await service.get_restaurant_allergens(restaurant_id)
     
-    # Check if restaurant exists
-    restaurant = await service.get_restaurant_by_id(restaurant_id)
-    if not restaurant:
+    if allergens is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Restaurant not found"
         )
     
-    allergens = await service.get_restaurant_allergens(restaurant_id)
     return allergens
 
 
 @router.get("/{restaurant_id}/menu", response_model=RestaurantMenuResponse)
-async def get_restaurant_menu(restaurant_id: int, db: AsyncSession = Depends(get_db)):
-    """Get restaurant menu organized by categories."""
+async def get_restaurant_menu(
+    restaurant_id: int,
+    request: Request,
+    exclude_allergens: str | None = Query(
+        None,
+        description="Comma-separated allergen IDs or i18n keys whose menu items should be hidden"
+    ),
+    strict: bool = Query(
+        False,
+        description="Also hide items that only may contain a non-severe excluded allergen"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get restaurant menu organized by categories.
+    
+    The encoded response is kept per menu version, so cache hits and
+    If-None-Match revalidations skip the database and the serializer.
+    """
+    if exclude_allergens:
+        allergens = [
+            int(value) if value.isdigit() else value
+            for value in (value.strip() for value in exclude_allergens.split(","))
+            if value
+        ]
+        service = RestaurantService(db)
+        menu = await service.get_restaurant_menu_excluding_allergens(restaurant_id, allergens, strict)
+        
+        if menu is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Restaurant not found"
+            )
+        
+        return menu
+    
+    snapshot = menu_cache.get(restaurant_id, "menu_snapshot")
+    if snapshot is None:
+        version = menu_cache.version(restaurant_id)
+        snapshot = await menu_flights.do(
+            ("menu_snapshot", restaurant_id, version),
+            lambda: build_menu_snapshot(db, restaurant_id, version)
+        )
+        
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Restaurant not found"
+            )
+    
+    return snapshot.to_response(request)
+
+
+async def build_menu_snapshot(db: AsyncSession, restaurant_id: int, version: int) -> EncodedSnapshot | None:
+    """
+    Encode a restaurant menu and cache it under the menu version it was loaded at.
+    
+    Runs as a single-flight task shared by concurrent requests, so it reads
+    with its own session rather than the session of the request that
+    started it, which is closed when that request ends.
+    """
+    async with sibling_session(db) as session:
+        menu = await RestaurantService(session).get_restaurant_menu(restaurant_id)
+    if menu is None:
+        return None
+    
+    body = RestaurantMenuResponse.model_validate(menu).model_dump_json().encode()
+    snapshot = EncodedSnapshot(body)
+    menu_cache.put(restaurant_id, "menu_snapshot", snapshot, version, weight=menu_weight(menu))
+    return snapshot
+
+
+@router.get("/{restaurant_id}/menu/changes", response_model=MenuChangesResponse)
+async def get_restaurant_menu_changes(
+    restaurant_id: int,
+    since: int = Query(0, ge=0, description="Menu version returned by the previous poll"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the categories, items, options and choices changed since a menu version."""
     service = RestaurantService(db)
+    changes = await service.get_restaurant_menu_changes(restaurant_id, since)
     
-    # Check if restaurant exists
-    restaurant = await service.get_restaurant_by_id(restaurant_id)
-    if not restaurant:
+    if changes is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Restaurant not found"
         )
     
-    menu = await service.get_restaurant_menu(restaurant_id)
-    return menu
\ No newline at end of file
+    return changes
+
+
+Granularity = Literal["hour", "day", "week", "month"]
+
+
+@router.get("/{restaurant_id}/sales", response_model=List[SalesBucketResponse])
+async def get_restaurant_sales(
+    restaurant_id: int,
+    start: datetime = Query(..., description="Start of the report, rounded down to its bucket"),
+    end: datetime | None = Query(None, description="End of the report, exclusive; defaults to now"),
+    granularity: Granularity = Query("day", description="Size of the buckets, in UTC"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the sales of a restaurant per hour, day, week or month.
+    
+    Read from hourly rollups of completed orders; buckets without sales are
+    left out.
+    """
+    service = SalesService(db)
+    
+    try:
+        sales = await service.get_sales(restaurant_id, granularity, start, end or datetime.now(timezone.utc))
+    except InvalidSalesRangeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if sales is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    return sales
+
+
+@router.get("/{restaurant_id}/sales/items", response_model=List[ItemSalesBucketResponse])
+async def get_restaurant_item_sales(
+    restaurant_id: int,
+    start: datetime = Query(..., description="Start of the report, rounded down to its bucket"),
+    end: datetime | None = Query(None, description="End of the report, exclusive; defaults to now"),
+    granularity: Granularity = Query("day", description="Size of the buckets, in UTC"),
+    menu_item_id: List[int] | None = Query(None, description="Only these menu items"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the sales of a restaurant's menu items per hour, day, week or month."""
+    service = SalesService(db)
+    
+    try:
+        sales = await service.get_item_sales(
+            restaurant_id, granularity, start, end or datetime.now(timezone.utc), menu_item_id
+        )
+    except InvalidSalesRangeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if sales is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    return sales
+
+
+ExportDataset = Literal["orders", "order_items", "order_customizations", "inventory_transactions"]
+ExportFormat = Literal["csv", "arrow", "parquet"]
+
+
+@router.get("/{restaurant_id}/exports/{dataset}", response_class=StreamingResponse)
+async def export_restaurant_data(
+    restaurant_id: int,
+    dataset: ExportDataset,
+    start: datetime = Query(..., description="Start of the export"),
+    end: datetime | None = Query(None, description="End of the export, exclusive; defaults to now"),
+    format: ExportFormat = Query("csv", description="csv, an Arrow IPC stream or Parquet"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export the orders, order items, customizations or ledger rows of a restaurant.
+    
+    The file is streamed while the rows are read, one batch at a time, so
+    neither the worker nor the response buffers the whole export.
+    """
+    service = ExportService(db)
+    
+    try:
+        chunks = await service.export(
+            dataset, restaurant_id, start, end or datetime.now(timezone.utc), format
+        )
+    except InvalidExportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if chunks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    filename = f"{dataset}-{restaurant_id}-{start:%Y%m%d}.{format}"
+    return StreamingResponse(
+        close_after(chunks, db),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+async def close_after(chunks: AsyncIterator[bytes], db: AsyncSession) -> AsyncIterator[bytes]:
+    """Stream the chunks, then release the session, which outlives the request dependencies."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await db.close()
+
+
+@router.get("/{restaurant_id}/orders/events", response_class=StreamingResponse)
+async def stream_kitchen_orders(restaurant_id: int, db: AsyncSession = Depends(get_read_db)):
+    """
+    Follow the new orders and order status changes of a restaurant as server-sent events.
+    
+    Fallback for kitchen screens that cannot keep a WebSocket open.
+    """
+    subscription = await OrderFeedService(db).subscribe_kitchen(restaurant_id)
+    # Release the connection; the feed itself never reads the database
+    await db.close()
+    
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    return sse_response(subscription)
+
+
+@router.websocket("/{restaurant_id}/orders/ws")
+async def kitchen_orders_websocket(
+    websocket: WebSocket,
+    restaurant_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Follow the new orders and order status changes of a restaurant over a WebSocket."""
+    subscription = await OrderFeedService(db).subscribe_kitchen(restaurant_id)
+    # Release the connection; the feed itself never reads the database
+    await db.close()
+    
+    if subscription is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Restaurant not found")
+        return
+    
+    await websocket.accept()
+    await serve_websocket(websocket, subscription)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from datetime import datetime
 from decimal import Decimal
 
@@ -80,4 +80,78 @@ class RestaurantMenuResponse(BaseModel):
     """Schema for restaurant menu response organized by categories."""
     restaurant_id: int
     restaurant_name: str
-    categories: List[CategoryWithMenuItemsResponse] = []
\ No newline at end of file
+    categories: List[CategoryWithMenuItemsResponse] = []
+
+
+class CategoryChangeResponse(BaseModel):
+    """Schema for a changed category."""
+    id: int
+    name: str
+    sort_order: int
+    is_active: bool
+
+
+class MenuItemChangeResponse(MenuItemResponse):
+    """Schema for a changed menu item."""
+    category_id: int
+
+
+class CustomizationOptionResponse(BaseModel):
+    """Schema for customization option response."""
+    id: int
+    item_id: int
+    name: str
+    type: str
+    is_required: bool
+    max_selections: int
+    sort_order: int
+    is_active: bool
+
+
+class CustomizationChoiceResponse(BaseModel):
+    """Schema for customization choice response."""
+    id: int
+    option_id: int
+    name: str
+    price_modifier: Decimal
+    is_available: bool
+    sort_order: int
+
+
+ChangeT = TypeVar("ChangeT")
+
+
+class EntityChanges(BaseModel, Generic[ChangeT]):
+    """Schema for the added, changed and removed rows of one entity."""
+    added: List[ChangeT] = []
+    changed: List[ChangeT] = []
+    removed: List[int] = []
+
+
+class MenuChangesResponse(BaseModel):
+    """Schema for the menu changes since a menu version."""
+    restaurant_id: int
+    version: int = Field(..., description="Menu version to pass as `since` on the next poll")
+    full_resync: bool = Field(..., description="True if the client must reload the full menu")
+    categories: EntityChanges[CategoryChangeResponse] = EntityChanges[CategoryChangeResponse]()
+    menu_items: EntityChanges[MenuItemChangeResponse] = EntityChanges[MenuItemChangeResponse]()
+    customization_options: EntityChanges[CustomizationOptionResponse] = EntityChanges[CustomizationOptionResponse]()
+    customization_choices: EntityChanges[CustomizationChoiceResponse] = EntityChanges[CustomizationChoiceResponse]()
+
+
+class SalesBucketResponse(BaseModel):
+    """Schema for the sales of a restaurant in one time bucket."""
+    start: datetime
+    order_count: int
+    item_quantity: int
+    revenue: Decimal
+    average_basket: Decimal
+
+
+class ItemSalesBucketResponse(BaseModel):
+    """Schema for the sales of one menu item in one time bucket."""
+    start: datetime
+    menu_item_id: int
+    order_count: int
+    quantity: int
+    revenue: Decimal
@@ -0,0 +1,299 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, Select, select
+from app.dbs.ingredient.model import Ingredient
+from app.dbs.inventory_transaction.model import InventoryTransaction
+from app.dbs.order.model import Order
+from app.dbs.order_customization.model import OrderCustomization
+from app.dbs.order_item.model import OrderItem
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, List, Sequence
+import csv
+import enum
+import io
+import os
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional, CSV is always available
+    pyarrow = None
+
+EXPORT_TABLES = {
+    "orders": Order.__table__,
+    "order_items": OrderItem.__table__,
+    "order_customizations": OrderCustomization.__table__,
+    "inventory_transactions": InventoryTransaction.__table__,
+}
+DATASETS = tuple(EXPORT_TABLES)
+EXPORT_FORMATS = ("csv", "arrow", "parquet")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows fetched per round trip and encoded per chunk; the only rows held in memory
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+
+class InvalidExportError(ValueError):
+    """Raised when an export asks for an unknown dataset or format, or an invalid range."""
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands out what was written since the last drain.
+    
+    Lets the pyarrow writers, which expect a file, feed a generator instead.
+    The position keeps counting across drains, because Parquet records the
+    offsets of its row groups.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.chunks: List[bytes] = []
+        self.position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def to_utc(value: datetime) -> datetime:
+    """Convert a time to UTC, treating naive times as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def csv_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def arrow_type(column):
+    """Map a column to the Arrow type its values are exported as."""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, Numeric):
+        return pyarrow.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        # Times are stored in UTC; SQLite hands them back naive
+        return pyarrow.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+async def encode_csv(columns: Sequence, batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """
+    Encode batches of rows as CSV with a header line, one chunk per batch.
+
+    Args:
+        columns: The exported columns
+        batches: Async iterator of row batches
+
+    Yields:
+        The encoded chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    async for rows in batches:
+        writer.writerows([csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty export
+        yield buffer.getvalue().encode()
+
+
+async def encode_arrow(
+    columns: Sequence,
+    batches: AsyncIterator[Sequence],
+    export_format: str = "arrow"
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of rows as an Arrow IPC stream or a Parquet file.
+
+    Each batch becomes one record batch, or one row group for Parquet, and
+    is handed out as soon as it is written.
+
+    Args:
+        columns: The exported columns
+        batches: Async iterator of row batches
+        export_format: "arrow" or "parquet"
+
+    Yields:
+        The encoded chunks
+    """
+    schema = pyarrow.schema([(column.name, arrow_type(column)) for column in columns])
+    sink = ChunkSink()
+    if export_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+
+    async for rows in batches:
+        arrays = [
+            pyarrow.array(
+                [value.value if isinstance(value, enum.Enum) else value for value in values],
+                type=field.type
+            )
+            for values, field in zip(zip(*rows), schema)
+        ]
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+class ExportService:
+    """
+    Service for bulk exports of orders and the inventory ledger.
+    
+    Rows are read as plain tuples through a server-side cursor and encoded
+    batch by batch, so an export holds one batch in memory whatever the
+    range it covers.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.restaurants = RestaurantMgmt(db)
+    
+    @staticmethod
+    def columns(dataset: str) -> List:
+        """
+        Get the columns exported for a dataset.
+        
+        Args:
+            dataset: One of DATASETS
+        
+        Returns:
+            The table columns, in export order
+        """
+        return list(EXPORT_TABLES[dataset].columns)
+    
+    def query(self, dataset: str, restaurant_id: int | None, start: datetime, end: datetime) -> Select:
+        """
+        Build the query of an export.
+        
+        Orders, their items and customizations are selected by the time the
+        order was placed, ledger rows by the time they were written, which
+        lets PostgreSQL read only the ledger partitions of the range.
+        
+        Args:
+            dataset: One of DATASETS
+            restaurant_id: Only rows of this restaurant, when given
+            start: The start of the range
+            end: The end of the range, exclusive
+        
+        Returns:
+            Select of the dataset's columns, in a stable order
+        """
+        stmt = select(*self.columns(dataset))
+        if dataset == "inventory_transactions":
+            stmt = stmt.where(InventoryTransaction.created_at >= start, InventoryTransaction.created_at < end)
+            if restaurant_id is not None:
+                stmt = stmt.join(Ingredient, Ingredient.id == InventoryTransaction.ingredient_id).where(
+                    Ingredient.restaurant_id == restaurant_id
+                )
+            return stmt.order_by(InventoryTransaction.created_at, InventoryTransaction.id)
+        
+        if dataset == "order_customizations":
+            stmt = stmt.join(OrderItem, OrderItem.order_item_id == OrderCustomization.order_item_id)
+        if dataset != "orders":
+            stmt = stmt.join(Order, Order.id == OrderItem.order_id)
+        stmt = stmt.where(
+            Order.order_time >= start,
+            Order.order_time < end,
+            Order.deleted_at.is_(None)
+        )
+        if restaurant_id is not None:
+            stmt = stmt.where(Order.restaurant_id == restaurant_id)
+        return stmt.order_by(*EXPORT_TABLES[dataset].primary_key.columns)
+    
+    async def batches(self, stmt: Select, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[Sequence]:
+        """
+        Fetch the rows of a query in batches through a server-side cursor.
+        
+        Args:
+            stmt: The query
+            batch_size: The number of rows per batch
+        
+        Yields:
+            Lists of row tuples
+        """
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+    
+    async def export(
+        self,
+        dataset: str,
+        restaurant_id: int | None,
+        start: datetime,
+        end: datetime,
+        export_format: str = "csv",
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[bytes] | None:
+        """
+        Export a dataset of a restaurant, or of every restaurant.
+        
+        Checks the request up front and returns the encoder, which runs the
+        query once it is iterated.
+        
+        Args:
+            dataset: One of DATASETS
+            restaurant_id: The restaurant ID, or None for every restaurant
+            start: The start of the range
+            end: The end of the range, exclusive
+            export_format: One of EXPORT_FORMATS
+            batch_size: The number of rows fetched and encoded at a time
+        
+        Returns:
+            Async iterator of encoded chunks, or None if the restaurant is
+            not found
+        
+        Raises:
+            InvalidExportError: If the dataset, format or range is invalid,
+                or the format needs pyarrow and it is not installed
+        """
+        if dataset not in DATASETS:
+            raise InvalidExportError(f"Dataset must be one of {', '.join(DATASETS)}")
+        if export_format not in EXPORT_FORMATS:
+            raise InvalidExportError(f"Format must be one of {', '.join(EXPORT_FORMATS)}")
+        if export_format != "csv" and pyarrow is None:
+            raise InvalidExportError(f"The {export_format} format needs pyarrow, which is not installed")
+        start, end = to_utc(start), to_utc(end)
+        if end <= start:
+            raise InvalidExportError("The end of the range must be after its start")
+        if restaurant_id is not None and await self.restaurants.get_by_id(restaurant_id) is None:
+            return None
+        
+        columns = self.columns(dataset)
+        batches = self.batches(self.query(dataset, restaurant_id, start, end), batch_size)
+        if export_format == "csv":
+            return encode_csv(columns, batches)
+        return encode_arrow(columns, batches, export_format)
@@ -0,0 +1,263 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.dbs.ingredient.model import Ingredient
+from app.dbs.ingredient_stock.model import IngredientStock
+from app.dbs.ingredient_stock.mgmt import IngredientStockMgmt
+from app.dbs.inventory_transaction.model import InventoryTransaction, TransactionType
+from app.dbs.inventory_transaction.mgmt import InventoryTransactionMgmt, month_start
+from app.dbs.inventory_daily_summary.model import InventoryDailySummary
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.menu_item_recipe.model import MenuItemRecipe
+from app.dbs.order.model import Order
+from app.dbs.order_item.model import OrderItem
+from decimal import Decimal
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+QUANTITY = Decimal("0.001")
+
+
+def expand_recipes(
+    lines: Iterable[Tuple[int, int]],
+    recipes: Dict[int, Sequence[Tuple[int, Decimal]]]
+) -> Dict[int, Decimal]:
+    """
+    Turn ordered menu items into the quantity of every ingredient they use.
+
+    Args:
+        lines: Pairs of menu item ID and quantity; an item may appear many times
+        recipes: Dictionary mapping menu item ID to its (ingredient ID, quantity needed) pairs
+
+    Returns:
+        Dictionary mapping ingredient ID to the total quantity used
+    """
+    portions: Dict[int, int] = {}
+    for menu_item_id, quantity in lines:
+        portions[menu_item_id] = portions.get(menu_item_id, 0) + quantity
+
+    usage: Dict[int, Decimal] = {}
+    for menu_item_id, count in portions.items():
+        for ingredient_id, quantity_needed in recipes.get(menu_item_id, ()):
+            usage[ingredient_id] = usage.get(ingredient_id, Decimal(0)) + quantity_needed * count
+    return usage
+
+
+class InventoryService:
+    """
+    Service for stock movements.
+
+    Every movement locks the stock rows it touches in ascending ingredient ID
+    order, so concurrent orders sharing ingredients queue behind each other
+    instead of deadlocking. It writes all its ledger rows with one INSERT and
+    updates the current-stock projection in the same transaction, along
+    with the availability of the menu items depending on critical ingredients.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ledger = InventoryTransactionMgmt(db)
+        self.stocks = IngredientStockMgmt(db)
+        self.menu_items = MenuItemMgmt(db)
+    
+    async def consume_order(
+        self,
+        order_id: int,
+        lines: Sequence[Tuple[int, int]] | None = None,
+        commit: bool = True
+    ) -> List[dict]:
+        """
+        Deduct the ingredients of an order's items from stock.
+        
+        An order is consumed at most once; later calls write nothing.
+        
+        Args:
+            order_id: The order ID
+            lines: Pairs of menu item ID and quantity, when the caller already
+                has them; loaded from the order's items otherwise
+            commit: Whether to commit the transaction
+            
+        Returns:
+            The ledger rows written, one per ingredient
+        """
+        # Serializes consumption of the same order
+        locked = await self.db.execute(select(Order.created_at).where(Order.id == order_id).with_for_update())
+        order = locked.first()
+        if order is None:
+            return []
+        consumed_query = (
+            select(InventoryTransaction.id)
+            .where(InventoryTransaction.order_id == order_id)
+            .where(InventoryTransaction.transaction_type == TransactionType.order_consumption)
+            .limit(1)
+        )
+        if order.created_at is not None:
+            # Skips the ledger partitions of months before the order
+            consumed_query = consumed_query.where(InventoryTransaction.created_at >= month_start(order.created_at))
+        already_consumed = await self.db.execute(consumed_query)
+        if already_consumed.first() is not None:
+            return []
+        
+        if lines is None:
+            result = await self.db.execute(
+                select(OrderItem.item_id, OrderItem.quantity).where(OrderItem.order_id == order_id)
+            )
+            lines = result.all()
+        
+        usage = expand_recipes(lines, await self._load_recipes({menu_item_id for menu_item_id, _ in lines}))
+        return await self.move_stock(
+            {ingredient_id: -quantity for ingredient_id, quantity in usage.items()},
+            TransactionType.order_consumption,
+            order_id=order_id,
+            commit=commit
+        )
+    
+    async def move_stock(
+        self,
+        changes: Dict[int, Decimal],
+        transaction_type: TransactionType,
+        order_id: int | None = None,
+        notes: str | None = None,
+        staff_id: int | None = None,
+        commit: bool = True
+    ) -> List[dict]:
+        """
+        Apply stock changes and record them in the ledger.
+        
+        Args:
+            changes: Dictionary mapping ingredient ID to the quantity change,
+                negative for consumption and waste
+            transaction_type: The kind of movement
+            order_id: The order causing the movement, if any
+            notes: Free text stored with every ledger row
+            staff_id: The staff member recording the movement
+            commit: Whether to commit the transaction
+            
+        Returns:
+            The ledger rows written, one per ingredient
+        """
+        changes = {
+            ingredient_id: Decimal(change).quantize(QUANTITY)
+            for ingredient_id, change in changes.items()
+            if change
+        }
+        if not changes:
+            if commit:
+                await self.db.commit()
+            return []
+        
+        ingredient_ids = sorted(changes)
+        stock = await self.stocks.lock(ingredient_ids)
+        
+        rows = []
+        for ingredient_id in ingredient_ids:
+            before = stock.get(ingredient_id, Decimal(0))
+            rows.append({
+                "ingredient_id": ingredient_id,
+                "order_id": order_id,
+                "transaction_type": transaction_type,
+                "quantity_change": changes[ingredient_id],
+                "quantity_before": before,
+                "quantity_after": before + changes[ingredient_id],
+                "notes": notes,
+                "staff_id": staff_id,
+            })
+        await self.ledger.append(rows, commit=False)
+        # Same transaction as the ledger rows, so the two never disagree
+        await self.stocks.set_quantities({row["ingredient_id"]: row["quantity_after"] for row in rows}, commit=False)
+        
+        # Deductions can only take items off the menu and restocks only bring them back
+        await self.menu_items.sync_stock_availability([i for i in ingredient_ids if changes[i] < 0])
+        await self.menu_items.sync_stock_availability([i for i in ingredient_ids if changes[i] > 0], restore=True)
+        if commit:
+            await self.db.commit()
+        return rows
+    
+    async def get_stock(self, ingredient_ids: Sequence[int]) -> Dict[int, Decimal]:
+        """
+        Get the current stock of ingredients.
+        
+        Args:
+            ingredient_ids: The ingredient IDs
+            
+        Returns:
+            Dictionary mapping ingredient ID to its stock; ingredients that
+            never moved have a stock of 0
+        """
+        stock = await self.stocks.get_quantities(ingredient_ids)
+        return {ingredient_id: stock.get(ingredient_id, Decimal(0)) for ingredient_id in ingredient_ids}
+    
+    async def reconcile(self, first_id: int, last_id: int, fix: bool = False) -> List[dict]:
+        """
+        Compare the stock projection with the ledger for a range of ingredients.
+        
+        Both sides are read in one statement, so concurrent movements cannot
+        show up as drift. With `fix`, the stock rows are locked first and
+        drifted quantities are overwritten with the ledger's, updating the
+        availability of the menu items that depend on them. The caller
+        commits the fix.
+        
+        Args:
+            first_id: The first ingredient ID of the range
+            last_id: The last ingredient ID of the range, inclusive
+            fix: Whether to correct the projection
+            
+        Returns:
+            One dictionary per drifted ingredient with its projected and
+            ledger quantities
+        """
+        if fix:
+            result = await self.db.execute(select(Ingredient.id).where(Ingredient.id.between(first_id, last_id)))
+            await self.stocks.lock(result.scalars().all())
+        
+        latest_id = (
+            select(func.max(InventoryTransaction.id))
+            .where(InventoryTransaction.ingredient_id == Ingredient.id)
+            .correlate(Ingredient)
+            .scalar_subquery()
+        )
+        # Ingredients without recent movements only have compacted ledger days left
+        latest_summary = (
+            select(InventoryDailySummary.quantity_after)
+            .where(InventoryDailySummary.ingredient_id == Ingredient.id)
+            .order_by(InventoryDailySummary.day.desc())
+            .limit(1)
+            .correlate(Ingredient)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(
+                Ingredient.id,
+                IngredientStock.quantity,
+                func.coalesce(InventoryTransaction.quantity_after, latest_summary)
+            )
+            .outerjoin(IngredientStock, IngredientStock.ingredient_id == Ingredient.id)
+            .outerjoin(InventoryTransaction, InventoryTransaction.id == latest_id)
+            .where(Ingredient.id.between(first_id, last_id))
+        )
+        drift = [
+            {"ingredient_id": ingredient_id, "projected": projected or Decimal(0), "ledger": ledger or Decimal(0)}
+            for ingredient_id, projected, ledger in result.all()
+            if (projected or Decimal(0)) != (ledger or Decimal(0))
+        ]
+        
+        if fix:
+            await self.stocks.set_quantities({row["ingredient_id"]: row["ledger"] for row in drift}, commit=False)
+            await self.menu_items.sync_stock_availability(
+                [row["ingredient_id"] for row in drift if row["ledger"] < row["projected"]]
+            )
+            await self.menu_items.sync_stock_availability(
+                [row["ingredient_id"] for row in drift if row["ledger"] > row["projected"]], restore=True
+            )
+        return drift
+    
+    async def _load_recipes(self, menu_item_ids: Iterable[int]) -> Dict[int, List[Tuple[int, Decimal]]]:
+        menu_item_ids = list(menu_item_ids)
+        if not menu_item_ids:
+            return {}
+        result = await self.db.execute(
+            select(MenuItemRecipe.menu_item_id, MenuItemRecipe.ingredient_id, MenuItemRecipe.quantity_needed)
+            .where(MenuItemRecipe.menu_item_id.in_(menu_item_ids))
+        )
+        recipes: Dict[int, List[Tuple[int, Decimal]]] = {}
+        for menu_item_id, ingredient_id, quantity_needed in result.all():
+            recipes.setdefault(menu_item_id, []).append((ingredient_id, quantity_needed))
+        return recipes
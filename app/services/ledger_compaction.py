@@ -0,0 +1,75 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbs.inventory_transaction.mgmt import InventoryTransactionMgmt, month_start, add_months
+from app.dbs.inventory_daily_summary.mgmt import InventoryDailySummaryMgmt
+from datetime import datetime, timedelta, timezone
+import os
+
+# Ledger rows are kept in detail for this long, then only as daily summaries
+LEDGER_RETENTION = timedelta(days=int(os.getenv("LEDGER_RETENTION_DAYS", "90")))
+
+# Monthly partitions created ahead of time, so that inserts never land in
+# the default partition while the compaction job runs daily
+LEDGER_PARTITIONS_AHEAD = int(os.getenv("LEDGER_PARTITIONS_AHEAD", "3"))
+
+
+class LedgerCompactor:
+    """
+    Compacts inventory ledger rows older than the retention window.
+
+    On a partitioned ledger, months entirely older than the window are
+    summarized and dropped partition by partition, so no dead rows are left
+    for vacuum. Elsewhere the expired rows are summarized and deleted.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.ledger = InventoryTransactionMgmt(db)
+        self.summaries = InventoryDailySummaryMgmt(db)
+
+    async def run(
+        self,
+        now: datetime | None = None,
+        retention: timedelta = LEDGER_RETENTION,
+        months_ahead: int = LEDGER_PARTITIONS_AHEAD
+    ) -> dict:
+        """
+        Create upcoming partitions and compact expired ledger rows.
+
+        Every partition or range is compacted in its own transaction.
+
+        Args:
+            now: The current time
+            retention: How long ledger rows are kept in detail
+            months_ahead: The number of future monthly partitions to keep ready
+
+        Returns:
+            Dictionary with the partitions created and dropped, the cutoff and
+            the number of ledger rows and summary rows
+        """
+        now = now or datetime.now(timezone.utc)
+        stats = {"partitions_created": [], "partitions_dropped": [], "rows_deleted": 0, "summaries_written": 0}
+
+        if await self.ledger.is_partitioned():
+            stats["partitions_created"] = await self.ledger.ensure_partitions(now, months_ahead)
+            await self.db.commit()
+
+            # Only whole months are compacted, so every partition is dropped at once
+            cutoff = month_start(now - retention)
+            for month, name in (await self.ledger.get_partitions()).items():
+                if add_months(month, 1) > cutoff:
+                    break
+                stats["summaries_written"] += await self.summaries.summarize(month, add_months(month, 1))
+                await self.ledger.drop_partition(name)
+                await self.db.commit()
+                stats["partitions_dropped"].append(name)
+        else:
+            cutoff = (now - retention).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Expired rows outside dropped partitions: caught by the default
+        # partition, or the whole ledger when it is not partitioned
+        stats["summaries_written"] += await self.summaries.summarize(None, cutoff)
+        stats["rows_deleted"] = await self.ledger.delete_range(None, cutoff)
+        await self.db.commit()
+
+        stats["cutoff"] = cutoff
+        return stats
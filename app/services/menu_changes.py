@@ -0,0 +1,200 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, union_all
+from datetime import datetime, timedelta, timezone
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.services.menu_loader import menu_item_to_dict
+from app.dbs.category.model import Category
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.customization_option.model import CustomizationOption
+from app.dbs.customization_choice.model import CustomizationChoice
+import os
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Rows committed by transactions that started before the previous poll can
+# carry an older updated_at, so every delta re-sends this window
+MENU_CHANGES_OVERLAP = timedelta(seconds=int(os.getenv("MENU_CHANGES_OVERLAP_SECONDS", "5")))
+
+# Versions older than this ask for a full resync, since soft-deleted rows
+# are not guaranteed to be kept forever
+MENU_CHANGES_RETENTION = timedelta(days=int(os.getenv("MENU_CHANGES_RETENTION_DAYS", "7")))
+
+
+def to_version(value: datetime | None) -> int:
+    """
+    Convert a change timestamp into a menu version (microseconds since epoch).
+
+    Args:
+        value: The timestamp, naive timestamps are treated as UTC
+
+    Returns:
+        The menu version, 0 for None
+    """
+    if value is None:
+        return 0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_version(version: int) -> datetime:
+    """
+    Convert a menu version back into a timestamp.
+
+    Args:
+        version: The menu version
+
+    Returns:
+        The UTC timestamp of the version
+    """
+    return EPOCH + timedelta(microseconds=version)
+
+
+def changed_at(model):
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+class MenuChangesLoader:
+    """Loads the menu rows of a restaurant that changed since a menu version."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.restaurant_mgmt = RestaurantMgmt(db)
+
+    async def current_version(self, restaurant_id: int) -> int:
+        """
+        Get the current menu version of a restaurant.
+
+        Args:
+            restaurant_id: The restaurant ID
+
+        Returns:
+            The latest change timestamp of the menu, as a menu version
+        """
+        stmt = select(func.max(union_all(*self._change_queries(restaurant_id)).subquery().c.changed_at))
+        result = await self.db.execute(stmt)
+        return to_version(result.scalar_one_or_none())
+
+    async def load(self, restaurant_id: int, since: int) -> dict | None:
+        """
+        Load the categories, items, options and choices changed since a version.
+
+        Rows that were soft-deleted, deactivated or made unavailable are
+        reported as removed.
+
+        Args:
+            restaurant_id: The restaurant ID
+            since: The menu version the client already has
+
+        Returns:
+            Dictionary with the new menu version and the changes per entity,
+            or None if the restaurant is not found
+        """
+        restaurant = await self.restaurant_mgmt.get_by_id(restaurant_id)
+        if not restaurant:
+            return None
+
+        since_at = from_version(since)
+        now = datetime.now(timezone.utc)
+        if since <= 0 or since_at < now - MENU_CHANGES_RETENTION or since_at > now + MENU_CHANGES_OVERLAP:
+            return {
+                "restaurant_id": restaurant_id,
+                "version": await self.current_version(restaurant_id),
+                "full_resync": True
+            }
+
+        window_start = since_at - MENU_CHANGES_OVERLAP
+        version = since
+        changes = {"restaurant_id": restaurant_id, "full_resync": False}
+
+        for key, model, stmt, to_dict, is_removed in self._entities(restaurant_id):
+            result = await self.db.execute(stmt.where(changed_at(model) > window_start))
+            entity_changes = {"added": [], "changed": [], "removed": []}
+            for row in result.scalars().all():
+                version = max(version, to_version(row.updated_at or row.created_at))
+                if is_removed(row):
+                    entity_changes["removed"].append(row.id)
+                elif to_version(row.created_at) > since:
+                    entity_changes["added"].append(to_dict(row))
+                else:
+                    entity_changes["changed"].append(to_dict(row))
+            changes[key] = entity_changes
+
+        changes["version"] = version
+        return changes
+
+    def _change_queries(self, restaurant_id: int) -> list:
+        return [
+            stmt.with_only_columns(changed_at(model).label("changed_at"))
+            for _, model, stmt, _, _ in self._entities(restaurant_id)
+        ]
+
+    def _entities(self, restaurant_id: int) -> list:
+        return [
+            (
+                "categories",
+                Category,
+                select(Category).where(Category.restaurant_id == restaurant_id),
+                category_to_dict,
+                lambda category: not category.is_active or category.deleted_at is not None
+            ),
+            (
+                "menu_items",
+                MenuItem,
+                select(MenuItem).where(MenuItem.restaurant_id == restaurant_id),
+                menu_item_to_dict,
+                lambda menu_item: not menu_item.is_available or menu_item.deleted_at is not None
+            ),
+            (
+                "customization_options",
+                CustomizationOption,
+                select(CustomizationOption)
+                .join(MenuItem, MenuItem.id == CustomizationOption.item_id)
+                .where(MenuItem.restaurant_id == restaurant_id),
+                customization_option_to_dict,
+                lambda option: not option.is_active
+            ),
+            (
+                "customization_choices",
+                CustomizationChoice,
+                select(CustomizationChoice)
+                .join(CustomizationOption, CustomizationOption.id == CustomizationChoice.option_id)
+                .join(MenuItem, MenuItem.id == CustomizationOption.item_id)
+                .where(MenuItem.restaurant_id == restaurant_id),
+                customization_choice_to_dict,
+                lambda choice: not choice.is_available
+            ),
+        ]
+
+
+def category_to_dict(category: Category) -> dict:
+    return {
+        "id": category.id,
+        "name": category.name,
+        "sort_order": category.sort_order,
+        "is_active": category.is_active
+    }
+
+
+def customization_option_to_dict(option: CustomizationOption) -> dict:
+    return {
+        "id": option.id,
+        "item_id": option.item_id,
+        "name": option.name,
+        "type": option.type,
+        "is_required": option.is_required,
+        "max_selections": option.max_selections,
+        "sort_order": option.sort_order,
+        "is_active": option.is_active
+    }
+
+
+def customization_choice_to_dict(choice: CustomizationChoice) -> dict:
+    return {
+        "id": choice.id,
+        "option_id": choice.option_id,
+        "name": choice.name,
+        "price_modifier": choice.price_modifier,
+        "is_available": choice.is_available,
+        "sort_order": choice.sort_order
+    }
@@ -0,0 +1,117 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.category.model import Category
+
+
+def menu_item_to_dict(menu_item: MenuItem) -> dict:
+    """
+    Convert a menu item into the plain dictionary shared through the menu cache.
+
+    Args:
+        menu_item: The MenuItem object
+
+    Returns:
+        Dictionary with the menu item fields exposed on the menu
+    """
+    return {
+        "id": menu_item.id,
+        "category_id": menu_item.category_id,
+        "name": menu_item.name,
+        "description": menu_item.description,
+        "price": menu_item.price,
+        "image_url": menu_item.image_url,
+        "spice_level": menu_item.spice_level,
+        "is_available": menu_item.is_available,
+        "sort_order": menu_item.sort_order
+    }
+
+
+def menu_weight(menu: dict) -> int:
+    """
+    Approximate the size of a loaded menu, in rows, for the menu cache budget.
+
+    Args:
+        menu: The menu dictionary returned by MenuLoader.load
+
+    Returns:
+        The number of restaurant, category and menu item rows in the menu
+    """
+    return 1 + sum(1 + len(category["menu_items"]) for category in menu["categories"])
+
+
+class MenuLoader:
+    """Loads a restaurant menu in a fixed number of queries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.restaurant_mgmt = RestaurantMgmt(db)
+
+    async def load(self, restaurant_id: int) -> dict | None:
+        """
+        Load a restaurant with its active categories and available menu items.
+
+        The restaurant is fetched with one query and the categories with their
+        menu items with a single joined query, so the number of round trips does
+        not depend on the number of categories.
+
+        Args:
+            restaurant_id: The restaurant ID
+
+        Returns:
+            Dictionary containing restaurant info and categorized menu items,
+            or None if the restaurant is not found
+        """
+        restaurant = await self.restaurant_mgmt.get_by_id(restaurant_id)
+        if not restaurant:
+            return None
+
+        stmt = (
+            select(Category, MenuItem)
+            .outerjoin(
+                MenuItem,
+                and_(
+                    MenuItem.category_id == Category.id,
+                    MenuItem.is_available == True,
+                    MenuItem.deleted_at.is_(None)
+                )
+            )
+            .where(Category.restaurant_id == restaurant_id)
+            .where(Category.is_active == True)
+            .where(Category.deleted_at.is_(None))
+            .order_by(
+                Category.sort_order,
+                Category.name,
+                Category.id,
+                MenuItem.sort_order,
+                MenuItem.name
+            )
+        )
+
+        result = await self.db.execute(stmt)
+
+        # Group the joined rows by category, keeping the query ordering
+        categories_data = {}
+        for category, menu_item in result.all():
+            category_data = categories_data.get(category.id)
+            if category_data is None:
+                category_data = {
+                    "id": category.id,
+                    "name": category.name,
+                    "sort_order": category.sort_order,
+                    "is_active": category.is_active,
+                    "created_at": category.created_at,
+                    "updated_at": category.updated_at,
+                    "menu_items": []
+                }
+                categories_data[category.id] = category_data
+
+            if menu_item is not None:
+                category_data["menu_items"].append(menu_item_to_dict(menu_item))
+
+        return {
+            "restaurant_id": restaurant.id,
+            "restaurant_name": restaurant.name,
+            "categories": list(categories_data.values())
+        }
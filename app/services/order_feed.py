@@ -0,0 +1,101 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbs.base_mgmt import on_commit
+from app.dbs.qr_session.mgmt import QRSessionMgmt, SESSION_CLOSED, session_channel
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.core.pubsub import Subscription, broker
+from datetime import datetime, timezone
+from typing import Hashable
+
+
+def restaurant_channel(restaurant_id: int) -> str:
+    return f"restaurant:{restaurant_id}"
+
+
+def table_channel(table_id: int) -> str:
+    return f"table:{table_id}"
+
+
+def publish_order_event(
+    db: AsyncSession,
+    restaurant_id: int,
+    table_id: int,
+    type: str,
+    data: dict,
+    key: Hashable
+) -> None:
+    """
+    Publish an order event to the kitchen and the table once the transaction commits.
+
+    Events carry the full current state of what they describe, so a
+    subscriber that only receives the latest event of a key misses nothing.
+
+    Args:
+        db: The database session of the transaction
+        restaurant_id: The restaurant of the order
+        table_id: The table the order was placed from
+        type: The event type
+        data: The payload
+        key: What the event describes, e.g. ("order", order ID)
+    """
+    def publish():
+        broker.publish(restaurant_channel(restaurant_id), type, data, key)
+        broker.publish(table_channel(table_id), type, data, key)
+
+    on_commit(db, publish)
+
+
+class OrderFeedService:
+    """
+    Service for the real-time order feeds.
+    
+    Kitchen screens follow every order of a restaurant; guests follow the
+    orders of the table their QR session belongs to. Both are subscriptions
+    to the in-process broker, so screens are pushed changes instead of
+    polling the database.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def subscribe_kitchen(self, restaurant_id: int) -> Subscription | None:
+        """
+        Subscribe to the order events of a restaurant.
+        
+        Args:
+            restaurant_id: The restaurant ID
+        
+        Returns:
+            The Subscription, or None if the restaurant is not found
+        """
+        if await RestaurantMgmt(self.db).get_by_id(restaurant_id) is None:
+            return None
+        return broker.subscribe(restaurant_channel(restaurant_id))
+    
+    async def subscribe_table(self, session_token: str) -> Subscription | None:
+        """
+        Subscribe to the order events of the table of a guest's QR session.
+        
+        The subscription lasts only as long as the session: it ends when the
+        session expires, and with a session.closed event when the session is
+        closed, so the device does not follow the next party at the table.
+        
+        Args:
+            session_token: The QR session token
+        
+        Returns:
+            The Subscription, or None if the session is unknown or expired
+        """
+        now = datetime.now(timezone.utc)
+        session = await QRSessionMgmt(self.db).get_active(session_token, now)
+        if session is None:
+            return None
+        
+        expires_at = session.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return broker.subscribe(
+            table_channel(session.table_id),
+            session_channel(session.id),
+            expires_in=(expires_at - now).total_seconds(),
+            close_on={SESSION_CLOSED}
+        )
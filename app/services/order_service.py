@@ -0,0 +1,369 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.dbs.order.model import Order
+from app.dbs.order.mgmt import OrderMgmt, FINAL_STATUSES
+from app.dbs.order_item.model import OrderItem
+from app.dbs.order_item.mgmt import OrderItemMgmt, ITEM_STATUSES
+from app.dbs.order_customization.mgmt import OrderCustomizationMgmt
+from app.dbs.table.mgmt import TableMgmt
+from app.services.price_book import PriceBook, PriceBookLoader
+from app.services.inventory_service import InventoryService
+from app.services.sales_service import SalesService
+from app.services.order_feed import publish_order_event
+from app.core.menu_cache import menu_cache
+from app.core.singleflight import menu_flights
+from app.configs.database import sibling_session
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Sequence
+import os
+
+SERVICE_CHARGE_RATE = Decimal(os.getenv("SERVICE_CHARGE_RATE", "0.10"))
+CENT = Decimal("0.01")
+
+
+class InvalidOrderError(ValueError):
+    """Raised when an order refers to items, choices or tables it cannot use."""
+
+
+def to_cents(amount: Decimal) -> Decimal:
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def price_order_items(book: PriceBook, items: Sequence[dict]) -> List[dict]:
+    """
+    Validate the items of an order and price them from the price book.
+
+    Args:
+        book: The price book of the restaurant
+        items: Dictionaries with menu_item_id, quantity and choice_ids
+
+    Returns:
+        One dictionary per item with the order item columns and, under
+        "customizations", the order customization columns
+
+    Raises:
+        InvalidOrderError: If an item or choice cannot be ordered
+    """
+    if not items:
+        raise InvalidOrderError("An order needs at least one item")
+
+    priced = []
+    for item in items:
+        menu_item = book.items.get(item["menu_item_id"])
+        if menu_item is None:
+            raise InvalidOrderError(f"Menu item {item['menu_item_id']} is not on the menu")
+        if not menu_item.is_orderable:
+            raise InvalidOrderError(f"{menu_item.name} is not available")
+        if item["quantity"] < 1:
+            raise InvalidOrderError(f"Invalid quantity for {menu_item.name}")
+
+        choice_ids = item.get("choice_ids") or []
+        if len(set(choice_ids)) != len(choice_ids):
+            raise InvalidOrderError(f"A choice was selected twice for {menu_item.name}")
+
+        selections = {}
+        customizations = []
+        unit_price = menu_item.price
+        for choice_id in choice_ids:
+            choice = book.choices.get(choice_id)
+            option = book.options.get(choice.option_id) if choice else None
+            if option is None or option.item_id != menu_item.id:
+                raise InvalidOrderError(f"Choice {choice_id} does not apply to {menu_item.name}")
+            if not choice.is_available:
+                raise InvalidOrderError(f"Choice {choice_id} is not available")
+            selections[option.id] = selections.get(option.id, 0) + 1
+            if selections[option.id] > option.max_selections:
+                raise InvalidOrderError(f"Too many choices for option {option.id} of {menu_item.name}")
+            unit_price += choice.price_modifier
+            customizations.append({
+                "option_id": option.id,
+                "choice_id": choice.id,
+                "price_modifier": choice.price_modifier,
+            })
+
+        for option_id in book.required_options.get(menu_item.id, ()):
+            if option_id not in selections:
+                raise InvalidOrderError(f"Option {option_id} of {menu_item.name} is required")
+
+        unit_price = to_cents(unit_price)
+        priced.append({
+            "item_id": menu_item.id,
+            "quantity": item["quantity"],
+            "unit_price": unit_price,
+            "total_price": unit_price * item["quantity"],
+            "customizations": customizations,
+        })
+    return priced
+
+
+def order_to_dict(order: Order, items: Sequence[OrderItem], customizations: dict) -> dict:
+    """
+    Convert an order graph into the dictionary returned by the API.
+
+    Args:
+        order: The Order object
+        items: Its OrderItem objects
+        customizations: Dictionary mapping order item ID to its OrderCustomization objects
+
+    Returns:
+        Dictionary with the order fields and its items
+    """
+    return {
+        "id": order.id,
+        "restaurant_id": order.restaurant_id,
+        "table_id": order.table_id,
+        "status": order.status,
+        "payment_status": order.payment_status,
+        "subtotal": order.subtotal,
+        "service_charge": order.service_charge,
+        "total_amount": order.total_amount,
+        "special_requests": order.special_requests,
+        "order_time": order.order_time,
+        "completed_time": order.completed_time,
+        "items": [
+            {
+                "order_item_id": item.order_item_id,
+                "item_id": item.item_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "total_price": item.total_price,
+                "status": item.status,
+                "customizations": [
+                    {
+                        "option_id": customization.option_id,
+                        "choice_id": customization.choice_id,
+                        "price_modifier": customization.price_modifier,
+                    }
+                    for customization in customizations.get(item.order_item_id, [])
+                ],
+            }
+            for item in items
+        ],
+    }
+
+
+class OrderService:
+    """Service for order business logic."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.mgmt = OrderMgmt(db)
+    
+    async def get_price_book(self, restaurant_id: int) -> PriceBook | None:
+        """
+        Get the price book of a restaurant.
+        
+        Served from the menu cache and reloaded after any menu write, so
+        orders are always priced from the current menu.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            
+        Returns:
+            PriceBook of the restaurant, or None if the restaurant is not found
+        """
+        book = menu_cache.get(restaurant_id, "price_book")
+        if book is not None:
+            return book
+        
+        version = menu_cache.version(restaurant_id)
+        return await menu_flights.do(
+            ("price_book", restaurant_id, version),
+            lambda: self._load_price_book(restaurant_id, version)
+        )
+    
+    async def _load_price_book(self, restaurant_id: int, version: int) -> PriceBook | None:
+        # Shared with concurrent orders, so not on this request's write session
+        async with sibling_session(self.db) as session:
+            book = await PriceBookLoader(session).load(restaurant_id)
+        if book is not None:
+            menu_cache.put(restaurant_id, "price_book", book, version, weight=book.weight)
+        return book
+    
+    async def place_order(
+        self,
+        restaurant_id: int,
+        table_id: int,
+        items: Sequence[dict],
+        special_requests: str | None = None
+    ) -> dict | None:
+        """
+        Place an order with its items and customizations in one transaction.
+        
+        Prices come from the cached price book, never from the client. The
+        order, its items and their customizations are written with one
+        INSERT each, however large the basket, and the ingredients of the
+        items are deducted from stock in the same transaction. The kitchen
+        and the table are notified once the order is committed.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            table_id: The table the order is placed from
+            items: Dictionaries with menu_item_id, quantity and choice_ids
+            special_requests: Free text for the kitchen
+            
+        Returns:
+            Dictionary with the placed order and its items, or None if the
+            restaurant is not found
+            
+        Raises:
+            InvalidOrderError: If the table, an item or a choice cannot be used
+        """
+        book = await self.get_price_book(restaurant_id)
+        if book is None:
+            return None
+        
+        table = await TableMgmt(self.db).get_by_id(table_id)
+        if table is None or table.restaurant_id != restaurant_id or table.deleted_at is not None:
+            raise InvalidOrderError(f"Table {table_id} does not belong to restaurant {restaurant_id}")
+        
+        priced_items = price_order_items(book, items)
+        subtotal = sum((item["total_price"] for item in priced_items), Decimal(0))
+        service_charge = to_cents(subtotal * SERVICE_CHARGE_RATE)
+        
+        order = await self.mgmt.create({
+            "restaurant_id": restaurant_id,
+            "table_id": table_id,
+            "subtotal": subtotal,
+            "service_charge": service_charge,
+            "total_amount": subtotal + service_charge,
+            "status": "pending",
+            "payment_status": "pending",
+            "special_requests": special_requests,
+            "order_time": datetime.now(timezone.utc),
+        }, commit=False)
+        
+        order_items = await OrderItemMgmt(self.db).bulk_create([
+            {
+                "order_id": order.id,
+                "item_id": item["item_id"],
+                "quantity": item["quantity"],
+                "unit_price": item["unit_price"],
+                "total_price": item["total_price"],
+                "status": "pending",
+            }
+            for item in priced_items
+        ], commit=False)
+        
+        customizations = await OrderCustomizationMgmt(self.db).bulk_create([
+            {"order_item_id": order_item.order_item_id, **customization}
+            for order_item, item in zip(order_items, priced_items)
+            for customization in item["customizations"]
+        ], commit=False)
+        
+        # Last, so that the ingredient locks are held as briefly as possible
+        await InventoryService(self.db).consume_order(
+            order.id,
+            [(item["item_id"], item["quantity"]) for item in priced_items],
+            commit=False
+        )
+        
+        by_item = {}
+        for customization in customizations:
+            by_item.setdefault(customization.order_item_id, []).append(customization)
+        placed = order_to_dict(order, order_items, by_item)
+        publish_order_event(self.db, restaurant_id, table_id, "order.created", placed, ("order", order.id))
+        
+        await self.db.commit()
+        return placed
+    
+    async def complete_order(self, order_id: int) -> dict | None:
+        """
+        Complete an order and add it to the sales rollups.
+        
+        Completing an order again returns it unchanged, so it is counted in
+        the sales only once.
+        
+        Args:
+            order_id: The order ID
+            
+        Returns:
+            Dictionary with the order and its items, or None if not found
+            
+        Raises:
+            InvalidOrderError: If the order was cancelled
+        """
+        completed_at = datetime.now(timezone.utc)
+        order = await self.mgmt.complete(order_id, completed_at, commit=False)
+        if order is None:
+            existing = await self.get_order(order_id)
+            if existing is not None and existing["status"] == "cancelled":
+                raise InvalidOrderError(f"Order {order_id} was cancelled")
+            return existing
+        
+        result = await self.db.execute(
+            select(OrderItem.item_id, OrderItem.quantity, OrderItem.total_price)
+            .where(OrderItem.order_id == order_id)
+        )
+        await SalesService(self.db).record_order(
+            order.restaurant_id, order.total_amount, result.all(), completed_at, commit=False
+        )
+        completed = await self.get_order(order_id)
+        publish_order_event(
+            self.db, order.restaurant_id, order.table_id, "order.updated", completed, ("order", order_id)
+        )
+        await self.db.commit()
+        return completed
+    
+    async def update_item_status(self, order_id: int, order_item_id: int, status: str) -> dict | None:
+        """
+        Change the kitchen status of an order item and notify the kitchen and the table.
+        
+        Args:
+            order_id: The order ID
+            order_item_id: The order item ID
+            status: One of ITEM_STATUSES
+            
+        Returns:
+            Dictionary with the order and its items, or None if the order
+            item is not found
+            
+        Raises:
+            InvalidOrderError: If the status is unknown or the order is
+                completed or cancelled
+        """
+        if status not in ITEM_STATUSES:
+            raise InvalidOrderError(f"Item status must be one of {', '.join(ITEM_STATUSES)}")
+        
+        order = await self.mgmt.get_by_id(order_id)
+        item = await OrderItemMgmt(self.db).get_by_id(order_item_id)
+        if order is None or order.deleted_at is not None or item is None or item.order_id != order_id:
+            return None
+        if order.status in FINAL_STATUSES:
+            raise InvalidOrderError(f"Order {order_id} is {order.status}")
+        
+        if item.status != status:
+            await OrderItemMgmt(self.db).update(order_item_id, {"status": status}, commit=False)
+            publish_order_event(self.db, order.restaurant_id, order.table_id, "order_item.updated", {
+                "order_id": order_id,
+                "order_item_id": order_item_id,
+                "item_id": item.item_id,
+                "status": status,
+            }, ("order_item", order_item_id))
+            await self.db.commit()
+        return await self.get_order(order_id)
+    
+    async def get_order(self, order_id: int) -> dict | None:
+        """
+        Get an order with its items and their customizations.
+        
+        Args:
+            order_id: The order ID
+            
+        Returns:
+            Dictionary with the order and its items, or None if not found
+        """
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .where(Order.deleted_at.is_(None))
+            .options(selectinload(Order.order_items).selectinload(OrderItem.order_customizations))
+        )
+        order = (await self.db.execute(stmt)).scalar_one_or_none()
+        if order is None:
+            return None
+        
+        items = sorted(order.order_items, key=lambda item: item.order_item_id)
+        return order_to_dict(order, items, {item.order_item_id: item.order_customizations for item in items})
@@ -0,0 +1,128 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.dbs.category.model import Category
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.customization_option.model import CustomizationOption
+from app.dbs.customization_choice.model import CustomizationChoice
+from decimal import Decimal
+from typing import Dict, NamedTuple
+
+
+class PricedChoice(NamedTuple):
+    id: int
+    option_id: int
+    price_modifier: Decimal
+    is_available: bool
+
+
+class PricedOption(NamedTuple):
+    id: int
+    item_id: int
+    is_required: bool
+    max_selections: int
+
+
+class PricedItem(NamedTuple):
+    id: int
+    name: str
+    price: Decimal
+    # False for unavailable items and items of inactive categories
+    is_orderable: bool
+
+
+class PriceBook:
+    """
+    The prices and ordering rules of a restaurant's menu.
+
+    Shared through the menu cache, so it is invalidated by every menu write
+    and must not be modified.
+    """
+
+    __slots__ = ("restaurant_id", "items", "options", "choices", "required_options")
+
+    def __init__(self, restaurant_id: int):
+        self.restaurant_id = restaurant_id
+        self.items: Dict[int, PricedItem] = {}
+        self.options: Dict[int, PricedOption] = {}
+        self.choices: Dict[int, PricedChoice] = {}
+        # Menu item ID -> IDs of its required options
+        self.required_options: Dict[int, tuple] = {}
+
+    @property
+    def weight(self) -> int:
+        return 1 + len(self.items) + len(self.options) + len(self.choices)
+
+
+class PriceBookLoader:
+    """Loads the price book of a restaurant in a fixed number of queries."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.restaurant_mgmt = RestaurantMgmt(db)
+
+    async def load(self, restaurant_id: int) -> PriceBook | None:
+        """
+        Load the menu items, active customization options and their choices.
+
+        Args:
+            restaurant_id: The restaurant ID
+
+        Returns:
+            PriceBook of the restaurant, or None if the restaurant is not found
+        """
+        restaurant = await self.restaurant_mgmt.get_by_id(restaurant_id)
+        if not restaurant:
+            return None
+
+        book = PriceBook(restaurant_id)
+        items = await self.db.execute(
+            select(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.price,
+                (MenuItem.is_available == True) & (Category.is_active == True) & Category.deleted_at.is_(None)
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(MenuItem.restaurant_id == restaurant_id)
+            .where(MenuItem.deleted_at.is_(None))
+        )
+        for item_id, name, price, is_orderable in items.all():
+            book.items[item_id] = PricedItem(item_id, name, price, bool(is_orderable))
+
+        options = await self.db.execute(
+            select(
+                CustomizationOption.id,
+                CustomizationOption.item_id,
+                CustomizationOption.is_required,
+                CustomizationOption.max_selections
+            )
+            .join(MenuItem, MenuItem.id == CustomizationOption.item_id)
+            .where(MenuItem.restaurant_id == restaurant_id)
+            .where(CustomizationOption.is_active == True)
+        )
+        required = {}
+        for option_id, item_id, is_required, max_selections in options.all():
+            book.options[option_id] = PricedOption(option_id, item_id, bool(is_required), max_selections or 1)
+            if is_required:
+                required.setdefault(item_id, []).append(option_id)
+        book.required_options = {item_id: tuple(option_ids) for item_id, option_ids in required.items()}
+
+        choices = await self.db.execute(
+            select(
+                CustomizationChoice.id,
+                CustomizationChoice.option_id,
+                CustomizationChoice.price_modifier,
+                CustomizationChoice.is_available
+            )
+            .join(CustomizationOption, CustomizationOption.id == CustomizationChoice.option_id)
+            .join(MenuItem, MenuItem.id == CustomizationOption.item_id)
+            .where(MenuItem.restaurant_id == restaurant_id)
+            .where(CustomizationOption.is_active == True)
+        )
+        for choice_id, option_id, price_modifier, is_available in choices.all():
+            book.choices[choice_id] = PricedChoice(
+                choice_id, option_id, price_modifier or Decimal(0), bool(is_available)
+            )
+
+        return book
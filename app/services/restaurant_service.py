@@ -1,12 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, distinct
+from sqlalchemy import select
 from app.dbs.restaurant.model import Restaurant
 from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.dbs.pagination import Page, MAX_PAGE_SIZE
 from app.dbs.allergen.model import Allergen
 from app.dbs.menu_item.model import MenuItem
 from app.dbs.menu_item_allergen.model import MenuItemAllergen
-from app.dbs.category.model import Category
-from typing import List
+from app.services.menu_loader import MenuLoader, menu_weight
+from app.services.menu_changes import MenuChangesLoader
+from app.core.menu_cache import menu_cache
+from app.core.singleflight import menu_flights, restaurant_list_cache
+from app.configs.database import async_session, is_replica, sibling_session, REPLICA_MAX_LAG
+from app.core.allergen_index import RestaurantAllergenIndex, allergen_indexes
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, List
 
 
 class RestaurantService:
@@ -15,14 +23,32 @@ class RestaurantService:
     def __init__(self, db: AsyncSession):
         self.mgmt = RestaurantMgmt(db)
     
-    async def get_all_restaurants(self) -> List[Restaurant]:
+    async def get_restaurants_page(self, limit: int, cursor: str | None = None) -> Page[Restaurant]:
         """
-        Get all active restaurants.
+        Get one page of active restaurants.
         
+        The first page is the one most clients ask for, so it is cached at
+        the largest page size for a short TTL, cut down to the requested
+        size, and once expired still served while a single background load
+        refreshes it. Later pages are read with the keyset query. The
+        returned objects of the first page are shared between requests and
+        must not be modified.
+        
+        Args:
+            limit: The maximum number of restaurants on the page
+            cursor: The cursor returned with the previous page
+            
         Returns:
-            List of Restaurant objects
+            Page of Restaurant objects and the cursor of the next page
+        
+        Raises:
+            InvalidCursorError: If the cursor is malformed
         """
-        return await self.mgmt.get_all_active()
+        if cursor:
+            return await self.mgmt.get_page(limit, cursor)
+        
+        page = await restaurant_list_cache.get("active", partial(load_first_restaurant_page, self.mgmt.db))
+        return page.head(limit, self.mgmt.primary_key)
     
     async def get_restaurant_by_id(self, restaurant_id: int) -> Restaurant | None:
         """
@@ -73,79 +99,239 @@ class RestaurantService:
         """
         return await self.mgmt.soft_delete(restaurant_id)
     
-    async def get_restaurant_allergens(self, restaurant_id: int) -> List[Allergen]:
+    async def get_restaurant_allergens(self, restaurant_id: int) -> List[dict] | None:
         """
         Get all unique allergens associated with a restaurant's menu items.
         
+        Results are served from the menu cache and reloaded after any menu write.
+        Concurrent misses for the same menu version share a single load.
+        
         Args:
             restaurant_id: The restaurant ID
             
         Returns:
-            List of unique Allergen objects for the restaurant
+            List of unique allergens for the restaurant, or None if the
+            restaurant is not found
         """
-        # Query to get distinct allergens for a restaurant through menu items
-        stmt = (
-            select(distinct(Allergen.id), Allergen)
-            .join(MenuItemAllergen, Allergen.id == MenuItemAllergen.allergen_id)
-            .join(MenuItem, MenuItemAllergen.menu_item_id == MenuItem.id)
-            .where(MenuItem.restaurant_id == restaurant_id)
-            .order_by(Allergen.name)
+        allergens = menu_cache.get(restaurant_id, "allergens")
+        if allergens is not None:
+            return allergens
+        
+        version = menu_cache.version(restaurant_id)
+        return await menu_flights.do(
+            ("allergens", restaurant_id, version),
+            lambda: self._load_restaurant_allergens(restaurant_id, version)
         )
+    
+    async def _load_restaurant_allergens(self, restaurant_id: int, version: int) -> List[dict] | None:
+        async with self._cache_fill_session(restaurant_id) as db:
+            restaurant = await RestaurantMgmt(db).get_by_id(restaurant_id)
+            if not restaurant:
+                return None
+            
+            # Query to get distinct allergens for a restaurant through menu items
+            stmt = (
+                select(Allergen)
+                .join(MenuItemAllergen, Allergen.id == MenuItemAllergen.allergen_id)
+                .join(MenuItem, MenuItemAllergen.menu_item_id == MenuItem.id)
+                .where(MenuItem.restaurant_id == restaurant_id)
+                .distinct()
+                .order_by(Allergen.name)
+            )
+            
+            result = await db.execute(stmt)
+            allergens = [
+                {
+                    "id": allergen.id,
+                    "i18n_key": allergen.i18n_key,
+                    "name": allergen.name,
+                    "icon_url": allergen.icon_url,
+                    "severity_level": allergen.severity_level
+                }
+                for allergen in result.scalars().all()
+            ]
         
-        result = await self.mgmt.db.execute(stmt)
-        allergens = result.scalars().unique().all()
-        return list(allergens)
+        menu_cache.put(restaurant_id, "allergens", allergens, version, weight=len(allergens) + 1)
+        return allergens
     
-    async def get_restaurant_menu(self, restaurant_id: int) -> dict:
+    async def get_restaurant_menu(self, restaurant_id: int) -> dict | None:
         """
         Get restaurant menu organized by categories with menu items.
         
+        Results are served from the menu cache and reloaded after any menu write.
+        Concurrent misses for the same menu version share a single load.
+        
         Args:
             restaurant_id: The restaurant ID
             
         Returns:
-            Dictionary containing restaurant info and categorized menu items
+            Dictionary containing restaurant info and categorized menu items,
+            or None if the restaurant is not found
         """
-        # Get restaurant info
-        restaurant = await self.get_restaurant_by_id(restaurant_id)
+        menu = menu_cache.get(restaurant_id, "menu")
+        if menu is not None:
+            return menu
         
-        # Get categories with their menu items
-        stmt = (
-            select(Category)
-            .where(Category.restaurant_id == restaurant_id)
-            .where(Category.is_active == True)
-            .order_by(Category.sort_order, Category.name)
+        version = menu_cache.version(restaurant_id)
+        return await menu_flights.do(
+            ("menu", restaurant_id, version),
+            lambda: self._load_restaurant_menu(restaurant_id, version)
         )
+    
+    async def _load_restaurant_menu(self, restaurant_id: int, version: int) -> dict | None:
+        async with self._cache_fill_session(restaurant_id) as db:
+            menu = await MenuLoader(db).load(restaurant_id)
+        if menu is None:
+            return None
         
-        result = await self.mgmt.db.execute(stmt)
-        categories = result.scalars().all()
-        
-        # For each category, get its menu items
-        categories_data = []
-        for category in categories:
-            menu_items_stmt = (
-                select(MenuItem)
-                .where(MenuItem.category_id == category.id)
-                .where(MenuItem.is_available == True)
-                .order_by(MenuItem.sort_order, MenuItem.name)
-            )
+        menu_cache.put(restaurant_id, "menu", menu, version, weight=menu_weight(menu))
+        return menu
+    
+    async def get_allergen_index(self, restaurant_id: int) -> RestaurantAllergenIndex:
+        """
+        Get the allergen bitmask index of a restaurant's menu items.
+        
+        The index is built with one query on first use and afterwards kept up
+        to date incrementally by allergen link writes.
+        
+        Args:
+            restaurant_id: The restaurant ID
             
-            menu_items_result = await self.mgmt.db.execute(menu_items_stmt)
-            menu_items = menu_items_result.scalars().all()
+        Returns:
+            The RestaurantAllergenIndex for the restaurant
+        """
+        index = allergen_indexes.get(restaurant_id)
+        if index is not None:
+            return index
+        
+        generation = allergen_indexes.generation(restaurant_id)
+        async with self._cache_fill_session(restaurant_id) as db:
+            index = await self._build_allergen_index(db, restaurant_id)
+        
+        allergen_indexes.install(restaurant_id, index, generation)
+        return index
+    
+    async def _build_allergen_index(self, db: AsyncSession, restaurant_id: int) -> RestaurantAllergenIndex:
+        stmt = (
+            select(
+                MenuItemAllergen.menu_item_id,
+                MenuItemAllergen.allergen_id,
+                MenuItemAllergen.contamination_risk,
+                Allergen.i18n_key,
+                Allergen.severity_level
+            )
+            .join(Allergen, Allergen.id == MenuItemAllergen.allergen_id)
+            .join(MenuItem, MenuItem.id == MenuItemAllergen.menu_item_id)
+            .where(MenuItem.restaurant_id == restaurant_id)
+        )
+        
+        result = await db.execute(stmt)
+        index = RestaurantAllergenIndex()
+        for menu_item_id, allergen_id, contamination_risk, i18n_key, severity_level in result.all():
+            if not index.has_allergen(allergen_id):
+                index.set_allergen(allergen_id, i18n_key, severity_level)
+            index.set_link(menu_item_id, allergen_id, contamination_risk.value)
+        return index
+    
+    async def get_restaurant_menu_excluding_allergens(
+        self,
+        restaurant_id: int,
+        allergens: List[int | str],
+        strict: bool = False
+    ) -> dict | None:
+        """
+        Get restaurant menu without the menu items that contain given allergens.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            allergens: Allergen IDs or i18n keys to exclude
+            strict: Also exclude items that only may contain a non-severe allergen
             
-            category_data = {
-                "id": category.id,
-                "name": category.name,
-                "sort_order": category.sort_order,
-                "is_active": category.is_active,
-                "created_at": category.created_at,
-                "updated_at": category.updated_at,
-                "menu_items": list(menu_items)
-            }
-            categories_data.append(category_data)
+        Returns:
+            Dictionary containing restaurant info and the filtered menu items,
+            or None if the restaurant is not found
+        """
+        menu = await self.get_restaurant_menu(restaurant_id)
+        if menu is None:
+            return None
+        
+        index = await self.get_allergen_index(restaurant_id)
+        mask = index.mask_for(allergens)
         
         return {
-            "restaurant_id": restaurant_id,
-            "restaurant_name": restaurant.name,
-            "categories": categories_data
-        }
\ No newline at end of file
+            **menu,
+            "categories": [
+                {
+                    **category,
+                    "menu_items": [
+                        menu_item for menu_item in category["menu_items"]
+                        if index.is_safe(menu_item["id"], mask, strict)
+                    ]
+                }
+                for category in menu["categories"]
+            ]
+        }
+    
+    async def get_restaurant_menu_changes(self, restaurant_id: int, since: int) -> dict | None:
+        """
+        Get the menu rows of a restaurant that changed since a menu version.
+        
+        Polls with the latest version are answered from the menu cache
+        without touching the database until the next menu write.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            since: The menu version the client already has
+            
+        Returns:
+            Dictionary with the new menu version and the changes per entity,
+            or None if the restaurant is not found
+        """
+        latest_version = menu_cache.get(restaurant_id, "changes_version")
+        if latest_version is not None and since == latest_version:
+            return {"restaurant_id": restaurant_id, "version": since, "full_resync": False}
+        
+        version = menu_cache.version(restaurant_id)
+        async with self._cache_fill_session(restaurant_id) as db:
+            changes = await MenuChangesLoader(db).load(restaurant_id, since)
+        if changes is None:
+            return None
+        
+        menu_cache.put(restaurant_id, "changes_version", changes["version"], version)
+        return changes
+    
+    @asynccontextmanager
+    async def _cache_fill_session(self, restaurant_id: int) -> AsyncIterator[AsyncSession]:
+        """
+        Dedicated session for loads whose results are cached under the current menu version.
+        
+        The loads run as single-flight tasks that every waiting request
+        shares and that outlive a cancelled caller, so they never use the
+        request's session. They read from the request's database, except
+        right after a menu write: a lagging replica could return data older
+        than the version the load is stored under, so they go to the primary.
+        """
+        db = self.mgmt.db
+        if is_replica(db) and menu_cache.changed_within(restaurant_id, REPLICA_MAX_LAG):
+            session = async_session()
+        else:
+            session = sibling_session(db)
+        async with session:
+            yield session
+
+
+async def load_first_restaurant_page(db: AsyncSession) -> Page[Restaurant]:
+    """
+    Load the largest first page of active restaurants with a dedicated session.
+    
+    Used by the restaurant list cache, whose refreshes can outlive the
+    request that triggered them.
+    
+    Args:
+        db: The session of the request that triggered the load
+    
+    Returns:
+        Page of Restaurant objects and the cursor of the next page
+    """
+    async with sibling_session(db) as session:
+        return await RestaurantMgmt(session).get_page(MAX_PAGE_SIZE)
@@ -0,0 +1,208 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.dbs.sales_hourly.mgmt import SalesHourlyMgmt
+from app.dbs.sales_hourly_item.mgmt import SalesHourlyItemMgmt
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+import os
+
+GRANULARITIES = ("hour", "day", "week", "month")
+CENT = Decimal("0.01")
+
+# Longest range a single report may cover
+MAX_SALES_RANGE = timedelta(days=int(os.getenv("MAX_SALES_RANGE_DAYS", "400")))
+
+
+class InvalidSalesRangeError(ValueError):
+    """Raised when a sales report asks for an unknown granularity or an invalid range."""
+
+
+def to_hour(value: datetime) -> datetime:
+    """
+    Truncate a time to the start of its UTC hour.
+
+    Args:
+        value: The time, naive times are treated as UTC
+
+    Returns:
+        The start of the hour, in UTC
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """
+    Get the start of the UTC hour, day, week (from Monday) or month containing a time.
+
+    Args:
+        value: The time
+        granularity: One of GRANULARITIES
+
+    Returns:
+        The start of the bucket
+    """
+    hour = to_hour(value)
+    if granularity == "hour":
+        return hour
+    day = hour.replace(hour=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Attach UTC to the naive bucket starts SQLite returns.
+
+    Args:
+        value: The time, naive times are treated as UTC
+
+    Returns:
+        The time, in UTC
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class SalesService:
+    """
+    Service for sales reporting.
+
+    Completed orders are added to hourly rollups per restaurant and per menu
+    item in the transaction that completes them. Reports add up the hourly
+    rows into days, weeks or months in the database, so they never
+    aggregate orders.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.hourly = SalesHourlyMgmt(db)
+        self.hourly_items = SalesHourlyItemMgmt(db)
+        self.restaurants = RestaurantMgmt(db)
+    
+    async def record_order(
+        self,
+        restaurant_id: int,
+        total_amount: Decimal,
+        items: Sequence[Tuple[int, int, Decimal]],
+        completed_at: datetime,
+        commit: bool = True
+    ) -> None:
+        """
+        Add a completed order to the rollups of the hour it was completed in.
+        
+        Must run exactly once per order, in the transaction completing it.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            total_amount: The total amount of the order
+            items: Triples of menu item ID, quantity and total price
+            completed_at: The completion time
+            commit: Whether to commit the transaction
+        """
+        by_item: Dict[int, Tuple[int, Decimal]] = {}
+        for menu_item_id, quantity, total_price in items:
+            previous_quantity, previous_revenue = by_item.get(menu_item_id, (0, Decimal(0)))
+            by_item[menu_item_id] = (previous_quantity + quantity, previous_revenue + total_price)
+        
+        hour = to_hour(completed_at)
+        await self.hourly.add(restaurant_id, hour, sum(quantity for _, quantity, _ in items), total_amount)
+        await self.hourly_items.add(restaurant_id, hour, by_item)
+        if commit:
+            await self.db.commit()
+    
+    async def get_sales(
+        self,
+        restaurant_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime
+    ) -> List[dict] | None:
+        """
+        Get the sales of a restaurant per hour, day, week or month.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            granularity: One of GRANULARITIES
+            start: The start of the report, rounded down to its bucket
+            end: The end of the report, exclusive
+            
+        Returns:
+            One dictionary per bucket with sales, in chronological order, or
+            None if the restaurant is not found; buckets without sales are
+            left out
+            
+        Raises:
+            InvalidSalesRangeError: If the granularity or range is invalid
+        """
+        start, end = self._check_range(granularity, start, end)
+        if await self.restaurants.get_by_id(restaurant_id) is None:
+            return None
+        rows = await self.hourly.get_totals(restaurant_id, granularity, start, end)
+        return [
+            {
+                "start": as_utc(row.start),
+                "order_count": row.order_count,
+                "item_quantity": row.item_quantity,
+                "revenue": row.revenue,
+                "average_basket": (row.revenue / row.order_count).quantize(CENT),
+            }
+            for row in rows
+        ]
+    
+    async def get_item_sales(
+        self,
+        restaurant_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        menu_item_ids: Sequence[int] | None = None
+    ) -> List[dict] | None:
+        """
+        Get the sales of a restaurant's menu items per hour, day, week or month.
+        
+        Args:
+            restaurant_id: The restaurant ID
+            granularity: One of GRANULARITIES
+            start: The start of the report, rounded down to its bucket
+            end: The end of the report, exclusive
+            menu_item_ids: Only these menu items, when given
+            
+        Returns:
+            One dictionary per bucket and menu item with sales, in
+            chronological order, or None if the restaurant is not found
+            
+        Raises:
+            InvalidSalesRangeError: If the granularity or range is invalid
+        """
+        start, end = self._check_range(granularity, start, end)
+        if await self.restaurants.get_by_id(restaurant_id) is None:
+            return None
+        rows = await self.hourly_items.get_totals(restaurant_id, granularity, start, end, menu_item_ids)
+        return [
+            {
+                "start": as_utc(row.start),
+                "menu_item_id": row.menu_item_id,
+                "order_count": row.order_count,
+                "quantity": row.quantity,
+                "revenue": row.revenue,
+            }
+            for row in rows
+        ]
+    
+    def _check_range(self, granularity: str, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+        if granularity not in GRANULARITIES:
+            raise InvalidSalesRangeError(f"Granularity must be one of {', '.join(GRANULARITIES)}")
+        start = bucket_start(start, granularity)
+        end = end.replace(tzinfo=timezone.utc) if end.tzinfo is None else end.astimezone(timezone.utc)
+        if end <= start:
+            raise InvalidSalesRangeError("The end of the range must be after its start")
+        if end - start > MAX_SALES_RANGE:
+            raise InvalidSalesRangeError(f"Ranges are limited to {MAX_SALES_RANGE.days} days")
+        return start, end
@@ -0,0 +1,67 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json current.json --metric p95_ms --threshold 0.2
+
+Exits with status 1 when a scenario got slower than the threshold.
+"""
+from typing import List
+import argparse
+import json
+import sys
+
+
+def compare(baseline: dict, current: dict, metric: str, threshold: float) -> List[dict]:
+    """
+    Compare one metric of the scenarios present in both result sets.
+
+    Args:
+        baseline: The results of the reference run, per scenario
+        current: The results of the new run, per scenario
+        metric: The metric to compare, e.g. "mean_ms" or "p95_ms"
+        threshold: The allowed relative slowdown
+
+    Returns:
+        One row per scenario with both values, the change and whether it regressed
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name][metric]
+        after = current[name][metric]
+        change = (after - before) / before if before else 0.0
+        rows.append({
+            "name": name,
+            "before": before,
+            "after": after,
+            "change": change,
+            "regressed": change > threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[dict]) -> None:
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['name']:<58} {row['before']:>9.3f} -> {row['after']:>9.3f}  {row['change']:+7.1%}{flag}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    rows = compare(baseline, current, args.metric, args.threshold)
+    print_comparison(rows)
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
+from app.dbs.restaurant.model import Restaurant
+from app.dbs.category.model import Category
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.customization_option.model import CustomizationOption
+from app.dbs.customization_choice.model import CustomizationChoice
+from app.dbs.allergen.model import Allergen
+from app.dbs.menu_item_allergen.model import MenuItemAllergen, ContaminationRisk
+from decimal import Decimal
+from typing import List
+import random
+
+ALLERGEN_KEYS = [
+    "gluten", "crustaceans", "eggs", "fish", "peanuts", "soybeans", "milk",
+    "nuts", "celery", "mustard", "sesame", "sulphites", "lupin", "molluscs",
+]
+
+INSERT_CHUNK_SIZE = 1000
+
+
+class DatasetSize:
+    """Shape of the seeded benchmark dataset."""
+
+    def __init__(
+        self,
+        restaurants: int = 50,
+        categories: int = 8,
+        items_per_category: int = 12,
+        options_per_item: int = 2,
+        choices_per_option: int = 3,
+        allergens_per_item: int = 2
+    ):
+        self.restaurants = restaurants
+        self.categories = categories
+        self.items_per_category = items_per_category
+        self.options_per_item = options_per_item
+        self.choices_per_option = choices_per_option
+        self.allergens_per_item = allergens_per_item
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+async def seed_menus(session_factory: sessionmaker, size: DatasetSize, seed: int = 42) -> List[int]:
+    """
+    Seed restaurants with full menus, customizations and allergen links.
+
+    The data is generated from a fixed seed and uses explicit primary keys,
+    so every run produces the same dataset.
+
+    Args:
+        session_factory: Factory of the sessions to insert with
+        size: The shape of the dataset
+        seed: The random seed
+
+    Returns:
+        The restaurant IDs
+    """
+    rng = random.Random(seed)
+    rows = {model: [] for model in (
+        Allergen, Restaurant, Category, MenuItem, CustomizationOption, CustomizationChoice, MenuItemAllergen
+    )}
+
+    rows[Allergen] = [
+        {"id": i + 1, "i18n_key": key, "name": key.title(), "severity_level": rng.randint(1, 4)}
+        for i, key in enumerate(ALLERGEN_KEYS)
+    ]
+
+    category_id = item_id = option_id = choice_id = 0
+    for restaurant_id in range(1, size.restaurants + 1):
+        rows[Restaurant].append({"id": restaurant_id, "name": f"Restaurant {restaurant_id}", "is_active": True})
+        for category_index in range(size.categories):
+            category_id += 1
+            rows[Category].append({
+                "id": category_id,
+                "restaurant_id": restaurant_id,
+                "name": f"Category {category_index}",
+                "sort_order": category_index,
+                "is_active": True,
+            })
+            for item_index in range(size.items_per_category):
+                item_id += 1
+                rows[MenuItem].append({
+                    "id": item_id,
+                    "restaurant_id": restaurant_id,
+                    "category_id": category_id,
+                    "name": f"Item {item_id}",
+                    "description": "A realistic description of a dish " * 3,
+                    "price": Decimal(rng.randint(300, 3000)) / 100,
+                    "spice_level": rng.randint(0, 3),
+                    "is_available": rng.random() > 0.05,
+                    "sort_order": item_index,
+                })
+                for allergen in rng.sample(rows[Allergen], size.allergens_per_item):
+                    rows[MenuItemAllergen].append({
+                        "menu_item_id": item_id,
+                        "allergen_id": allergen["id"],
+                        "contamination_risk": rng.choice(list(ContaminationRisk)),
+                    })
+                for option_index in range(size.options_per_item):
+                    option_id += 1
+                    rows[CustomizationOption].append({
+                        "id": option_id,
+                        "item_id": item_id,
+                        "name": f"Option {option_index}",
+                        "type": "single",
+                        "sort_order": option_index,
+                        "is_active": True,
+                    })
+                    for choice_index in range(size.choices_per_option):
+                        choice_id += 1
+                        rows[CustomizationChoice].append({
+                            "id": choice_id,
+                            "option_id": option_id,
+                            "name": f"Choice {choice_index}",
+                            "price_modifier": Decimal(rng.randint(0, 300)) / 100,
+                            "sort_order": choice_index,
+                        })
+
+    async with session_factory() as session:
+        for model, model_rows in rows.items():
+            for start in range(0, len(model_rows), INSERT_CHUNK_SIZE):
+                await session.execute(insert(model), model_rows[start:start + INSERT_CHUNK_SIZE])
+        await session.commit()
+
+    return [row["id"] for row in rows[Restaurant]]
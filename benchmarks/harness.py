@@ -0,0 +1,115 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.configs.database import Base
+from datetime import datetime, timezone
+from typing import List, Sequence
+import app.dbs  # noqa: F401  (registers every model on Base.metadata)
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "orderflow-bench.db")
+
+
+async def create_benchmark_engine(url: str = DEFAULT_DATABASE_URL) -> AsyncEngine:
+    """
+    Create an engine on an empty benchmark database.
+
+    Args:
+        url: The database URL; the database is wiped
+
+    Returns:
+        AsyncEngine with the schema created
+    """
+    if url.startswith("sqlite"):
+        path = url.split("///", 1)[-1]
+        if path and os.path.exists(path):
+            os.remove(path)
+        engine = create_async_engine(url, poolclass=NullPool)
+    else:
+        engine = create_async_engine(url)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def session_factory(engine: AsyncEngine) -> sessionmaker:
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Get a percentile with linear interpolation.
+
+    Args:
+        sorted_values: The values, sorted ascending
+        fraction: The percentile as a fraction, e.g. 0.95
+
+    Returns:
+        The percentile value, 0.0 for no values
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(seconds: List[float]) -> dict:
+    """
+    Summarize timings in milliseconds.
+
+    Args:
+        seconds: The timings, in seconds
+
+    Returns:
+        Dictionary with min, mean, p50, p95, p99, max and stddev
+    """
+    values = sorted(value * 1000 for value in seconds)
+    return {
+        "min_ms": round(values[0], 3) if values else 0.0,
+        "mean_ms": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+        "stddev_ms": round(statistics.stdev(values), 3) if len(values) > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    """Describe the commit and machine the results were produced on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+def write_results(path: str, kind: str, config: dict, results: dict) -> None:
+    """
+    Store benchmark results as JSON, to compare them across commits.
+
+    Args:
+        path: The output file
+        kind: The benchmark kind, "load" or "micro"
+        config: The parameters of the run
+        results: The results per scenario
+    """
+    with open(path, "w") as f:
+        json.dump({"kind": kind, "environment": environment(), "config": config, "results": results}, f, indent=2)
+        f.write("\n")
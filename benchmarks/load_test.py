@@ -0,0 +1,138 @@
+"""
+Load test of the restaurant API through an in-process ASGI client.
+
+Seeds a benchmark database, then drives every scenario with a fixed number
+of requests at the given concurrency and reports latency percentiles,
+throughput and queries per request.
+
+    python -m benchmarks.load_test --restaurants 50 --concurrency 32 --requests 2000 --output load.json
+    python -m benchmarks.compare baseline.json load.json
+"""
+from app.configs.database import get_db, get_read_db
+from app.core.menu_cache import menu_cache
+from benchmarks.dataset import DatasetSize, seed_menus
+from benchmarks.harness import DEFAULT_DATABASE_URL, create_benchmark_engine, session_factory, summarize, write_results
+from typing import Callable, List
+import argparse
+import asyncio
+import httpx
+import random
+import re
+import time
+
+_QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+SCENARIOS = {
+    "restaurants": lambda rng, ids: "/api/v1/restaurants/",
+    "menu": lambda rng, ids: f"/api/v1/restaurants/{rng.choice(ids)}/menu",
+    "menu_excluding_allergens": lambda rng, ids: f"/api/v1/restaurants/{rng.choice(ids)}/menu?exclude_allergens=gluten,milk",
+    "allergens": lambda rng, ids: f"/api/v1/restaurants/{rng.choice(ids)}/allergens",
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    path_for: Callable,
+    restaurant_ids: List[int],
+    requests: int,
+    concurrency: int,
+    cold: bool
+) -> dict:
+    """
+    Send a number of requests with a fixed number of concurrent workers.
+
+    Args:
+        client: The ASGI client
+        path_for: Builds the path of a request from a random generator and the restaurant IDs
+        restaurant_ids: The seeded restaurant IDs
+        requests: The total number of requests
+        concurrency: The number of concurrent workers
+        cold: Drop the menu cache before every request
+
+    Returns:
+        Dictionary with latency percentiles, throughput and queries per request
+    """
+    rng = random.Random(7)
+    paths = [path_for(rng, restaurant_ids) for _ in range(requests)]
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while paths:
+            path = paths.pop()
+            if cold:
+                menu_cache.invalidate_all()
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Accept-Encoding": "identity"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            match = _QUERY_COUNT.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        **summarize(latencies),
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    from main import app
+
+    engine = await create_benchmark_engine(args.database_url)
+    sessions = session_factory(engine)
+    size = DatasetSize(restaurants=args.restaurants, categories=args.categories, items_per_category=args.items_per_category)
+    restaurant_ids = await seed_menus(sessions, size)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in args.scenarios:
+                menu_cache.invalidate_all()
+                results[name] = await run_scenario(
+                    client, SCENARIOS[name], restaurant_ids, args.requests, args.concurrency, args.cold
+                )
+                print(f"{name:<28} {results[name]}")
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    if args.output:
+        config = {**vars(args), "dataset": size.to_dict()}
+        write_results(args.output, "load", config, results)
+    return results
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="Benchmark database, wiped before the run")
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--items-per-category", type=int, default=12)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cold", action="store_true", help="Drop the menu cache before every request")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
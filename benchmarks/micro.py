@@ -0,0 +1,152 @@
+"""
+Micro-benchmarks of the service layer.
+
+Each benchmark is warmed up, then timed over a number of rounds. Results
+are printed as a table and can be stored as JSON and compared with a
+previous run, failing when a benchmark got slower than the threshold.
+
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.micro --compare baseline.json --threshold 0.2
+"""
+from sqlalchemy.orm import sessionmaker
+from app.core.menu_cache import menu_cache
+from app.core.allergen_index import allergen_indexes
+from app.core.snapshot import EncodedSnapshot
+from app.services.menu_loader import MenuLoader
+from app.services.restaurant_service import RestaurantService
+from app.routers.v1.restaurant.schemas import RestaurantMenuResponse
+from benchmarks.dataset import DatasetSize, seed_menus
+from benchmarks.harness import DEFAULT_DATABASE_URL, create_benchmark_engine, session_factory, summarize, write_results
+from benchmarks.compare import compare, print_comparison
+from typing import Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+BenchmarkFn = Callable[[sessionmaker, int], Awaitable[object]]
+
+BENCHMARKS: Dict[str, BenchmarkFn] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFn], BenchmarkFn]:
+    """Register a coroutine function taking a session factory and a restaurant ID."""
+    def register(fn: BenchmarkFn) -> BenchmarkFn:
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+@benchmark("menu_loader.load")
+async def bench_menu_loader(sessions: sessionmaker, restaurant_id: int):
+    async with sessions() as db:
+        return await MenuLoader(db).load(restaurant_id)
+
+
+@benchmark("service.get_restaurant_menu.cold")
+async def bench_menu_cold(sessions: sessionmaker, restaurant_id: int):
+    menu_cache.invalidate(restaurant_id)
+    async with sessions() as db:
+        return await RestaurantService(db).get_restaurant_menu(restaurant_id)
+
+
+@benchmark("service.get_restaurant_menu.cached")
+async def bench_menu_cached(sessions: sessionmaker, restaurant_id: int):
+    async with sessions() as db:
+        return await RestaurantService(db).get_restaurant_menu(restaurant_id)
+
+
+@benchmark("service.get_restaurant_allergens.cold")
+async def bench_allergens_cold(sessions: sessionmaker, restaurant_id: int):
+    menu_cache.invalidate(restaurant_id)
+    async with sessions() as db:
+        return await RestaurantService(db).get_restaurant_allergens(restaurant_id)
+
+
+@benchmark("service.get_allergen_index.build")
+async def bench_allergen_index(sessions: sessionmaker, restaurant_id: int):
+    allergen_indexes.clear()
+    async with sessions() as db:
+        return await RestaurantService(db).get_allergen_index(restaurant_id)
+
+
+@benchmark("service.get_restaurant_menu_excluding_allergens.cached")
+async def bench_menu_excluding_allergens(sessions: sessionmaker, restaurant_id: int):
+    async with sessions() as db:
+        return await RestaurantService(db).get_restaurant_menu_excluding_allergens(
+            restaurant_id, ["gluten", "milk"], strict=True
+        )
+
+
+@benchmark("service.get_restaurant_menu_changes")
+async def bench_menu_changes(sessions: sessionmaker, restaurant_id: int):
+    menu_cache.invalidate(restaurant_id)
+    async with sessions() as db:
+        return await RestaurantService(db).get_restaurant_menu_changes(restaurant_id, since=1)
+
+
+@benchmark("snapshot.encode")
+async def bench_snapshot(sessions: sessionmaker, restaurant_id: int):
+    async with sessions() as db:
+        menu = await RestaurantService(db).get_restaurant_menu(restaurant_id)
+    body = RestaurantMenuResponse.model_validate(menu).model_dump_json().encode()
+    return EncodedSnapshot(body)
+
+
+async def run_benchmark(fn: BenchmarkFn, sessions: sessionmaker, restaurant_id: int, rounds: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await fn(sessions, restaurant_id)
+
+    timings: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn(sessions, restaurant_id)
+        timings.append(time.perf_counter() - started)
+    return {**summarize(timings), "rounds": rounds}
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = await create_benchmark_engine(args.database_url)
+    sessions = session_factory(engine)
+    size = DatasetSize(restaurants=2, categories=args.categories, items_per_category=args.items_per_category)
+    restaurant_id = (await seed_menus(sessions, size))[0]
+
+    results = {}
+    try:
+        for name, fn in BENCHMARKS.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = await run_benchmark(fn, sessions, restaurant_id, args.rounds, args.warmup)
+            print(f"{name:<58} mean {results[name]['mean_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms")
+    finally:
+        await engine.dispose()
+
+    if args.output:
+        write_results(args.output, "micro", {**vars(args), "dataset": size.to_dict()}, results)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        rows = compare(baseline, results, "mean_ms", args.threshold)
+        print_comparison(rows)
+        return 1 if any(row["regressed"] for row in rows) else 0
+    return 0
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="Benchmark database, wiped before the run")
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--items-per-category", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with the results stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, as a fraction")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
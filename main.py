@@ -1,19 +1,56 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from app.configs.database import init_db
-from app.routers.v1 import restaurant_router
+from app.configs.database import engine, init_db, replicas, READ_YOUR_WRITES_COOKIE, REPLICA_MAX_LAG
+from app.configs.pool import pool_stats
+from app.core.query_stats import query_stats_middleware
+from app.routers.v1 import restaurant_router, order_router
+from app.core.menu_cache import menu_cache
+from app.core.singleflight import menu_flights, restaurant_list_cache
+from app.core.metrics import metrics, metrics_middleware
+from app.core.pubsub import broker
+import math
+import time
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    replicas.start_health_checks()
+    metrics.routes.register_app(app)
+    metrics.loop_lag.start()
     yield
+    metrics.loop_lag.stop()
+    await broker.close()
+    await replicas.close()
 
 
 app = FastAPI(title="OrderFlow Backend", version="1.0.0", lifespan=lifespan)
 
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Send reads of clients that just wrote to the primary until replicas catch up."""
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time()),
+            max_age=max(1, math.ceil(REPLICA_MAX_LAG)),
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+
+app.middleware("http")(query_stats_middleware)
+# Registered last so that it wraps the other middleware
+app.middleware("http")(metrics_middleware)
+
+
 # Include API routers
 app.include_router(restaurant_router, prefix="/api/v1/restaurants", tags=["restaurants"])
+app.include_router(order_router, prefix="/api/v1/orders", tags=["orders"])
 
 
 @app.get("/")
@@ -23,4 +60,36 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/menu-cache")
+async def menu_cache_stats():
+    return {
+        **menu_cache.stats(),
+        "single_flight": menu_flights.stats(),
+        "restaurant_list": restaurant_list_cache.stats(),
+    }
+
+
+@app.get("/health/replicas")
+async def replica_health():
+    return replicas.stats()
+
+
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    return {
+        "primary": pool_stats(engine),
+        "replicas": replicas.stats(),
+    }
+
+
+@app.get("/health/feeds")
+async def feed_stats():
+    return broker.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
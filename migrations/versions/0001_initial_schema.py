@@ -0,0 +1,290 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('allergens',
+    sa.Column('i18n_key', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('icon_url', sa.String(length=512), nullable=True),
+    sa.Column('severity_level', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_allergens_id', 'allergens', ['id'])
+
+    op.create_table('restaurants',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('address', sa.String(length=50), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('email', sa.String(length=50), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_restaurants_id', 'restaurants', ['id'])
+
+    op.create_table('categories',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_categories_id', 'categories', ['id'])
+
+    op.create_table('ingredients',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('sku_code', sa.String(length=50), nullable=True),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('unit_cost', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.Column('min_threshold', sa.Integer(), nullable=True),
+    sa.Column('max_capacity', sa.Integer(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('storage_location', sa.String(length=100), nullable=True),
+    sa.Column('shelf_life_days', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ingredients_id', 'ingredients', ['id'])
+
+    op.create_table('tables',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('qr_code_token', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('qr_code_token')
+    )
+    op.create_index('ix_tables_id', 'tables', ['id'])
+
+    op.create_table('menu_items',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('image_url', sa.String(length=512), nullable=True),
+    sa.Column('spice_level', sa.Integer(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_menu_items_id', 'menu_items', ['id'])
+
+    op.create_table('orders',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('table_id', sa.Integer(), nullable=False),
+    sa.Column('subtotal', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('service_charge', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.Column('total_amount', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('payment_status', sa.String(length=50), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('special_requests', sa.Text(), nullable=True),
+    sa.Column('order_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('estimated_ready_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.ForeignKeyConstraint(['table_id'], ['tables.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_orders_id', 'orders', ['id'])
+
+    op.create_table('qr_sessions',
+    sa.Column('table_id', sa.Integer(), nullable=False),
+    sa.Column('session_token', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_activity', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['table_id'], ['tables.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_token')
+    )
+    op.create_index('ix_qr_sessions_id', 'qr_sessions', ['id'])
+
+    op.create_table('customization_options',
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('max_selections', sa.Integer(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['menu_items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customization_options_id', 'customization_options', ['id'])
+
+    op.create_table('menu_item_allergens',
+    sa.Column('menu_item_id', sa.Integer(), nullable=False),
+    sa.Column('allergen_id', sa.Integer(), nullable=False),
+    sa.Column('contamination_risk', sa.Enum('contains', 'may_contain', name='contaminationrisk'), nullable=False),
+    sa.ForeignKeyConstraint(['allergen_id'], ['allergens.id'], ),
+    sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+    sa.PrimaryKeyConstraint('menu_item_id', 'allergen_id')
+    )
+    op.create_table('menu_item_recipes',
+    sa.Column('menu_item_id', sa.Integer(), nullable=False),
+    sa.Column('ingredient_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_needed', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('is_critical', sa.Boolean(), nullable=True),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+    sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_menu_item_recipes_id', 'menu_item_recipes', ['id'])
+
+    op.create_table('order_items',
+    sa.Column('order_item_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('total_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default='now()', nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['menu_items.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.PrimaryKeyConstraint('order_item_id')
+    )
+    op.create_index('ix_order_items_order_item_id', 'order_items', ['order_item_id'])
+
+    op.create_table('customization_choices',
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('price_modifier', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['option_id'], ['customization_options.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customization_choices_id', 'customization_choices', ['id'])
+
+    op.create_table('inventory_transactions',
+    sa.Column('ingredient_id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('order_item_id', sa.Integer(), nullable=True),
+    sa.Column('transaction_type', sa.Enum('waste', 'order_consumption', 'adjustment', 'restock', name='transactiontype'), nullable=False),
+    sa.Column('quantity_change', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.Column('quantity_before', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.Column('quantity_after', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.Column('staff_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['order_item_id'], ['order_items.order_item_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_inventory_transactions_id', 'inventory_transactions', ['id'])
+
+    op.create_table('order_customizations',
+    sa.Column('order_item_id', sa.Integer(), nullable=False),
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('choice_id', sa.Integer(), nullable=False),
+    sa.Column('price_modifier', sa.DECIMAL(precision=10, scale=2), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['choice_id'], ['customization_choices.id'], ),
+    sa.ForeignKeyConstraint(['option_id'], ['customization_options.id'], ),
+    sa.ForeignKeyConstraint(['order_item_id'], ['order_items.order_item_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_customizations_id', 'order_customizations', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_customizations_id', table_name='order_customizations')
+    op.drop_table('order_customizations')
+    op.drop_index('ix_inventory_transactions_id', table_name='inventory_transactions')
+    op.drop_table('inventory_transactions')
+    op.drop_index('ix_customization_choices_id', table_name='customization_choices')
+    op.drop_table('customization_choices')
+    op.drop_index('ix_order_items_order_item_id', table_name='order_items')
+    op.drop_table('order_items')
+    op.drop_index('ix_menu_item_recipes_id', table_name='menu_item_recipes')
+    op.drop_table('menu_item_recipes')
+    op.drop_table('menu_item_allergens')
+    op.drop_index('ix_customization_options_id', table_name='customization_options')
+    op.drop_table('customization_options')
+    op.drop_index('ix_qr_sessions_id', table_name='qr_sessions')
+    op.drop_table('qr_sessions')
+    op.drop_index('ix_orders_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_menu_items_id', table_name='menu_items')
+    op.drop_table('menu_items')
+    op.drop_index('ix_tables_id', table_name='tables')
+    op.drop_table('tables')
+    op.drop_index('ix_ingredients_id', table_name='ingredients')
+    op.drop_table('ingredients')
+    op.drop_index('ix_categories_id', table_name='categories')
+    op.drop_table('categories')
+    op.drop_index('ix_restaurants_id', table_name='restaurants')
+    op.drop_table('restaurants')
+    op.drop_index('ix_allergens_id', table_name='allergens')
+    op.drop_table('allergens')
+    # PostgreSQL keeps enum types after their tables are dropped
+    sa.Enum(name='transactiontype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='contaminationrisk').drop(op.get_bind(), checkfirst=True)
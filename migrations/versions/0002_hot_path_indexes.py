@@ -0,0 +1,56 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Indexes are built with CREATE INDEX CONCURRENTLY on PostgreSQL, so the tables
+stay writable while they build. That cannot run inside a transaction, hence
+the autocommit block. A build that fails leaves an INVALID index behind; drop
+it before running the migration again.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _where(predicate: str) -> dict:
+    # Booleans are compared with 1 on SQLite, which stores them as integers
+    return {
+        'postgresql_where': sa.text(predicate.format(true='true')),
+        'sqlite_where': sa.text(predicate.format(true='1')),
+    }
+
+
+INDEXES = [
+    ('ix_categories_restaurant_id', 'categories', ['restaurant_id'], {}),
+    ('ix_categories_menu', 'categories', ['restaurant_id', 'sort_order', 'name', 'id'],
+     _where('is_active = {true} AND deleted_at IS NULL')),
+    ('ix_menu_items_restaurant_id', 'menu_items', ['restaurant_id'], {}),
+    ('ix_menu_items_menu', 'menu_items', ['category_id', 'sort_order', 'name'],
+     _where('is_available = {true} AND deleted_at IS NULL')),
+    ('ix_customization_options_item_id', 'customization_options', ['item_id'], {}),
+    ('ix_customization_choices_option_id', 'customization_choices', ['option_id'], {}),
+    ('ix_orders_restaurant_status_time', 'orders', ['restaurant_id', 'status', 'order_time'],
+     _where('deleted_at IS NULL')),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], {}),
+    ('ix_inventory_transactions_ingredient_time', 'inventory_transactions', ['ingredient_id', 'created_at'], {}),
+    ('ix_qr_sessions_table_status_expiry', 'qr_sessions', ['table_id', 'status', 'expires_at'], {}),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **options)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
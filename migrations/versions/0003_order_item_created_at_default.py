@@ -0,0 +1,26 @@
+"""order item created_at default
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+The default was the string 'now()' rather than the now() function.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('order_items') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('order_items') as batch_op:
+        batch_op.alter_column('created_at', server_default='now()')
@@ -0,0 +1,29 @@
+"""recipe menu item index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_menu_item_recipes_menu_item_id', 'menu_item_recipes', ['menu_item_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_menu_item_recipes_menu_item_id', table_name='menu_item_recipes',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,45 @@
+"""ingredient stocks
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Creates the current-stock projection and fills it from the latest ledger row
+of every ingredient. On a large ledger, run `python -m app.cli.reconcile_stock`
+afterwards to verify it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('ingredient_stocks',
+    sa.Column('ingredient_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+    sa.PrimaryKeyConstraint('ingredient_id')
+    )
+    op.execute(
+        """
+        INSERT INTO ingredient_stocks (ingredient_id, quantity)
+        SELECT ingredients.id, COALESCE((
+            SELECT inventory_transactions.quantity_after
+            FROM inventory_transactions
+            WHERE inventory_transactions.ingredient_id = ingredients.id
+            ORDER BY inventory_transactions.id DESC
+            LIMIT 1
+        ), 0)
+        FROM ingredients
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingredient_stocks')
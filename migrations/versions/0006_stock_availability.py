@@ -0,0 +1,37 @@
+"""stock availability
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'menu_items',
+        sa.Column('out_of_stock', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_menu_item_recipes_critical_ingredient', 'menu_item_recipes', ['ingredient_id', 'menu_item_id'],
+            postgresql_where=sa.text('is_critical = true'), sqlite_where=sa.text('is_critical = 1'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_menu_item_recipes_critical_ingredient', table_name='menu_item_recipes',
+            postgresql_concurrently=True, if_exists=True
+        )
+    with op.batch_alter_table('menu_items') as batch_op:
+        batch_op.drop_column('out_of_stock')
@@ -0,0 +1,126 @@
+"""ledger partitions and daily summaries
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+On PostgreSQL the ledger is rebuilt as a table range partitioned by month
+of created_at: one partition per month from the oldest row to three months
+ahead, plus a default partition. The rows are copied under an exclusive
+lock, so run it in a maintenance window on a large ledger. Afterwards,
+schedule `python -m app.cli.compact_ledger` daily.
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timezone
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _rebuild(partitioned: bool) -> None:
+    bind = op.get_bind()
+    op.rename_table('inventory_transactions', 'inventory_transactions_old')
+    op.execute(
+        'ALTER TABLE inventory_transactions_old '
+        'RENAME CONSTRAINT inventory_transactions_pkey TO inventory_transactions_old_pkey'
+    )
+    for name in ('ix_inventory_transactions_id', 'ix_inventory_transactions_ingredient_time',
+                 'ix_inventory_transactions_order_id'):
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    
+    if partitioned:
+        op.execute(
+            'CREATE TABLE inventory_transactions (LIKE inventory_transactions_old INCLUDING DEFAULTS, '
+            'PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)'
+        )
+        oldest = bind.execute(sa.text('SELECT min(created_at) FROM inventory_transactions_old')).scalar()
+        now = datetime.now(timezone.utc)
+        month = min(oldest or now, now).astimezone(timezone.utc)
+        month = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month <= last:
+            upper = _next_month(month)
+            op.execute(
+                f'CREATE TABLE inventory_transactions_p{month:%Y%m} PARTITION OF inventory_transactions '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+            month = upper
+        op.execute('CREATE TABLE inventory_transactions_default PARTITION OF inventory_transactions DEFAULT')
+    else:
+        op.execute(
+            'CREATE TABLE inventory_transactions (LIKE inventory_transactions_old INCLUDING DEFAULTS, PRIMARY KEY (id))'
+        )
+    
+    op.execute('INSERT INTO inventory_transactions SELECT * FROM inventory_transactions_old')
+    op.execute('ALTER SEQUENCE inventory_transactions_id_seq OWNED BY inventory_transactions.id')
+    op.drop_table('inventory_transactions_old')
+    for column, target in (('ingredient_id', 'ingredients.id'), ('order_id', 'orders.id'),
+                           ('order_item_id', 'order_items.order_item_id')):
+        table, target_column = target.split('.')
+        op.create_foreign_key(
+            f'inventory_transactions_{column}_fkey', 'inventory_transactions', table, [column], [target_column]
+        )
+
+
+def _create_indexes(order_id: bool = True) -> None:
+    """Recreate the ledger indexes dropped by _rebuild on the new parent table."""
+    op.create_index('ix_inventory_transactions_id', 'inventory_transactions', ['id'])
+    op.create_index(
+        'ix_inventory_transactions_ingredient_time', 'inventory_transactions', ['ingredient_id', 'created_at']
+    )
+    if order_id:
+        op.create_index(
+            'ix_inventory_transactions_order_id', 'inventory_transactions', ['order_id'],
+            postgresql_where=sa.text('order_id IS NOT NULL'), sqlite_where=sa.text('order_id IS NOT NULL')
+        )
+
+
+def upgrade() -> None:
+    op.create_table('inventory_daily_summaries',
+    sa.Column('ingredient_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('consumption', sa.DECIMAL(precision=12, scale=3), nullable=False),
+    sa.Column('waste', sa.DECIMAL(precision=12, scale=3), nullable=False),
+    sa.Column('restock', sa.DECIMAL(precision=12, scale=3), nullable=False),
+    sa.Column('adjustment', sa.DECIMAL(precision=12, scale=3), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('quantity_after', sa.DECIMAL(precision=10, scale=3), nullable=False),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ),
+    sa.PrimaryKeyConstraint('ingredient_id', 'day')
+    )
+    op.execute('UPDATE inventory_transactions SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL')
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild(partitioned=True)
+        _create_indexes()
+    else:
+        with op.batch_alter_table('inventory_transactions') as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+        op.create_index(
+            'ix_inventory_transactions_order_id', 'inventory_transactions', ['order_id'],
+            sqlite_where=sa.text('order_id IS NOT NULL')
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild(partitioned=False)
+        # The order_id index did not exist before this revision
+        _create_indexes(order_id=False)
+    else:
+        op.drop_index('ix_inventory_transactions_order_id', table_name='inventory_transactions')
+    with op.batch_alter_table('inventory_transactions') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+    op.drop_table('inventory_daily_summaries')
@@ -0,0 +1,78 @@
+"""sales rollups
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+Creates the hourly sales rollups and fills them from the orders completed
+so far. Later completions update them incrementally.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def _hour(column: str) -> str:
+    if op.get_bind().dialect.name == 'postgresql':
+        return f"date_trunc('hour', {column})"
+    # Formatted like the timestamps SQLAlchemy writes on SQLite
+    return f"strftime('%Y-%m-%d %H:00:00.000000', {column})"
+
+
+def upgrade() -> None:
+    op.create_table('sales_hourly',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('item_quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('restaurant_id', 'hour')
+    )
+    op.create_table('sales_hourly_items',
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('menu_item_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+    sa.PrimaryKeyConstraint('restaurant_id', 'hour', 'menu_item_id')
+    )
+    
+    completed = "o.status = 'completed' AND o.completed_time IS NOT NULL AND o.deleted_at IS NULL"
+    op.execute(
+        f"""
+        INSERT INTO sales_hourly (restaurant_id, hour, order_count, item_quantity, revenue)
+        SELECT restaurant_id, hour, count(*), sum(item_quantity), sum(total_amount)
+        FROM (
+            SELECT o.restaurant_id, {_hour('o.completed_time')} AS hour, o.total_amount,
+                   COALESCE(sum(oi.quantity), 0) AS item_quantity
+            FROM orders o LEFT JOIN order_items oi ON oi.order_id = o.id
+            WHERE {completed}
+            GROUP BY o.id, o.restaurant_id, o.completed_time, o.total_amount
+        ) completed_orders
+        GROUP BY restaurant_id, hour
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO sales_hourly_items (restaurant_id, hour, menu_item_id, order_count, quantity, revenue)
+        SELECT o.restaurant_id, {_hour('o.completed_time')}, oi.item_id,
+               count(DISTINCT o.id), sum(oi.quantity), sum(oi.total_price)
+        FROM orders o JOIN order_items oi ON oi.order_id = o.id
+        WHERE {completed}
+        GROUP BY o.restaurant_id, {_hour('o.completed_time')}, oi.item_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sales_hourly_items')
+    op.drop_table('sales_hourly')
@@ -0,0 +1,83 @@
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.configs.database import Base, get_db, get_read_db
+from app.core.menu_cache import menu_cache
+from app.core.allergen_index import allergen_indexes
+from app.core.singleflight import restaurant_list_cache
+from app.core.query_stats import query_monitor
+import app.dbs  # noqa: F401  (registers every model on Base.metadata)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# Fail any request that runs the same statement more often than this,
+# which is how N+1 query patterns show up
+query_monitor.repeat_limit = 10
+
+
+@pytest.fixture(autouse=True)
+def reset_menu_cache():
+    # Test databases reuse primary keys, so never carry cached menus over
+    menu_cache.invalidate_all()
+    allergen_indexes.clear()
+    restaurant_list_cache.clear()
+    yield
+    menu_cache.invalidate_all()
+    allergen_indexes.clear()
+    restaurant_list_cache.clear()
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Collects the SQL statements executed on the test engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def client(db):
+    from main import app
+
+    async def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,105 @@
+import pytest
+
+from app.core.allergen_index import RestaurantAllergenIndex, allergen_indexes
+from app.dbs.allergen.model import Allergen
+from app.dbs.menu_item_allergen.mgmt import MenuItemAllergenMgmt
+from app.dbs.menu_item_allergen.model import ContaminationRisk, MenuItemAllergen
+from tests.test_menu_loader import seed_menu
+
+
+def test_index_masks():
+    index = RestaurantAllergenIndex()
+    index.set_allergen(1, "peanut", 5)
+    index.set_allergen(2, "gluten", 1)
+    index.set_link(10, 1, "contains")
+    index.set_link(11, 1, "may_contain")
+    index.set_link(12, 2, "may_contain")
+
+    peanut = index.mask_for(["peanut"])
+    gluten = index.mask_for([2])
+
+    assert not index.is_safe(10, peanut)
+    # Severe allergens also exclude cross-contact
+    assert not index.is_safe(11, peanut)
+    assert index.is_safe(12, gluten)
+    assert not index.is_safe(12, gluten, strict=True)
+    assert index.is_safe(13, peanut | gluten)
+
+    index.remove_link(10, 1)
+    assert index.is_safe(10, peanut)
+
+
+async def seed_allergens(db) -> tuple[int, list[int]]:
+    restaurant_id = await seed_menu(db, category_count=1, items_per_category=3)
+    peanut = Allergen(i18n_key="peanut", name="Peanut", severity_level=5)
+    shellfish = Allergen(i18n_key="shellfish", name="Shellfish", severity_level=5)
+    db.add_all([peanut, shellfish])
+    await db.commit()
+    return restaurant_id, [peanut.id, shellfish.id]
+
+
+async def menu_item_names(client, restaurant_id: int, query: str) -> list[str]:
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/menu?{query}")
+    assert response.status_code == 200
+    return [item["name"] for item in response.json()["categories"][0]["menu_items"]]
+
+
+@pytest.mark.anyio
+async def test_menu_excludes_allergens(client, db):
+    restaurant_id, (peanut_id, shellfish_id) = await seed_allergens(db)
+    menu = (await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")).json()
+    item_ids = [item["id"] for item in menu["categories"][0]["menu_items"]]
+    db.add_all([
+        MenuItemAllergen(menu_item_id=item_ids[0], allergen_id=peanut_id, contamination_risk=ContaminationRisk.contains),
+        MenuItemAllergen(menu_item_id=item_ids[1], allergen_id=shellfish_id, contamination_risk=ContaminationRisk.may_contain),
+    ])
+    await db.commit()
+
+    names = await menu_item_names(client, restaurant_id, "exclude_allergens=peanut,shellfish")
+    assert names == ["Item 0-2"]
+
+    names = await menu_item_names(client, restaurant_id, f"exclude_allergens={peanut_id}")
+    assert names == ["Item 0-1", "Item 0-2"]
+
+
+@pytest.mark.anyio
+async def test_link_writes_update_index_incrementally(client, db):
+    restaurant_id, (peanut_id, _) = await seed_allergens(db)
+    names = await menu_item_names(client, restaurant_id, "exclude_allergens=peanut")
+    assert names == ["Item 0-0", "Item 0-1", "Item 0-2"]
+    builds = allergen_indexes.builds
+
+    menu = (await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")).json()
+    item_id = menu["categories"][0]["menu_items"][2]["id"]
+    mgmt = MenuItemAllergenMgmt(db)
+    await mgmt.create({
+        "menu_item_id": item_id,
+        "allergen_id": peanut_id,
+        "contamination_risk": ContaminationRisk.contains,
+    })
+
+    names = await menu_item_names(client, restaurant_id, "exclude_allergens=peanut")
+    assert names == ["Item 0-0", "Item 0-1"]
+
+    await mgmt.delete(item_id, peanut_id)
+
+    names = await menu_item_names(client, restaurant_id, "exclude_allergens=peanut")
+    assert names == ["Item 0-0", "Item 0-1", "Item 0-2"]
+    assert allergen_indexes.builds == builds
+
+
+@pytest.mark.anyio
+async def test_restaurant_allergens_are_listed_once(client, db):
+    restaurant_id, (peanut_id, shellfish_id) = await seed_allergens(db)
+    menu = (await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")).json()
+    item_ids = [item["id"] for item in menu["categories"][0]["menu_items"]]
+    db.add_all([
+        MenuItemAllergen(menu_item_id=item_id, allergen_id=peanut_id, contamination_risk=ContaminationRisk.contains)
+        for item_id in item_ids
+    ])
+    await db.commit()
+
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/allergens")
+
+    assert response.status_code == 200
+    assert [allergen["i18n_key"] for allergen in response.json()] == ["peanut"]
@@ -0,0 +1,73 @@
+import pytest
+
+from app.core.menu_cache import menu_cache
+from app.dbs.allergen.mgmt import AllergenMgmt
+from app.dbs.base_mgmt import SoftDeleteMixin
+from app.dbs.category.mgmt import CategoryMgmt
+from app.dbs.customization_option.mgmt import CustomizationOptionMgmt
+from app.dbs.ingredient.mgmt import IngredientMgmt
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_writes_use_one_statement_each(db, query_counter):
+    mgmt = RestaurantMgmt(db)
+
+    # SQLite cannot return inserted rows in parameter order from one
+    # statement, so only the order is checked for inserts
+    restaurants = await mgmt.bulk_create([{"name": f"Restaurant {i}"} for i in range(20)])
+    assert [restaurant.name for restaurant in restaurants] == [f"Restaurant {i}" for i in range(20)]
+
+    ids = [restaurant.id for restaurant in restaurants]
+    query_counter.clear()
+    updated = await mgmt.bulk_update(ids[:10], {"description": "Updated"})
+    assert len(updated) == 10
+    assert all(restaurant.description == "Updated" for restaurant in updated)
+    assert len(query_counter) == 1
+
+    query_counter.clear()
+    assert await mgmt.bulk_soft_delete(ids[:5]) == 5
+    assert len(query_counter) == 1
+    assert len(await mgmt.get_all_active()) == 15
+
+
+def test_only_models_with_active_column_can_be_soft_deleted():
+    assert not hasattr(AllergenMgmt, "soft_delete")
+    for mgmt in (CategoryMgmt, CustomizationOptionMgmt, IngredientMgmt, MenuItemMgmt, RestaurantMgmt):
+        assert issubclass(mgmt, SoftDeleteMixin)
+        assert mgmt.active_column
+
+
+async def test_update_returns_current_values(db):
+    mgmt = RestaurantMgmt(db)
+    restaurant = await mgmt.create({"name": "Before"})
+
+    updated = await mgmt.update(restaurant.id, {"name": "After"})
+    assert updated.name == "After"
+
+    assert await mgmt.soft_delete(restaurant.id)
+    assert restaurant.deleted_at is not None
+    assert await mgmt.update(restaurant.id, {"name": "Deleted"}) is None
+    assert not await mgmt.soft_delete(restaurant.id)
+
+
+async def test_menu_cache_only_invalidated_on_commit(db):
+    restaurant = await RestaurantMgmt(db).create({"name": "Restaurant"})
+    other = await RestaurantMgmt(db).create({"name": "Other"})
+    mgmt = CategoryMgmt(db)
+    category = await mgmt.create({"restaurant_id": restaurant.id, "name": "Starters"})
+    restaurant_id, other_id, category_id = restaurant.id, other.id, category.id
+
+    version = menu_cache.version(restaurant_id)
+    await mgmt.update(category_id, {"name": "Mains"}, commit=False)
+    assert menu_cache.version(restaurant_id) == version
+    await db.rollback()
+    assert menu_cache.version(restaurant_id) == version
+
+    # Moving a category changes the menu of both restaurants
+    other_version = menu_cache.version(other_id)
+    await mgmt.update(category_id, {"restaurant_id": other_id})
+    assert menu_cache.version(restaurant_id) > version
+    assert menu_cache.version(other_id) > other_version
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.cli.datagen import OPENING_STOCK, DataShape, TABLES, generate, generate_batch
+from app.dbs.inventory_transaction.model import InventoryTransaction
+from app.dbs.order.model import Order
+from app.dbs.order_item.model import OrderItem
+
+pytestmark = pytest.mark.anyio
+
+SHAPE = DataShape(
+    restaurants=3,
+    tables_per_restaurant=2,
+    categories_per_restaurant=2,
+    items_per_category=3,
+    ingredients_per_restaurant=5,
+    qr_sessions_per_table=1,
+    orders=40,
+)
+
+
+async def test_generates_every_table_with_expected_counts(engine):
+    counts = await generate(engine, SHAPE, batch_size=16, workers=1)
+
+    assert list(counts) == [spec.name for spec in TABLES]
+    assert counts["menu_items"] == 18
+    assert counts["order_items"] == 120
+
+
+async def test_order_totals_match_their_items(engine, db):
+    await generate(engine, SHAPE, batch_size=16, workers=1)
+
+    item_totals = (
+        select(OrderItem.order_id, func.sum(OrderItem.total_price).label("total"))
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(Order.subtotal, item_totals.c.total).join(item_totals, item_totals.c.order_id == Order.id)
+    )).all()
+
+    assert len(rows) == SHAPE.orders
+    assert all(subtotal == total for subtotal, total in rows)
+
+
+async def test_ledger_quantities_chain_across_batches(engine, db):
+    await generate(engine, SHAPE, batch_size=16, workers=1, tables=["inventory_transactions"])
+
+    rows = (await db.execute(
+        select(
+            InventoryTransaction.ingredient_id,
+            InventoryTransaction.quantity_before,
+            InventoryTransaction.quantity_change,
+            InventoryTransaction.quantity_after
+        ).order_by(InventoryTransaction.id)
+    )).all()
+
+    stock = {}
+    for ingredient_id, before, change, after in rows:
+        assert before == stock.get(ingredient_id, OPENING_STOCK)
+        assert after == before + change
+        stock[ingredient_id] = after
+    assert len(rows) == SHAPE.order_items
+
+
+def test_batches_are_deterministic_and_independent():
+    spec = next(spec for spec in TABLES if spec.name == "orders")
+
+    whole = generate_batch(spec, SHAPE, range(0, 40))
+    parts = generate_batch(spec, SHAPE, range(20, 40)) + generate_batch(spec, SHAPE, range(0, 20))
+
+    assert sorted(parts, key=lambda row: row["id"]) == whole
+    assert generate_batch(spec, DataShape(**{**SHAPE.__dict__, "seed": 7}), range(0, 40)) != whole
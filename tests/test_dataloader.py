@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.core.dataloader import LoaderRegistry
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.services.restaurant_service import RestaurantService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_lookups_in_the_same_tick_are_batched(db, query_counter):
+    mgmt = RestaurantMgmt(db)
+    restaurants = await mgmt.bulk_create([{"name": f"Restaurant {i}"} for i in range(3)])
+    ids = [restaurant.id for restaurant in restaurants]
+
+    query_counter.clear()
+    loaded = await asyncio.gather(*(mgmt.get_by_id(restaurant_id) for restaurant_id in [*ids, ids[0], 999]))
+    assert [restaurant.id if restaurant else None for restaurant in loaded] == [*ids, ids[0], None]
+    assert len(query_counter) == 1
+
+    # Memoized for the rest of the request, including through the service
+    assert (await RestaurantService(db).get_restaurant_by_id(ids[1])).id == ids[1]
+    assert await mgmt.get_many(ids) == restaurants
+    assert len(query_counter) == 1
+
+
+async def test_loaders_of_a_session_never_run_concurrently():
+    registry = LoaderRegistry()
+    running = []
+    overlapped = False
+
+    def batch_fn(name):
+        async def load(keys):
+            nonlocal overlapped
+            overlapped = overlapped or bool(running)
+            running.append(name)
+            await asyncio.sleep(0)
+            running.remove(name)
+            return {key: (name, key) for key in keys}
+        return load
+
+    first, second = registry.get("first", batch_fn("first")), registry.get("second", batch_fn("second"))
+    loaded = await asyncio.gather(first.load(1), second.load(1), first.load(2))
+    assert loaded == [("first", 1), ("second", 1), ("first", 2)]
+    assert not overlapped
+    assert (first.batches, second.batches) == (1, 1)
+
+
+async def test_writes_clear_memoized_rows(db):
+    mgmt = RestaurantMgmt(db)
+    restaurant = await mgmt.create({"name": "Restaurant"})
+    restaurant_id = restaurant.id
+    assert await mgmt.get_by_id(restaurant_id) is restaurant
+
+    await mgmt.soft_delete(restaurant_id)
+    assert await mgmt.get_by_id(restaurant_id) is None
+
+
+async def test_menu_loads_restaurant_once(client, db, query_counter):
+    restaurant = await RestaurantMgmt(db).create({"name": "Restaurant"})
+
+    query_counter.clear()
+    response = await client.get(f"/api/v1/restaurants/{restaurant.id}/menu", params={"exclude_allergens": "1"})
+    assert response.status_code == 200
+    restaurant_selects = [
+        statement for statement in query_counter
+        if statement.lstrip().startswith("SELECT") and "FROM restaurants" in statement
+    ]
+    assert len(restaurant_selects) == 1
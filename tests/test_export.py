@@ -0,0 +1,130 @@
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.cli.export import export
+from app.services import export_service
+from app.services.export_service import ExportService
+from app.services.order_service import OrderService
+from tests.test_inventory import seed_recipes
+from tests.test_orders import seed_restaurant
+
+pytestmark = pytest.mark.anyio
+
+START = datetime.now(timezone.utc) - timedelta(days=1)
+END = datetime.now(timezone.utc) + timedelta(days=1)
+
+
+async def place_orders(db, ids: dict, count: int) -> list:
+    service = OrderService(db)
+    return [
+        await service.place_order(ids["restaurant"], ids["table"], [
+            {"menu_item_id": ids["ramen"], "quantity": 1, "choice_ids": [ids["regular"], ids["egg"]]},
+            {"menu_item_id": ids["gyoza"], "quantity": 2},
+        ])
+        for _ in range(count)
+    ]
+
+
+async def test_orders_export_as_csv(client, db):
+    ids = await seed_restaurant(db)
+    orders = await place_orders(db, ids, 3)
+
+    response = await client.get(
+        f"/api/v1/restaurants/{ids['restaurant']}/exports/orders",
+        params={"start": START.isoformat(), "end": END.isoformat()}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [order["id"] for order in orders]
+    assert Decimal(rows[0]["total_amount"]) == orders[0]["total_amount"]
+
+    items = await client.get(
+        f"/api/v1/restaurants/{ids['restaurant']}/exports/order_customizations",
+        params={"start": START.isoformat(), "end": END.isoformat()}
+    )
+    assert len(list(csv.DictReader(io.StringIO(items.text)))) == 3 * 2
+
+
+async def test_exports_are_encoded_batch_by_batch(db):
+    ids = await seed_restaurant(db)
+    await place_orders(db, ids, 2)
+    service = ExportService(db)
+
+    chunks = await service.export("order_items", ids["restaurant"], START, END, batch_size=3)
+    chunks = [chunk async for chunk in chunks]
+
+    # The header with the first batch, then the rest
+    assert [chunk.count(b"\n") for chunk in chunks] == [4, 1]
+    empty = await service.export("order_items", ids["restaurant"], START - timedelta(days=7), START)
+    assert [chunk async for chunk in empty] == [chunks[0].splitlines(keepends=True)[0]]
+
+
+async def test_ledger_export_is_scoped_to_the_restaurant(engine, db):
+    ids = await seed_restaurant(db)
+    await seed_recipes(db, ids)
+    await place_orders(db, ids, 2)
+
+    output = io.BytesIO()
+    written = await export(engine, "inventory_transactions", output, START, END, ids["restaurant"], batch_size=2)
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue().decode())))
+    assert written == len(output.getvalue())
+    assert [row["transaction_type"] for row in rows] == ["restock"] * 2 + ["order_consumption"] * 4
+
+    output = io.BytesIO()
+    await export(engine, "inventory_transactions", output, START, END, restaurant_id=ids["restaurant"] + 1)
+    assert output.getvalue().decode().splitlines() == [",".join(rows[0].keys())]
+
+
+@pytest.mark.parametrize("params, status_code", [
+    ({"start": END.isoformat(), "end": START.isoformat()}, 400),
+    ({"start": START.isoformat(), "format": "xlsx"}, 422),
+])
+async def test_invalid_exports_are_rejected(client, db, params, status_code):
+    ids = await seed_restaurant(db)
+
+    response = await client.get(f"/api/v1/restaurants/{ids['restaurant']}/exports/orders", params=params)
+
+    assert response.status_code == status_code
+    missing = await client.get("/api/v1/restaurants/999/exports/orders", params={"start": START.isoformat()})
+    assert missing.status_code == 404
+
+
+async def test_columnar_formats_need_pyarrow(client, db, monkeypatch):
+    ids = await seed_restaurant(db)
+    monkeypatch.setattr(export_service, "pyarrow", None)
+
+    response = await client.get(
+        f"/api/v1/restaurants/{ids['restaurant']}/exports/orders",
+        params={"start": START.isoformat(), "format": "parquet"}
+    )
+
+    assert response.status_code == 400
+    assert "pyarrow" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("export_format", ["arrow", "parquet"])
+async def test_columnar_exports_round_trip(db, export_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    ids = await seed_restaurant(db)
+    orders = await place_orders(db, ids, 5)
+
+    chunks = await ExportService(db).export("orders", ids["restaurant"], START, END, export_format, batch_size=2)
+    body = b"".join([chunk async for chunk in chunks])
+
+    if export_format == "arrow":
+        table = pyarrow.ipc.open_stream(body).read_all()
+    else:
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(body))
+    assert table.column("id").to_pylist() == [order["id"] for order in orders]
+    assert table.column("total_amount").to_pylist() == [order["total_amount"] for order in orders]
@@ -0,0 +1,202 @@
+import asyncio
+import os
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.cli.reconcile_stock import reconcile
+from app.configs.database import Base
+from app.configs.migrations import upgrade_to_head
+from app.dbs.ingredient.model import Ingredient
+from app.dbs.ingredient_stock.model import IngredientStock
+from app.dbs.inventory_transaction.model import InventoryTransaction, TransactionType
+from app.core.menu_cache import menu_cache
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.menu_item_recipe.model import MenuItemRecipe
+from app.dbs.order.model import Order
+from app.services.inventory_service import InventoryService, expand_recipes
+from app.services.order_service import OrderService
+from tests.test_orders import seed_restaurant
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_recipes(db, ids: dict) -> dict:
+    flour, pork, egg = (
+        Ingredient(restaurant_id=ids["restaurant"], name=name, unit="g") for name in ("Flour", "Pork", "Egg")
+    )
+    db.add_all([flour, pork, egg])
+    await db.flush()
+    db.add_all([
+        MenuItemRecipe(menu_item_id=ids["ramen"], ingredient_id=flour.id, quantity_needed=Decimal("120")),
+        MenuItemRecipe(menu_item_id=ids["ramen"], ingredient_id=pork.id, quantity_needed=Decimal("80")),
+        MenuItemRecipe(menu_item_id=ids["gyoza"], ingredient_id=flour.id, quantity_needed=Decimal("40")),
+        MenuItemRecipe(menu_item_id=ids["gyoza"], ingredient_id=pork.id, quantity_needed=Decimal("60")),
+    ])
+    await db.commit()
+
+    ingredients = {"flour": flour.id, "pork": pork.id, "egg": egg.id}
+    await InventoryService(db).move_stock(
+        {flour.id: Decimal("5000"), pork.id: Decimal("3000")}, TransactionType.restock
+    )
+    return ingredients
+
+
+def test_expand_recipes_aggregates_items_and_ingredients():
+    recipes = {1: [(10, Decimal("2")), (11, Decimal("1.5"))], 2: [(10, Decimal("3"))]}
+
+    usage = expand_recipes([(1, 2), (2, 1), (1, 1), (3, 4)], recipes)
+
+    assert usage == {10: Decimal("9"), 11: Decimal("4.5")}
+
+
+async def test_placing_an_order_deducts_its_ingredients(db, query_counter):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+
+    query_counter.clear()
+    order = await OrderService(db).place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["ramen"], "quantity": 2, "choice_ids": [ids["regular"]]},
+        {"menu_item_id": ids["gyoza"], "quantity": 3},
+    ])
+
+    ledger_inserts = [s for s in query_counter if s.startswith("INSERT INTO inventory_transactions")]
+    assert len(ledger_inserts) == 1
+
+    rows = (await db.execute(
+        select(InventoryTransaction)
+        .where(InventoryTransaction.order_id == order["id"])
+        .order_by(InventoryTransaction.ingredient_id)
+    )).scalars().all()
+    assert [(row.ingredient_id, row.quantity_change, row.quantity_before, row.quantity_after) for row in rows] == [
+        (ingredients["flour"], Decimal("-360"), Decimal("5000"), Decimal("4640")),
+        (ingredients["pork"], Decimal("-340"), Decimal("3000"), Decimal("2660")),
+    ]
+    assert all(row.transaction_type == TransactionType.order_consumption for row in rows)
+
+
+async def test_orders_are_consumed_once(db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    service = InventoryService(db)
+
+    order = await OrderService(db).place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["gyoza"], "quantity": 1}
+    ])
+
+    assert await service.consume_order(order["id"]) == []
+    stock = await service.get_stock([ingredients["flour"], ingredients["egg"]])
+    assert stock == {ingredients["flour"]: Decimal("4960"), ingredients["egg"]: Decimal("0")}
+
+
+async def test_critical_ingredients_drive_menu_availability(db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    await db.execute(
+        update(MenuItemRecipe)
+        .where(MenuItemRecipe.ingredient_id == ingredients["pork"])
+        .values(is_critical=True)
+    )
+    await db.commit()
+    service = InventoryService(db)
+
+    async def available():
+        result = await db.execute(
+            select(MenuItem.id, MenuItem.is_available).where(MenuItem.id.in_([ids["ramen"], ids["gyoza"]]))
+        )
+        return dict(result.all())
+
+    menu_cache.put(ids["restaurant"], "menu", {}, menu_cache.version(ids["restaurant"]))
+    # 70g of pork left: enough for gyoza (60g), not for ramen (80g)
+    await service.move_stock({ingredients["pork"]: Decimal("-2930")}, TransactionType.waste)
+    assert await available() == {ids["ramen"]: False, ids["gyoza"]: True}
+    assert menu_cache.get(ids["restaurant"], "menu") is None
+
+    # Other ingredients do not bring ramen back
+    await service.move_stock({ingredients["flour"]: Decimal("100")}, TransactionType.restock)
+    assert await available() == {ids["ramen"]: False, ids["gyoza"]: True}
+
+    await service.move_stock({ingredients["pork"]: Decimal("10")}, TransactionType.restock)
+    assert await available() == {ids["ramen"]: True, ids["gyoza"]: True}
+
+
+async def test_items_disabled_by_hand_are_not_restored(db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    await db.execute(update(MenuItemRecipe).values(is_critical=True))
+    await db.commit()
+    await MenuItemMgmt(db).update(ids["gyoza"], {"is_available": False})
+    service = InventoryService(db)
+
+    await service.move_stock({ingredients["pork"]: Decimal("-3000")}, TransactionType.waste)
+    await service.move_stock({ingredients["pork"]: Decimal("3000")}, TransactionType.restock)
+
+    result = await db.execute(select(MenuItem.id, MenuItem.is_available, MenuItem.out_of_stock).where(
+        MenuItem.id.in_([ids["ramen"], ids["gyoza"]])
+    ))
+    assert sorted(result.all()) == sorted([(ids["ramen"], True, False), (ids["gyoza"], False, False)])
+
+
+async def test_reconcile_restores_a_drifted_projection(engine, db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    service = InventoryService(db)
+    await db.execute(
+        update(IngredientStock)
+        .where(IngredientStock.ingredient_id == ingredients["pork"])
+        .values(quantity=Decimal("1"))
+    )
+    await db.commit()
+
+    drift = await reconcile(engine)
+    assert drift == [{"ingredient_id": ingredients["pork"], "projected": Decimal("1"), "ledger": Decimal("3000")}]
+
+    assert await reconcile(engine, fix=True, batch_size=1, workers=2) == drift
+    db.expire_all()
+    assert await service.get_stock([ingredients["pork"]]) == {ingredients["pork"]: Decimal("3000")}
+    assert await reconcile(engine) == []
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set")
+async def test_concurrent_orders_on_shared_ingredients():
+    engine = create_async_engine(os.environ["TEST_POSTGRES_URL"], pool_size=20, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    await upgrade_to_head(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        ids = await seed_restaurant(db)
+        ingredients = await seed_recipes(db, ids)
+
+    async def place(i: int):
+        # Alternate item order, so transactions see the ingredients in different orders
+        basket = [
+            {"menu_item_id": ids["gyoza"], "quantity": 1},
+            {"menu_item_id": ids["ramen"], "quantity": 1, "choice_ids": [ids["regular"]]},
+        ]
+        async with session_factory() as db:
+            await OrderService(db).place_order(ids["restaurant"], ids["table"], basket[::1 if i % 2 else -1])
+
+    await asyncio.gather(*(place(i) for i in range(200)))
+
+    async with session_factory() as db:
+        assert await db.scalar(select(text("count(*)")).select_from(Order)) == 200
+        stock = await InventoryService(db).get_stock([ingredients["flour"], ingredients["pork"]])
+        assert stock == {
+            ingredients["flour"]: Decimal("5000") - 200 * 160,
+            ingredients["pork"]: Decimal("3000") - 200 * 140,
+        }
+        for ingredient_id in (ingredients["flour"], ingredients["pork"]):
+            rows = (await db.execute(
+                select(InventoryTransaction.quantity_before, InventoryTransaction.quantity_after)
+                .where(InventoryTransaction.ingredient_id == ingredient_id)
+                .order_by(InventoryTransaction.id)
+            )).all()
+            assert all(previous.quantity_after == row.quantity_before for previous, row in zip(rows, rows[1:]))
+    await engine.dispose()
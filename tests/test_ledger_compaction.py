@@ -0,0 +1,131 @@
+import os
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.cli.reconcile_stock import reconcile
+from app.configs.database import Base
+from app.configs.migrations import upgrade_to_head
+from app.dbs.inventory_daily_summary.model import InventoryDailySummary
+from app.dbs.inventory_transaction.mgmt import InventoryTransactionMgmt
+from app.dbs.inventory_transaction.model import InventoryTransaction, TransactionType
+from app.services.inventory_service import InventoryService
+from app.services.ledger_compaction import LedgerCompactor
+from tests.test_inventory import seed_recipes
+from tests.test_orders import seed_restaurant
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2026, 6, 15, 12, tzinfo=timezone.utc)
+
+
+async def backdate(db, created_at: datetime) -> None:
+    """Move every ledger row written so far to `created_at`."""
+    await db.execute(
+        update(InventoryTransaction)
+        .where(InventoryTransaction.created_at > created_at)
+        .values(created_at=created_at)
+    )
+    await db.commit()
+
+
+async def summaries(db) -> list:
+    result = await db.execute(
+        select(
+            InventoryDailySummary.ingredient_id,
+            InventoryDailySummary.day,
+            InventoryDailySummary.consumption,
+            InventoryDailySummary.waste,
+            InventoryDailySummary.restock,
+            InventoryDailySummary.transaction_count,
+            InventoryDailySummary.quantity_after,
+        )
+        .order_by(InventoryDailySummary.ingredient_id, InventoryDailySummary.day)
+    )
+    return result.all()
+
+
+async def test_expired_rows_are_folded_into_daily_summaries(engine, db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    flour, pork = ingredients["flour"], ingredients["pork"]
+    service = InventoryService(db)
+    await service.move_stock({flour: Decimal("-100"), pork: Decimal("-20")}, TransactionType.waste)
+    await backdate(db, datetime(2026, 1, 10, 9, tzinfo=timezone.utc))
+    await service.move_stock({pork: Decimal("-30")}, TransactionType.waste)
+
+    stats = await LedgerCompactor(db).run(now=NOW, retention=timedelta(days=90))
+
+    assert stats["summaries_written"] == 2
+    assert stats["rows_deleted"] == 4
+    assert await summaries(db) == [
+        (flour, date(2026, 1, 10), 0, Decimal("-100"), Decimal("5000"), 2, Decimal("4900")),
+        (pork, date(2026, 1, 10), 0, Decimal("-20"), Decimal("3000"), 2, Decimal("2980")),
+    ]
+    remaining = (await db.execute(select(InventoryTransaction.ingredient_id))).scalars().all()
+    assert remaining == [pork]
+    # Flour only has its summary left, which still matches the stock
+    assert await reconcile(engine) == []
+
+
+async def test_compacting_a_day_twice_merges_the_totals(db):
+    ids = await seed_restaurant(db)
+    ingredients = await seed_recipes(db, ids)
+    flour = ingredients["flour"]
+    service = InventoryService(db)
+    compactor = LedgerCompactor(db)
+    day = datetime(2026, 1, 10, 9, tzinfo=timezone.utc)
+
+    await backdate(db, day)
+    await compactor.run(now=NOW, retention=timedelta(days=90))
+    # A row recorded late for an already compacted day
+    await service.move_stock({flour: Decimal("-40")}, TransactionType.waste)
+    await backdate(db, day + timedelta(hours=1))
+    await compactor.run(now=NOW, retention=timedelta(days=90))
+
+    assert (await summaries(db))[0] == (
+        flour, date(2026, 1, 10), 0, Decimal("-40"), Decimal("5000"), 2, Decimal("4960")
+    )
+    assert (await db.execute(select(InventoryTransaction.id))).first() is None
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set")
+async def test_expired_partitions_are_summarized_and_dropped():
+    engine = create_async_engine(os.environ["TEST_POSTGRES_URL"])
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    await upgrade_to_head(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        ledger = InventoryTransactionMgmt(db)
+        assert await ledger.is_partitioned()
+
+        ids = await seed_restaurant(db)
+        ingredients = await seed_recipes(db, ids)
+        now = datetime.now(timezone.utc)
+        # Lands in the default partition, since its month has no partition
+        await backdate(db, now - timedelta(days=400))
+
+        stats = await LedgerCompactor(db).run(now=now, retention=timedelta(days=90))
+        assert stats["rows_deleted"] == 2
+        assert len(await summaries(db)) == 2
+
+        # A month created now covers rows the default partition caught
+        await InventoryService(db).move_stock({ingredients["flour"]: Decimal("1")}, TransactionType.restock)
+        await backdate(db, now - timedelta(days=150))
+        month = (now - timedelta(days=150)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        name = await ledger.create_partition(month)
+        await db.commit()
+        assert (await db.execute(text(f"SELECT count(*) FROM {name}"))).scalar() == 1
+
+        stats = await LedgerCompactor(db).run(now=now, retention=timedelta(days=90))
+        assert stats["partitions_dropped"] == [name]
+        assert name not in (await ledger.get_partitions()).values()
+        assert await reconcile(engine) == []
+    await engine.dispose()
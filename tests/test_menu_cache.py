@@ -0,0 +1,64 @@
+import pytest
+
+from app.core.menu_cache import MenuCache, menu_cache
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.services.restaurant_service import RestaurantService
+from tests.test_menu_loader import seed_menu
+
+
+def test_put_rejects_values_loaded_before_invalidation():
+    cache = MenuCache()
+    version = cache.version(1)
+
+    cache.invalidate(1)
+
+    assert cache.put(1, "menu", {"stale": True}, version) is False
+    assert cache.get(1, "menu") is None
+    assert cache.version(1) > version
+
+
+def test_lru_eviction_by_entries_and_weight():
+    cache = MenuCache(max_entries=2, max_weight=10)
+    cache.put(1, "menu", "one", cache.version(1), weight=4)
+    cache.put(2, "menu", "two", cache.version(2), weight=4)
+    assert cache.get(1, "menu") == "one"
+
+    cache.put(3, "menu", "three", cache.version(3), weight=4)
+
+    assert cache.get(2, "menu") is None
+    assert cache.get(1, "menu") == "one"
+    assert cache.get(3, "menu") == "three"
+
+    cache.put(4, "menu", "four", cache.version(4), weight=8)
+
+    assert cache.get(1, "menu") is None
+    assert cache.get(3, "menu") is None
+    assert cache.stats()["evictions"] == 3
+    assert cache.stats()["weight"] == 8
+
+
+def test_invalidate_all_bumps_every_version():
+    cache = MenuCache()
+    version = cache.version(7)
+
+    cache.invalidate_all()
+
+    assert cache.put(7, "menu", "stale", version) is False
+
+
+@pytest.mark.anyio
+async def test_menu_write_invalidates_cached_menu(db, query_counter):
+    restaurant_id = await seed_menu(db, category_count=1, items_per_category=1)
+    service = RestaurantService(db)
+
+    menu = await service.get_restaurant_menu(restaurant_id)
+    query_counter.clear()
+    assert await service.get_restaurant_menu(restaurant_id) is menu
+    assert query_counter == []
+
+    item_id = menu["categories"][0]["menu_items"][0]["id"]
+    await MenuItemMgmt(db).update(item_id, {"name": "Renamed"})
+
+    menu = await service.get_restaurant_menu(restaurant_id)
+    assert menu["categories"][0]["menu_items"][0]["name"] == "Renamed"
+    assert menu_cache.stats()["invalidations"] >= 1
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.dbs.category.model import Category
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.menu_item.model import MenuItem
+from tests.test_menu_loader import seed_menu
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_old_menu(db) -> int:
+    restaurant_id = await seed_menu(db, category_count=1, items_per_category=2)
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    for model in (Category, MenuItem):
+        await db.execute(
+            update(model)
+            .where(model.restaurant_id == restaurant_id)
+            .values(created_at=an_hour_ago, updated_at=None)
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    return restaurant_id
+
+
+async def get_changes(client, restaurant_id: int, since: int) -> dict:
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/menu/changes?since={since}")
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_changes_since_version(client, db):
+    restaurant_id = await seed_old_menu(db)
+
+    resync = await get_changes(client, restaurant_id, 0)
+    assert resync["full_resync"] is True
+    assert resync["version"] > 0
+
+    unchanged = await get_changes(client, restaurant_id, resync["version"])
+    assert unchanged["full_resync"] is False
+    assert unchanged["menu_items"] == {"added": [], "changed": [], "removed": []}
+
+    menu = (await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")).json()
+    category_id = menu["categories"][0]["id"]
+    removed_id = menu["categories"][0]["menu_items"][0]["id"]
+    mgmt = MenuItemMgmt(db)
+    await mgmt.soft_delete(removed_id)
+    created = await mgmt.create({
+        "restaurant_id": restaurant_id,
+        "category_id": category_id,
+        "name": "Special",
+        "price": 12,
+    })
+
+    changes = await get_changes(client, restaurant_id, resync["version"])
+    assert changes["full_resync"] is False
+    assert changes["version"] > resync["version"]
+    assert changes["menu_items"]["removed"] == [removed_id]
+    assert [item["id"] for item in changes["menu_items"]["added"]] == [created.id]
+    # The categories were last changed at `since` itself, so they fall in the
+    # overlap window and are re-sent: as changed, or removed for the hidden one
+    assert changes["categories"]["added"] == []
+    assert [category["id"] for category in changes["categories"]["changed"]] == [category_id]
+    assert len(changes["categories"]["removed"]) == 1
+
+
+async def test_repeated_poll_skips_database(client, db, query_counter):
+    restaurant_id = await seed_old_menu(db)
+    version = (await get_changes(client, restaurant_id, 0))["version"]
+    await get_changes(client, restaurant_id, version)
+
+    query_counter.clear()
+    changes = await get_changes(client, restaurant_id, version)
+
+    assert changes["version"] == version
+    assert query_counter == []
+
+
+async def test_stale_version_requires_full_resync(client, db):
+    restaurant_id = await seed_old_menu(db)
+    a_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    since = int(a_month_ago.timestamp() * 1_000_000)
+
+    changes = await get_changes(client, restaurant_id, since)
+
+    assert changes["full_resync"] is True
@@ -0,0 +1,66 @@
+import pytest
+
+from app.dbs.category.mgmt import CategoryMgmt
+from tests.test_menu_loader import seed_menu
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_menu_revalidation_skips_database(client, db, query_counter):
+    restaurant_id = await seed_menu(db, category_count=2)
+
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.json()["restaurant_id"] == restaurant_id
+
+    query_counter.clear()
+    response = await client.get(
+        f"/api/v1/restaurants/{restaurant_id}/menu",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert query_counter == []
+
+
+async def test_menu_serves_precompressed_variant(client, db):
+    restaurant_id = await seed_menu(db, category_count=2)
+    identity = await client.get(
+        f"/api/v1/restaurants/{restaurant_id}/menu",
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in identity.headers
+
+    response = await client.get(
+        f"/api/v1/restaurants/{restaurant_id}/menu",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] != identity.headers["etag"]
+    # httpx transparently decodes the gzip body
+    assert response.json() == identity.json()
+
+
+async def test_menu_write_changes_etag(client, db):
+    restaurant_id = await seed_menu(db, category_count=2)
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")
+    etag = response.headers["etag"]
+    category_id = response.json()["categories"][0]["id"]
+
+    await CategoryMgmt(db).update(category_id, {"name": "Renamed"})
+
+    response = await client.get(
+        f"/api/v1/restaurants/{restaurant_id}/menu",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["categories"][0]["name"] == "Renamed"
+
+
+async def test_menu_for_unknown_restaurant(client):
+    response = await client.get("/api/v1/restaurants/999/menu")
+    assert response.status_code == 404
@@ -0,0 +1,75 @@
+import pytest
+
+from app.dbs.category.model import Category
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.restaurant.model import Restaurant
+from app.services.restaurant_service import RestaurantService
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_menu(db, category_count: int, items_per_category: int = 3) -> int:
+    restaurant = Restaurant(name="Bistro")
+    db.add(restaurant)
+    await db.flush()
+
+    for c in range(category_count):
+        category = Category(restaurant_id=restaurant.id, name=f"Category {c}", sort_order=c)
+        db.add(category)
+        await db.flush()
+        for i in range(items_per_category):
+            db.add(MenuItem(
+                restaurant_id=restaurant.id,
+                category_id=category.id,
+                name=f"Item {c}-{i}",
+                price=10 + i,
+                sort_order=i,
+            ))
+
+    # One inactive category and one unavailable item that must not show up
+    hidden = Category(restaurant_id=restaurant.id, name="Hidden", is_active=False)
+    db.add(hidden)
+    await db.flush()
+    db.add(MenuItem(
+        restaurant_id=restaurant.id,
+        category_id=hidden.id,
+        name="Hidden item",
+        price=1,
+    ))
+
+    await db.commit()
+    return restaurant.id
+
+
+async def count_menu_queries(db, query_counter, restaurant_id: int) -> tuple[dict, int]:
+    query_counter.clear()
+    menu = await RestaurantService(db).get_restaurant_menu(restaurant_id)
+    return menu, len(query_counter)
+
+
+async def test_menu_query_count_is_constant(db, query_counter):
+    small_id = await seed_menu(db, category_count=2)
+    large_id = await seed_menu(db, category_count=40)
+
+    small_menu, small_queries = await count_menu_queries(db, query_counter, small_id)
+    large_menu, large_queries = await count_menu_queries(db, query_counter, large_id)
+
+    assert len(small_menu["categories"]) == 2
+    assert len(large_menu["categories"]) == 40
+    assert small_queries == large_queries
+    assert large_queries <= 2
+
+
+async def test_menu_groups_items_by_category(db):
+    restaurant_id = await seed_menu(db, category_count=3, items_per_category=2)
+
+    menu = await RestaurantService(db).get_restaurant_menu(restaurant_id)
+
+    assert menu["restaurant_name"] == "Bistro"
+    assert [c["name"] for c in menu["categories"]] == ["Category 0", "Category 1", "Category 2"]
+    for index, category in enumerate(menu["categories"]):
+        assert [item["name"] for item in category["menu_items"]] == [f"Item {index}-0", f"Item {index}-1"]
+
+
+async def test_menu_for_unknown_restaurant(db):
+    assert await RestaurantService(db).get_restaurant_menu(12345) is None
@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.metrics import Histogram, metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0), (("route", "/menu"),))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert list(histogram.render("latency", (("route", "/menu"),))) == [
+        'latency_bucket{route="/menu",le="0.1"} 2',
+        'latency_bucket{route="/menu",le="1.0"} 3',
+        'latency_bucket{route="/menu",le="+Inf"} 4',
+        'latency_sum{route="/menu"} 5.65',
+        'latency_count{route="/menu"} 4',
+    ]
+
+
+async def test_metrics_endpoint(client, db):
+    response = await client.get("/api/v1/restaurants/12345")
+    assert response.status_code == 404
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/restaurants/{restaurant_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/restaurants/{restaurant_id}"}' in body
+    assert "http_requests_in_flight 1" in body
+    assert 'cache_hit_ratio{cache="menu"}' in body
+    assert 'db_pool_checked_out{engine="primary"}' in body
+    assert "event_loop_lag_seconds_count" in body
+    assert "# TYPE feed_subscribers gauge" in body
+
+
+async def test_unknown_paths_share_one_series(client):
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+
+    body = metrics.render()
+    assert "/no/such/path" not in body
+    assert 'route="<unmatched>"' in body
@@ -0,0 +1,286 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.configs import database
+from app.core.event_stream import sse_events
+from app.core.pubsub import RESYNC, Broker, BrokerBackend, broker
+from app.dbs.qr_session.mgmt import QRSessionMgmt
+from app.dbs.qr_session.model import QRSession
+from app.dbs.table.model import Table
+from app.services.order_feed import OrderFeedService, restaurant_channel, table_channel
+from app.services.order_service import InvalidOrderError, OrderService
+from tests.test_orders import seed_restaurant
+
+pytestmark = pytest.mark.anyio
+
+
+async def drain(subscription) -> list:
+    """Read the events a subscription has pending without waiting for more."""
+    events = []
+    while subscription._pending or subscription.missed:
+        event = await subscription.get()
+        events.append((event.type, event.data))
+    return events
+
+
+async def test_slow_subscribers_get_coalesced_and_bounded_queues():
+    local = Broker()
+    fast = local.subscribe("kitchen")
+    slow = local.subscribe("kitchen", queue_size=3)
+
+    local.publish("kitchen", "order.created", {"id": 1, "status": "pending"}, key=("order", 1))
+    assert (await fast.get()).data == {"id": 1, "status": "pending"}
+    local.publish("kitchen", "order.updated", {"id": 1, "status": "completed"}, key=("order", 1))
+    for order_id in (2, 3, 4):
+        local.publish("kitchen", "order.created", {"id": order_id}, key=("order", order_id))
+
+    # Order 1 was replaced by its update, then dropped to make room for order 4
+    assert await drain(slow) == [
+        (RESYNC, {"missed": 1}),
+        ("order.created", {"id": 2}),
+        ("order.created", {"id": 3}),
+        ("order.created", {"id": 4}),
+    ]
+    assert [data for _, data in await drain(fast)] == [
+        {"id": 1, "status": "completed"}, {"id": 2}, {"id": 3}, {"id": 4}
+    ]
+    assert local.stats()["coalesced"] == 1 and local.stats()["dropped"] == 1
+
+    async with fast:
+        slow.close()
+    assert local.stats()["subscribers"] == 0
+    assert await slow.get() is None
+
+
+def test_backends_must_implement_publish():
+    class Incomplete(BrokerBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_subscriptions_expire_and_close_on_events():
+    local = Broker()
+    expiring = local.subscribe("kitchen", expires_in=0.01)
+
+    local.publish("kitchen", "order.created", {"id": 1})
+    assert (await expiring.get()).data == {"id": 1}
+    await asyncio.sleep(0.02)
+    local.publish("kitchen", "order.created", {"id": 2})
+    # Events still pending when the subscription expires are not delivered
+    assert await expiring.get() is None
+
+    closing = local.subscribe("kitchen", "session", close_on={"session.closed"})
+    local.publish("kitchen", "order.created", {"id": 3})
+    local.publish("session", "session.closed", {})
+    local.publish("kitchen", "order.created", {"id": 4})
+    assert [event.type for event in (await closing.get(), await closing.get())] == ["order.created", "session.closed"]
+    assert await closing.get() is None
+    assert local.stats()["subscribers"] == 0
+
+
+async def test_sse_frames_and_heartbeats():
+    local = Broker()
+    subscription = local.subscribe("kitchen")
+    frames = sse_events(subscription, heartbeat=0.01)
+
+    assert (await anext(frames)).startswith("retry:")
+    assert await anext(frames) == ": keepalive\n\n"
+    event = local.publish("kitchen", "order.created", {"id": 7})
+    frame = await anext(frames)
+    assert frame.startswith(f"id: {event.id}\nevent: order.created\ndata: ")
+    assert json.loads(frame.split("data: ", 1)[1])["data"] == {"id": 7}
+
+    await frames.aclose()
+    assert local.subscribers("kitchen") == 0
+
+
+async def test_order_changes_reach_the_kitchen_and_the_table(db):
+    ids = await seed_restaurant(db)
+    service = OrderService(db)
+    kitchen = broker.subscribe(restaurant_channel(ids["restaurant"]))
+    table = broker.subscribe(table_channel(ids["table"]))
+
+    try:
+        with pytest.raises(InvalidOrderError):
+            await service.place_order(ids["restaurant"], ids["table"], [
+                {"menu_item_id": ids["sold_out"], "quantity": 1}
+            ])
+        order = await service.place_order(ids["restaurant"], ids["table"], [
+            {"menu_item_id": ids["gyoza"], "quantity": 2}
+        ])
+        assert await drain(kitchen) == [("order.created", order)]
+
+        order_item_id = order["items"][0]["order_item_id"]
+        await service.update_item_status(order["id"], order_item_id, "preparing")
+        # Unchanged statuses are not published again
+        await service.update_item_status(order["id"], order_item_id, "preparing")
+        assert await drain(kitchen) == [("order_item.updated", {
+            "order_id": order["id"], "order_item_id": order_item_id, "item_id": ids["gyoza"], "status": "preparing"
+        })]
+
+        completed = await service.complete_order(order["id"])
+        assert completed["items"][0]["status"] == "preparing"
+        assert await drain(kitchen) == [("order.updated", completed)]
+
+        # The table did not read in between: it gets the latest state of the order
+        assert [event_type for event_type, _ in await drain(table)] == ["order_item.updated", "order.updated"]
+    finally:
+        kitchen.close()
+        table.close()
+
+
+async def test_item_status_endpoint(client, db):
+    ids = await seed_restaurant(db)
+    order = await OrderService(db).place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["gyoza"], "quantity": 1}
+    ])
+    path = f"/api/v1/orders/{order['id']}/items/{order['items'][0]['order_item_id']}"
+
+    response = await client.patch(path, json={"status": "ready"})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["status"] == "ready"
+
+    assert (await client.patch(path, json={"status": "burnt"})).status_code == 422
+    assert (await client.patch(f"/api/v1/orders/{order['id']}/items/999", json={"status": "ready"})).status_code == 404
+    await OrderService(db).complete_order(order["id"])
+    assert (await client.patch(path, json={"status": "served"})).status_code == 400
+
+
+async def open_websocket(app, path: str, query: str):
+    """Connect to a WebSocket route of an ASGI app; returns the client's inbox, outbox and the app task."""
+    inbox, outbox = asyncio.Queue(), asyncio.Queue()
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+        "subprotocols": [],
+    }
+    await outbox.put({"type": "websocket.connect"})
+    task = asyncio.ensure_future(app(scope, outbox.get, inbox.put))
+    return inbox, outbox, task
+
+
+async def test_guests_follow_their_table_over_a_websocket(client, db):
+    from main import app
+
+    ids = await seed_restaurant(db)
+    now = datetime.now(timezone.utc)
+    neighbour = Table(restaurant_id=ids["restaurant"], name="T2")
+    db.add_all([
+        neighbour,
+        QRSession(table_id=ids["table"], session_token="guest", status="active", expires_at=now + timedelta(hours=1)),
+        QRSession(table_id=ids["table"], session_token="gone", status="active", expires_at=now - timedelta(hours=1)),
+    ])
+    await db.commit()
+
+    inbox, outbox, task = await open_websocket(app, "/api/v1/orders/ws", "session_token=gone")
+    assert (await asyncio.wait_for(inbox.get(), 1))["type"] == "websocket.close"
+    await asyncio.wait_for(task, 1)
+
+    inbox, outbox, task = await open_websocket(app, "/api/v1/orders/ws", "session_token=guest")
+    assert (await asyncio.wait_for(inbox.get(), 1))["type"] == "websocket.accept"
+    await OrderService(db).place_order(ids["restaurant"], neighbour.id, [
+        {"menu_item_id": ids["gyoza"], "quantity": 1}
+    ])
+    order = await OrderService(db).place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["gyoza"], "quantity": 1}
+    ])
+
+    message = await asyncio.wait_for(inbox.get(), 1)
+    event = json.loads(message["text"])
+    assert event["type"] == "order.created"
+    assert event["data"]["id"] == order["id"]
+    assert inbox.empty()
+
+    await outbox.put({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(task, 1)
+    assert broker.subscribers(table_channel(ids["table"])) == 0
+
+
+async def test_table_feed_ends_with_the_qr_session(db):
+    ids = await seed_restaurant(db)
+    now = datetime.now(timezone.utc)
+    guest = QRSession(table_id=ids["table"], session_token="guest", status="active", expires_at=now + timedelta(hours=1))
+    leaving = QRSession(table_id=ids["table"], session_token="leaving", status="active", expires_at=now + timedelta(seconds=0.2))
+    db.add_all([guest, leaving])
+    await db.commit()
+    service = OrderFeedService(db)
+
+    subscription = await service.subscribe_table("guest")
+    await QRSessionMgmt(db).update(guest.id, {"status": "closed"})
+    await OrderService(db).place_order(ids["restaurant"], ids["table"], [{"menu_item_id": ids["gyoza"], "quantity": 1}])
+    assert [event_type for event_type, _ in await drain(subscription)] == ["session.closed"]
+    assert await subscription.get() is None
+
+    subscription = await service.subscribe_table("leaving")
+    await asyncio.sleep(0.3)
+    await OrderService(db).place_order(ids["restaurant"], ids["table"], [{"menu_item_id": ids["gyoza"], "quantity": 1}])
+    assert await asyncio.wait_for(subscription.get(), 1) is None
+    assert broker.subscribers(table_channel(ids["table"])) == 0
+
+
+async def test_kitchen_websocket_resolves_the_real_read_session(engine, db, monkeypatch):
+    from main import app
+
+    ids = await seed_restaurant(db)
+    # No dependency override: get_read_db itself must resolve on a WebSocket
+    assert not app.dependency_overrides
+    monkeypatch.setattr(database, "async_session", sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+
+    inbox, outbox, task = await open_websocket(app, f"/api/v1/restaurants/{ids['restaurant']}/orders/ws", "")
+    assert (await asyncio.wait_for(inbox.get(), 1))["type"] == "websocket.accept"
+    order = await OrderService(db).place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["gyoza"], "quantity": 1}
+    ])
+    event = json.loads((await asyncio.wait_for(inbox.get(), 1))["text"])
+    assert event["data"]["id"] == order["id"]
+
+    await outbox.put({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(task, 1)
+
+
+async def test_kitchen_events_release_the_read_session(client, db):
+    from main import app
+
+    ids = await seed_restaurant(db)
+    path = f"/api/v1/restaurants/{ids['restaurant']}/orders/events"
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    disconnected = asyncio.Event()
+    sent = asyncio.Queue()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    task = asyncio.ensure_future(app(scope, receive, sent.put))
+    assert (await asyncio.wait_for(sent.get(), 1))["status"] == 200
+    assert (await asyncio.wait_for(sent.get(), 1))["body"].startswith(b"retry:")
+
+    # The stream is open, but its session no longer holds a transaction
+    assert not db.in_transaction()
+    disconnected.set()
+    await asyncio.wait_for(task, 1)
+
+
+async def test_kitchen_feed_of_unknown_restaurant(client):
+    response = await client.get("/api/v1/restaurants/999/orders/events")
+
+    assert response.status_code == 404
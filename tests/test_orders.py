@@ -0,0 +1,171 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.dbs.category.model import Category
+from app.dbs.customization_choice.model import CustomizationChoice
+from app.dbs.customization_option.model import CustomizationOption
+from app.dbs.menu_item.model import MenuItem
+from app.dbs.menu_item.mgmt import MenuItemMgmt
+from app.dbs.order.model import Order
+from app.dbs.order_customization.model import OrderCustomization
+from app.dbs.order_item.model import OrderItem
+from app.dbs.restaurant.model import Restaurant
+from app.dbs.table.model import Table
+from app.services.order_service import InvalidOrderError, OrderService
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_restaurant(db) -> dict:
+    restaurant = Restaurant(name="Noodle Bar")
+    other = Restaurant(name="Other")
+    db.add_all([restaurant, other])
+    await db.flush()
+
+    table = Table(restaurant_id=restaurant.id, name="T1")
+    other_table = Table(restaurant_id=other.id, name="T1")
+    category = Category(restaurant_id=restaurant.id, name="Noodles")
+    db.add_all([table, other_table, category])
+    await db.flush()
+
+    ramen = MenuItem(restaurant_id=restaurant.id, category_id=category.id, name="Ramen", price=Decimal("12.50"))
+    gyoza = MenuItem(restaurant_id=restaurant.id, category_id=category.id, name="Gyoza", price=Decimal("6.00"))
+    sold_out = MenuItem(
+        restaurant_id=restaurant.id, category_id=category.id, name="Special", price=Decimal("20.00"), is_available=False
+    )
+    db.add_all([ramen, gyoza, sold_out])
+    await db.flush()
+
+    size = CustomizationOption(item_id=ramen.id, name="Size", type="single", is_required=True)
+    toppings = CustomizationOption(item_id=ramen.id, name="Toppings", type="multiple", max_selections=2)
+    db.add_all([size, toppings])
+    await db.flush()
+
+    regular = CustomizationChoice(option_id=size.id, name="Regular", price_modifier=Decimal("0"))
+    large = CustomizationChoice(option_id=size.id, name="Large", price_modifier=Decimal("2.00"))
+    egg = CustomizationChoice(option_id=toppings.id, name="Egg", price_modifier=Decimal("1.25"))
+    corn = CustomizationChoice(option_id=toppings.id, name="Corn", price_modifier=Decimal("0.75"))
+    nori = CustomizationChoice(option_id=toppings.id, name="Nori", price_modifier=Decimal("0.50"))
+    db.add_all([regular, large, egg, corn, nori])
+    await db.commit()
+
+    return {
+        "restaurant": restaurant.id,
+        "table": table.id,
+        "other_table": other_table.id,
+        "ramen": ramen.id,
+        "gyoza": gyoza.id,
+        "sold_out": sold_out.id,
+        "regular": regular.id,
+        "large": large.id,
+        "egg": egg.id,
+        "corn": corn.id,
+        "nori": nori.id,
+    }
+
+
+async def test_place_order_prices_on_the_server(client, db):
+    ids = await seed_restaurant(db)
+
+    response = await client.post("/api/v1/orders/", json={
+        "restaurant_id": ids["restaurant"],
+        "table_id": ids["table"],
+        "items": [
+            {"menu_item_id": ids["ramen"], "quantity": 2, "choice_ids": [ids["large"], ids["egg"]]},
+            {"menu_item_id": ids["gyoza"], "quantity": 1},
+        ],
+    })
+
+    assert response.status_code == 201
+    order = response.json()
+    ramen, gyoza = order["items"]
+    assert Decimal(ramen["unit_price"]) == Decimal("15.75")
+    assert Decimal(ramen["total_price"]) == Decimal("31.50")
+    assert [c["choice_id"] for c in ramen["customizations"]] == [ids["large"], ids["egg"]]
+    assert Decimal(gyoza["total_price"]) == Decimal("6.00")
+    assert Decimal(order["subtotal"]) == Decimal("37.50")
+    assert Decimal(order["service_charge"]) == Decimal("3.75")
+    assert Decimal(order["total_amount"]) == Decimal("41.25")
+
+    fetched = await client.get(f"/api/v1/orders/{order['id']}")
+    assert fetched.json() == order
+
+
+@pytest.mark.parametrize("item, message", [
+    ({"menu_item": "sold_out", "choices": []}, "not available"),
+    ({"menu_item": "ramen", "choices": []}, "is required"),
+    ({"menu_item": "ramen", "choices": ["regular", "large"]}, "Too many choices"),
+    ({"menu_item": "ramen", "choices": ["regular", "egg", "corn", "nori"]}, "Too many choices"),
+    ({"menu_item": "gyoza", "choices": ["egg"]}, "does not apply"),
+])
+async def test_invalid_items_are_rejected(client, db, item, message):
+    ids = await seed_restaurant(db)
+
+    response = await client.post("/api/v1/orders/", json={
+        "restaurant_id": ids["restaurant"],
+        "table_id": ids["table"],
+        "items": [{"menu_item_id": ids[item["menu_item"]], "choice_ids": [ids[c] for c in item["choices"]]}],
+    })
+
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
+    assert await db.scalar(select(func.count()).select_from(Order)) == 0
+
+
+async def test_tables_of_other_restaurants_are_rejected(db):
+    ids = await seed_restaurant(db)
+
+    with pytest.raises(InvalidOrderError, match="does not belong"):
+        await OrderService(db).place_order(ids["restaurant"], ids["other_table"], [
+            {"menu_item_id": ids["gyoza"], "quantity": 1}
+        ])
+
+
+async def test_prices_follow_menu_writes(db):
+    ids = await seed_restaurant(db)
+    service = OrderService(db)
+    basket = [{"menu_item_id": ids["gyoza"], "quantity": 1}]
+
+    first = await service.place_order(ids["restaurant"], ids["table"], basket)
+    await MenuItemMgmt(db).update(ids["gyoza"], {"price": Decimal("7.00")})
+    second = await service.place_order(ids["restaurant"], ids["table"], basket)
+
+    assert first["subtotal"] == Decimal("6.00")
+    assert second["subtotal"] == Decimal("7.00")
+
+
+async def test_price_book_is_loaded_on_its_own_session(db):
+    ids = await seed_restaurant(db)
+
+    book = await OrderService(db).get_price_book(ids["restaurant"])
+
+    assert book is not None
+    # The shared load did not open a transaction on the order's session
+    assert not db.in_transaction()
+
+
+async def test_reads_do_not_grow_with_basket_size(db, query_counter):
+    ids = await seed_restaurant(db)
+    service = OrderService(db)
+    ramen = {"menu_item_id": ids["ramen"], "quantity": 1, "choice_ids": [ids["regular"], ids["egg"]]}
+
+    # Warm the price book, then compare a small and a large basket
+    await service.place_order(ids["restaurant"], ids["table"], [ramen])
+
+    def reads():
+        return [s for s in query_counter if not s.lstrip().upper().startswith("INSERT")]
+
+    query_counter.clear()
+    await service.place_order(ids["restaurant"], ids["table"], [ramen])
+    small = len(reads())
+
+    query_counter.clear()
+    order = await service.place_order(ids["restaurant"], ids["table"], [ramen] * 40)
+    assert len(reads()) == small
+    assert len(order["items"]) == 40
+
+    count = await db.scalar(select(func.count()).select_from(OrderCustomization))
+    assert count == 2 * 42
+    assert await db.scalar(select(func.count()).select_from(OrderItem)) == 42
@@ -0,0 +1,65 @@
+import pytest
+
+from app.dbs.order.mgmt import OrderMgmt
+from app.dbs.order.model import Order
+from app.dbs.pagination import encode_cursor
+from app.dbs.restaurant.model import Restaurant
+from app.dbs.table.model import Table
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_restaurants(db, count: int) -> list[int]:
+    restaurants = [Restaurant(name=f"Restaurant {i}", is_active=i % 5 != 0) for i in range(count)]
+    db.add_all(restaurants)
+    await db.commit()
+    return [restaurant.id for restaurant in restaurants if restaurant.is_active]
+
+
+async def test_restaurants_are_paginated_by_cursor(client, db):
+    active_ids = await seed_restaurants(db, 25)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/restaurants/", params=params)
+        assert response.status_code == 200
+        seen += [restaurant["id"] for restaurant in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == active_ids
+    assert pages == 3
+
+
+async def test_invalid_cursor(client):
+    response = await client.get("/api/v1/restaurants/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    for values in (["1"], [True], [1.5], [None]):
+        response = await client.get("/api/v1/restaurants/", params={"cursor": encode_cursor(values)})
+        assert response.status_code == 400
+
+
+async def test_stream_all_active(db):
+    restaurant = Restaurant(name="Bistro")
+    db.add(restaurant)
+    await db.flush()
+    table = Table(restaurant_id=restaurant.id, name="T1")
+    db.add(table)
+    await db.flush()
+    db.add_all([
+        Order(restaurant_id=restaurant.id, table_id=table.id, subtotal=i, total_amount=i)
+        for i in range(30)
+    ])
+    await db.commit()
+
+    streamed = [order.subtotal async for order in OrderMgmt(db).stream_all_active(batch_size=8)]
+
+    assert sorted(streamed) == list(range(30))
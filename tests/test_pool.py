@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.configs.pool import InstrumentedAsyncQueuePool, pool_stats
+from app.configs.settings import DatabaseSettings
+
+pytestmark = pytest.mark.anyio
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql+asyncpg://app@db/orderflow")
+    monkeypatch.setenv("REPLICA_DATABASE_URLS", "postgresql+asyncpg://app@replica1/orderflow, postgresql+asyncpg://app@replica2/orderflow")
+    monkeypatch.setenv("DB_POOL_SIZE", "25")
+    monkeypatch.setenv("DB_ECHO", "true")
+    monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "0")
+
+    settings = DatabaseSettings.from_env()
+    options = settings.engine_options(settings.url)
+
+    assert len(settings.replica_urls) == 2
+    assert options["pool_size"] == 25
+    assert options["max_overflow"] == 10
+    assert options["echo"] is True
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+
+def test_echo_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("DB_ECHO", raising=False)
+    assert DatabaseSettings.from_env().echo is False
+
+
+async def test_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert pool_stats(engine)["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["acquisitions"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+    finally:
+        await engine.dispose()
+
+
+async def test_db_pool_endpoint(client):
+    response = await client.get("/health/db-pool")
+    assert response.status_code == 200
+    assert "pool" in response.json()["primary"]
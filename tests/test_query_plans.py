@@ -0,0 +1,194 @@
+"""
+Plan regression tests for the hot queries.
+
+The schema comes from the migrations and is seeded with the data generator,
+then every SELECT run by the hot code paths is EXPLAINed. A sequential scan
+of a large table fails the test, which catches dropped indexes and queries
+that stopped matching them.
+
+SQLite always runs. Set TEST_POSTGRES_URL to also check the plans on
+PostgreSQL, where sequential scans are disabled so that the plan shows
+whether an index can serve the query at all.
+"""
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.cli.datagen import NOW, DataShape, generate
+from app.configs.database import Base
+from app.configs.migrations import upgrade_to_head
+from app.dbs.inventory_transaction.model import InventoryTransaction
+from app.dbs.order.model import Order
+from app.dbs.order_item.model import OrderItem
+from app.dbs.qr_session.model import QRSession
+from app.services.menu_changes import MenuChangesLoader, to_version
+from app.services.menu_loader import MenuLoader
+from app.services.restaurant_service import RestaurantService
+
+pytestmark = pytest.mark.anyio
+
+# Tables that grow with the business; small lookup tables may be scanned
+LARGE_TABLES = {
+    "restaurants",
+    "categories",
+    "menu_items",
+    "menu_item_allergens",
+    "customization_options",
+    "customization_choices",
+    "orders",
+    "order_items",
+    "inventory_transactions",
+    "qr_sessions",
+}
+
+SHAPE = DataShape(restaurants=20, categories_per_restaurant=5, items_per_category=10, orders=1000, qr_sessions_per_table=3)
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+async def seeded_engine(request, tmp_path):
+    if request.param == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}"
+    else:
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+
+    engine = create_async_engine(url, poolclass=NullPool)
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    await upgrade_to_head(engine)
+    await generate(engine, SHAPE, batch_size=5000, workers=1)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+    yield engine
+    await engine.dispose()
+
+
+async def capture_selects(engine, work) -> list:
+    """Run `work` with a session and return the SELECTs it executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            await work(db)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def sequential_scans(engine, statement: str, parameters) -> set:
+    """EXPLAIN a statement and return the large tables it scans sequentially."""
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            scanned = {m.group(1) for m in (_SQLITE_SCAN.match(row[3]) for row in rows) if m}
+        else:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar_one()
+            scanned = set(_postgres_seq_scans(json.loads(plan) if isinstance(plan, str) else plan))
+    return scanned & LARGE_TABLES
+
+
+def _postgres_seq_scans(node):
+    if isinstance(node, list):
+        for child in node:
+            yield from _postgres_seq_scans(child)
+    elif isinstance(node, dict):
+        if node.get("Node Type") == "Seq Scan":
+            yield node["Relation Name"]
+        for value in node.values():
+            if isinstance(value, (list, dict)):
+                yield from _postgres_seq_scans(value)
+
+
+async def assert_index_only_access(engine, work) -> None:
+    statements = await capture_selects(engine, work)
+    assert statements
+
+    failures = []
+    for statement, parameters in statements:
+        scanned = await sequential_scans(engine, statement, parameters)
+        if scanned:
+            failures.append(f"{sorted(scanned)} scanned by: {statement}")
+    assert not failures, "\n".join(failures)
+
+
+async def test_menu_reads_use_indexes(seeded_engine):
+    async def work(db):
+        assert await MenuLoader(db).load(3) is not None
+        await RestaurantService(db).get_allergen_index(3)
+
+    await assert_index_only_access(seeded_engine, work)
+
+
+async def test_menu_change_polls_use_indexes(seeded_engine):
+    async def work(db):
+        since = to_version(datetime.now(timezone.utc) - timedelta(hours=1))
+        assert await MenuChangesLoader(db).load(3, since) is not None
+        await MenuChangesLoader(db).current_version(3)
+
+    await assert_index_only_access(seeded_engine, work)
+
+
+async def test_order_queries_use_indexes(seeded_engine):
+    async def work(db):
+        await db.execute(
+            select(Order)
+            .where(Order.restaurant_id == 3)
+            .where(Order.status.in_(["pending", "preparing"]))
+            .where(Order.deleted_at.is_(None))
+            .order_by(Order.order_time)
+        )
+        await db.execute(
+            select(Order)
+            .where(Order.restaurant_id == 3)
+            .where(Order.status == "completed")
+            .where(Order.order_time >= NOW - timedelta(days=7))
+            .where(Order.deleted_at.is_(None))
+        )
+        await db.execute(select(OrderItem).where(OrderItem.order_id == 42))
+
+    await assert_index_only_access(seeded_engine, work)
+
+
+async def test_ledger_and_session_queries_use_indexes(seeded_engine):
+    async def work(db):
+        await db.execute(
+            select(InventoryTransaction)
+            .where(InventoryTransaction.ingredient_id == 7)
+            .where(InventoryTransaction.created_at >= NOW - timedelta(days=30))
+            .order_by(InventoryTransaction.created_at)
+        )
+        await db.execute(
+            select(QRSession)
+            .where(QRSession.table_id == 5)
+            .where(QRSession.status == "active")
+            .where(QRSession.expires_at > NOW)
+        )
+
+    await assert_index_only_access(seeded_engine, work)
+
+
+async def test_detects_sequential_scans(seeded_engine):
+    async def work(db):
+        await db.execute(select(Order).where(Order.payment_method == "cash"))
+
+    with pytest.raises(AssertionError, match="orders"):
+        await assert_index_only_access(seeded_engine, work)
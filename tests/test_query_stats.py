@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.query_stats import RepeatedQueryError, fingerprint, query_monitor
+from app.dbs.menu_item.model import MenuItem
+from tests.test_menu_loader import seed_menu
+
+pytestmark = pytest.mark.anyio
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a''b'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert fingerprint("SELECT * FROM t WHERE id IN ($1, $2, $3)") == fingerprint("SELECT * FROM t WHERE id IN ($1)")
+    assert fingerprint("INSERT INTO t (a) VALUES (?), (?)\n") == "INSERT INTO t (a) VALUES (...)"
+
+
+async def test_server_timing_header(client, db):
+    restaurant_id = await seed_menu(db, category_count=2)
+
+    response = await client.get(f"/api/v1/restaurants/{restaurant_id}/menu")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+
+async def test_repeated_statements_fail_the_request(db):
+    restaurant_id = await seed_menu(db, category_count=1, items_per_category=12)
+    result = await db.execute(select(MenuItem.id).where(MenuItem.restaurant_id == restaurant_id))
+    menu_item_ids = result.scalars().all()
+
+    stats = query_monitor.start_request("GET /n-plus-one")
+    try:
+        with pytest.raises(RepeatedQueryError):
+            for menu_item_id in menu_item_ids:
+                await db.execute(select(MenuItem).where(MenuItem.id == menu_item_id))
+    finally:
+        query_monitor.end_request()
+    assert stats.count == query_monitor.repeat_limit + 1
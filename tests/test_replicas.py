@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from sqlalchemy import event
+from starlette.requests import Request
+
+from app.configs import database
+from app.configs.database import READ_YOUR_WRITES_COOKIE, ReplicaSet, is_replica, wrote_recently
+
+pytestmark = pytest.mark.anyio
+
+
+def break_replica(replica) -> None:
+    @event.listens_for(replica.sync_engine, "do_connect")
+    def refuse(dialect, conn_rec, cargs, cparams):
+        raise ConnectionRefusedError("replica is down")
+
+
+def make_request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", f"{READ_YOUR_WRITES_COOKIE}={cookie}".encode())] if cookie else []
+    return Request({"type": "http", "headers": headers})
+
+
+async def test_round_robin_skips_unhealthy_replicas():
+    replicas = ReplicaSet(["sqlite+aiosqlite://"] * 3)
+    break_replica(replicas.engines[1])
+    try:
+        assert await replicas.check_health() == [True, False, True]
+
+        engines = []
+        for _ in range(4):
+            session = replicas.session()
+            assert is_replica(session)
+            engines.append(session.bind)
+            await session.close()
+        assert engines == [replicas.engines[0], replicas.engines[2]] * 2
+    finally:
+        await replicas.close()
+
+
+async def test_falls_back_to_primary_without_healthy_replicas():
+    replicas = ReplicaSet(["sqlite+aiosqlite://"])
+    break_replica(replicas.engines[0])
+    try:
+        await replicas.check_health()
+        session = replicas.session()
+        assert not is_replica(session)
+        assert session.bind is database.engine
+        await session.close()
+    finally:
+        await replicas.close()
+
+
+def test_recent_writers_read_from_primary():
+    assert wrote_recently(make_request(str(time.time())))
+    assert not wrote_recently(make_request(str(time.time() - 3600)))
+    assert not wrote_recently(make_request("garbage"))
+    assert not wrote_recently(make_request())
+
+
+async def test_writes_set_the_read_your_writes_cookie(client):
+    response = await client.post("/api/v1/restaurants/", json={"name": "Restaurant"})
+    assert response.status_code == 201
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+
+    response = await client.get("/api/v1/restaurants/")
+    assert READ_YOUR_WRITES_COOKIE not in response.headers.get("set-cookie", "")
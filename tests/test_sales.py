@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, update
+
+from app.dbs.order.model import Order
+from app.dbs.sales_hourly.mgmt import SalesHourlyMgmt
+from app.dbs.sales_hourly.model import SalesHourly
+from app.dbs.sales_hourly_item.mgmt import SalesHourlyItemMgmt
+from app.dbs.sales_hourly_item.model import SalesHourlyItem
+from app.services.order_service import InvalidOrderError, OrderService
+from app.services.sales_service import bucket_start
+from tests.test_orders import seed_restaurant
+
+pytestmark = pytest.mark.anyio
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+async def rollups(db) -> tuple:
+    hours = await db.execute(
+        select(SalesHourly.restaurant_id, SalesHourly.order_count, SalesHourly.item_quantity, SalesHourly.revenue)
+    )
+    items = await db.execute(
+        select(
+            SalesHourlyItem.menu_item_id, SalesHourlyItem.order_count, SalesHourlyItem.quantity, SalesHourlyItem.revenue
+        )
+        .order_by(SalesHourlyItem.menu_item_id)
+    )
+    return hours.all(), items.all()
+
+
+def test_hours_compose_into_utc_days_weeks_and_months():
+    # A Sunday evening
+    value = datetime(2026, 10, 18, 21, 45, tzinfo=timezone.utc)
+
+    assert bucket_start(value, "hour") == utc(2026, 10, 18, 21)
+    assert bucket_start(value, "day") == utc(2026, 10, 18)
+    assert bucket_start(value, "week") == utc(2026, 10, 12)
+    assert bucket_start(value, "month") == utc(2026, 10, 1)
+
+
+async def test_completed_orders_are_counted_once(db):
+    ids = await seed_restaurant(db)
+    service = OrderService(db)
+    first = await service.place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["ramen"], "quantity": 2, "choice_ids": [ids["large"]]},
+        {"menu_item_id": ids["gyoza"], "quantity": 1},
+    ])
+    second = await service.place_order(ids["restaurant"], ids["table"], [
+        {"menu_item_id": ids["gyoza"], "quantity": 3},
+        {"menu_item_id": ids["gyoza"], "quantity": 1},
+    ])
+
+    completed = await service.complete_order(first["id"])
+    await service.complete_order(second["id"])
+    assert await service.complete_order(first["id"]) == completed
+    assert completed["status"] == "completed"
+
+    incremental = await rollups(db)
+    assert incremental == (
+        [(ids["restaurant"], 2, 7, first["total_amount"] + second["total_amount"])],
+        [
+            (ids["ramen"], 1, 2, Decimal("29.00")),
+            (ids["gyoza"], 2, 5, Decimal("30.00")),
+        ],
+    )
+
+    # The incremental rollups match a full aggregation of the orders
+    await SalesHourlyMgmt(db).rebuild()
+    await SalesHourlyItemMgmt(db).rebuild()
+    assert await rollups(db) == incremental
+
+
+async def test_cancelled_orders_cannot_be_completed(db):
+    ids = await seed_restaurant(db)
+    service = OrderService(db)
+    order = await service.place_order(ids["restaurant"], ids["table"], [{"menu_item_id": ids["gyoza"], "quantity": 1}])
+    await db.execute(update(Order).where(Order.id == order["id"]).values(status="cancelled"))
+    await db.commit()
+
+    with pytest.raises(InvalidOrderError, match="cancelled"):
+        await service.complete_order(order["id"])
+    assert await rollups(db) == ([], [])
+    assert await service.complete_order(order["id"] + 1) is None
+
+
+async def test_sales_api_adds_up_hourly_rollups(client, db):
+    ids = await seed_restaurant(db)
+    restaurant_id = ids["restaurant"]
+    db.add_all([
+        SalesHourly(restaurant_id=restaurant_id, hour=utc(2026, 10, 12, 10), order_count=2, item_quantity=5,
+                    revenue=Decimal("40.00")),
+        SalesHourly(restaurant_id=restaurant_id, hour=utc(2026, 10, 12, 18), order_count=1, item_quantity=1,
+                    revenue=Decimal("9.50")),
+        SalesHourly(restaurant_id=restaurant_id, hour=utc(2026, 10, 14, 9), order_count=3, item_quantity=6,
+                    revenue=Decimal("60.00")),
+        SalesHourlyItem(restaurant_id=restaurant_id, hour=utc(2026, 10, 12, 10), menu_item_id=ids["gyoza"],
+                        order_count=2, quantity=4, revenue=Decimal("24.00")),
+        SalesHourlyItem(restaurant_id=restaurant_id, hour=utc(2026, 10, 14, 9), menu_item_id=ids["gyoza"],
+                        order_count=1, quantity=1, revenue=Decimal("6.00")),
+    ])
+    await db.commit()
+    url = f"/api/v1/restaurants/{restaurant_id}/sales"
+
+    response = await client.get(url, params={"start": "2026-10-12T06:00:00Z", "end": "2026-10-19T00:00:00Z"})
+    assert response.status_code == 200
+    days = response.json()
+    assert [(day["start"][:10], day["order_count"], day["revenue"]) for day in days] == [
+        ("2026-10-12", 3, "49.50"),
+        ("2026-10-14", 3, "60.00"),
+    ]
+
+    response = await client.get(url, params={
+        "start": "2026-10-12T00:00:00Z", "end": "2026-10-19T00:00:00Z", "granularity": "week"
+    })
+    [week] = response.json()
+    assert (week["order_count"], week["item_quantity"], week["revenue"], week["average_basket"]) == (
+        6, 12, "109.50", "18.25"
+    )
+
+    response = await client.get(f"{url}/items", params={
+        "start": "2026-10-01T00:00:00Z", "end": "2026-11-01T00:00:00Z", "granularity": "month",
+        "menu_item_id": ids["gyoza"]
+    })
+    assert [(row["menu_item_id"], row["order_count"], row["quantity"]) for row in response.json()] == [
+        (ids["gyoza"], 3, 5)
+    ]
+
+    response = await client.get(url, params={"start": "2026-10-12T00:00:00Z", "end": "2026-10-01T00:00:00Z"})
+    assert response.status_code == 400
+    response = await client.get("/api/v1/restaurants/999999/sales", params={"start": "2026-10-12T00:00:00Z"})
+    assert response.status_code == 404
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight, StaleWhileRevalidate, menu_flights
+from app.dbs.restaurant.mgmt import RestaurantMgmt
+from app.services.restaurant_service import RestaurantService
+from tests.test_menu_loader import seed_menu
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_load():
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+    assert results == ["value"] * 10
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 9}
+
+
+async def test_stale_value_served_while_refreshing():
+    cache = StaleWhileRevalidate(ttl=0, stale_ttl=60)
+    values = iter(["first", "second"])
+
+    async def load():
+        await asyncio.sleep(0)
+        return next(values)
+
+    assert await cache.get("key", load) == "first"
+    assert await cache.get("key", load) == "first"
+    await asyncio.sleep(0.01)
+    assert await cache.get("key", load) == "second"
+    assert cache.stats()["stale_hits"] == 2
+
+
+async def test_refresh_racing_with_invalidation_is_not_fresh():
+    cache = StaleWhileRevalidate(ttl=60, stale_ttl=60)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return "old"
+
+    load = asyncio.ensure_future(cache.get("key", slow_load))
+    await started.wait()
+    cache.invalidate("key")
+    release.set()
+    assert await load == "old"
+
+    async def load_new():
+        return "new"
+
+    assert await cache.get("key", load_new) == "new"
+
+
+async def test_concurrent_menu_misses_share_one_load(db, query_counter):
+    restaurant_id = await seed_menu(db, category_count=2)
+    service = RestaurantService(db)
+    executions = menu_flights.executions
+
+    query_counter.clear()
+    menus = await asyncio.gather(*(service.get_restaurant_menu(restaurant_id) for _ in range(20)))
+
+    assert all(menu == menus[0] for menu in menus)
+    assert menu_flights.executions == executions + 1
+    assert len(query_counter) <= 2
+
+
+async def test_menu_loads_do_not_use_the_request_session(db):
+    restaurant_id = await seed_menu(db, category_count=1)
+    await db.commit()
+    service = RestaurantService(db)
+
+    # A caller that gives up does not take the shared load down with it
+    caller = asyncio.ensure_future(service.get_restaurant_menu(restaurant_id))
+    await asyncio.sleep(0)
+    caller.cancel()
+    menu = await service.get_restaurant_menu(restaurant_id)
+
+    assert menu["restaurant_id"] == restaurant_id
+    assert not db.in_transaction()
+
+
+async def test_first_restaurant_page_is_cached(db, query_counter):
+    restaurant_ids = []
+    for i in range(5):
+        restaurant_ids.append((await RestaurantMgmt(db).create({"name": f"Restaurant {i}"})).id)
+    service = RestaurantService(db)
+
+    first = await service.get_restaurants_page(2)
+    query_counter.clear()
+    again = await service.get_restaurants_page(3)
+
+    assert [restaurant.id for restaurant in first.items] == restaurant_ids[:2]
+    assert [restaurant.id for restaurant in again.items] == restaurant_ids[:3]
+    assert query_counter == []
+    assert not db.in_transaction()
+    rest = await service.get_restaurants_page(10, again.next_cursor)
+    assert [restaurant.id for restaurant in rest.items] == restaurant_ids[3:]
+
+    # Writes expire the cached page, which is served once more while it reloads
+    await RestaurantMgmt(db).create({"name": "Restaurant 5"})
+    assert len((await service.get_restaurants_page(10)).items) == 5
+    await asyncio.sleep(0.01)
+    page = await service.get_restaurants_page(10)
+    assert len(page.items) == 6 and page.next_cursor is None